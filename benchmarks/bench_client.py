@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SKILLS_DIR = ROOT / "skills"
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {"n": 0}
+    return {
+        "n": len(ordered),
+        "minMs": round(ordered[0] * 1000, 3),
+        "medianMs": round(statistics.median(ordered) * 1000, 3),
+        "p95Ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "meanMs": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+def _use_skill(skill):
+    sys.path.insert(0, str(SKILLS_DIR / skill / "scripts"))
+
+
+def _timed(callable_, *args, **kwargs):
+    started = time.perf_counter()
+    callable_(*args, **kwargs)
+    return time.perf_counter() - started
+
+
+def run_latency(iterations, warmup=3):
+    _use_skill("tasktracker-api")
+    from tasktracker_api import TaskTrackerAPI
+
+    api = TaskTrackerAPI()
+
+    def call():
+        return api.call_by_python_method(
+            "odata_task",
+            project_id=1,
+            odata_params={"$top": 50, "$filter": "Hidden eq false"},
+        )
+
+    for _ in range(warmup):
+        call()
+    samples = [_timed(call) for _ in range(iterations)]
+    return summarize(samples)
+
+
+def run_throughput(calls, concurrency):
+    _use_skill("tasktracker-api")
+    from tasktracker_api import TaskTrackerAPI
+
+    api = TaskTrackerAPI()
+    task_ids = [index % 200 + 1 for index in range(calls)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(lambda task_id: _timed(api.get_task_query_get_task_id, task_id), task_ids))
+    elapsed = time.perf_counter() - started
+    return {
+        "calls": calls,
+        "concurrency": concurrency,
+        "callsPerSecond": round(calls / elapsed, 2),
+        "latency": summarize(samples),
+    }
+
+
+def run_download(iterations):
+    _use_skill("files-api")
+    from files_api import FilesAPI
+
+    api = FilesAPI()
+    rates = []
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "download.bin"
+        for _ in range(iterations):
+            elapsed = _timed(api.call_by_python_method, "get_files_download", drive_id=1, item_id=[1], save_to=target)
+            rates.append(target.stat().st_size / elapsed / (1024 * 1024))
+    return {"iterations": iterations, "bestMBps": round(max(rates), 2), "medianMBps": round(statistics.median(rates), 2)}
+
+
+def run_upload(iterations, size_mb):
+    _use_skill("calendar-api")
+    from calendar_api import CalendarAPI
+
+    api = CalendarAPI()
+    size = int(size_mb * 1024 * 1024)
+    rates = []
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "upload.ics"
+        source.write_bytes(b"BEGIN:VCALENDAR\n" + b"X" * size + b"\nEND:VCALENDAR\n")
+        for _ in range(iterations):
+            elapsed = _timed(api.call_by_python_method, "post_calendar_import_id", 1, file_path=source)
+            rates.append(size / elapsed / (1024 * 1024))
+    return {
+        "iterations": iterations,
+        "sizeMB": size_mb,
+        "bestMBps": round(max(rates), 2),
+        "medianMBps": round(statistics.median(rates), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one in-process client benchmark scenario")
+    parser.add_argument("scenario", choices=("latency", "throughput", "download", "upload"))
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--upload-mb", type=float, default=8.0)
+    args = parser.parse_args()
+
+    if args.scenario == "latency":
+        result = run_latency(args.iterations)
+    elif args.scenario == "throughput":
+        result = run_throughput(args.iterations, args.concurrency)
+    elif args.scenario == "download":
+        result = run_download(args.iterations)
+    else:
+        result = run_upload(args.iterations, args.upload_mb)
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SKILLS_DIR = ROOT / "skills"
+SKILL_PREFIXES = {
+    "tasktracker-api": "/tasktracker",
+    "files-api": "/files",
+    "calendar-api": "/calendar",
+}
+TOKEN_PATH = "/oidc/connect/token"
+BASE_TIME = datetime(2026, 1, 5, 9, 0, tzinfo=timezone.utc)
+ENTRY_STATES = (10, 10, 20)
+
+
+def to_pascal_case(name):
+    if name.lower() == "id":
+        return "ID"
+    return name[:1].upper() + name[1:]
+
+
+def _fake_scalar(field_name, type_spec, index):
+    base_type = type_spec.replace(" nullable", "").strip()
+    if base_type.startswith("integer"):
+        if field_name.lower() == "id":
+            return index + 1
+        if field_name.lower().endswith("id"):
+            return index % 7 + 1
+        return index % 13
+    if base_type == "number":
+        return round(index * 0.5, 2)
+    if base_type == "boolean":
+        return False
+    if base_type == "string:date-time":
+        return (BASE_TIME + timedelta(hours=index)).isoformat().replace("+00:00", "Z")
+    if base_type == "string:date":
+        return (BASE_TIME + timedelta(days=index % 60)).date().isoformat()
+    if base_type.startswith("string"):
+        return f"{to_pascal_case(field_name)} {index + 1}"
+    if base_type.endswith(".EntryState"):
+        return ENTRY_STATES[index % len(ENTRY_STATES)]
+    if base_type in ("object", "null | object"):
+        return {}
+    if "." in base_type:
+        return 10
+    return None
+
+
+class ModelCatalog:
+    def __init__(self, skills_dir=SKILLS_DIR):
+        self.skills_dir = Path(skills_dir)
+        self._models = {}
+
+    def model(self, skill, reference):
+        key = (skill, reference)
+        if key not in self._models:
+            index_path = self.skills_dir / skill / reference.split("#", 1)[0]
+            payload = json.loads(index_path.read_text(encoding="utf-8"))
+            self._models[key] = payload.get("model") or {}
+        return self._models[key]
+
+    def row(self, skill, model, index, pascal_case=False):
+        if model.get("sample") is not None:
+            row = dict(model["sample"])
+            if "ID" in row:
+                row["ID"] = index + 1
+            return row
+
+        row = {}
+        for field_name, type_spec in (model.get("fields") or {}).items():
+            key = to_pascal_case(field_name) if pascal_case else field_name
+            if type_spec.startswith("array[assets/index/"):
+                nested = self.model(skill, type_spec[len("array["):-1])
+                row[key] = [self.row(skill, nested, index + offset, pascal_case) for offset in range(2)]
+            elif type_spec.startswith("array[Visary.Users"):
+                user_id = index % 5 + 1
+                user = {"id": user_id, "fullName": f"User {user_id}"}
+                row[key] = [{to_pascal_case(name): value for name, value in user.items()} if pascal_case else user]
+            elif "array" in type_spec:
+                row[key] = []
+            else:
+                row[key] = _fake_scalar(field_name, type_spec, index)
+        return row
+
+
+class Route:
+    def __init__(self, skill, http_method, template, entry, model):
+        self.skill = skill
+        self.http_method = http_method
+        self.template = template
+        self.entry = entry
+        self.model = model
+        self.param_count = template.count("{")
+        pattern = re.sub(r"\\\{[^/]+?\\\}", r"([^/]+)", re.escape(template))
+        self.pattern = re.compile(f"^{pattern}$")
+
+    @property
+    def is_odata(self):
+        return "/odata/" in self.template
+
+    @property
+    def is_count(self):
+        return self.template.endswith("/$count")
+
+    @property
+    def returns_binary(self):
+        return bool(self.entry.get("returnsBinary"))
+
+
+def load_routes(skills_dir=SKILLS_DIR, catalog=None):
+    catalog = catalog or ModelCatalog(skills_dir)
+    routes = []
+    for skill, prefix in SKILL_PREFIXES.items():
+        skill_root = Path(skills_dir) / skill
+        manifest = json.loads((skill_root / "assets" / "index" / "manifest.json").read_text(encoding="utf-8"))
+        for item in manifest.get("indexes", []):
+            payload = json.loads((skill_root / item["file"]).read_text(encoding="utf-8"))
+            model = payload.get("model") or {}
+            for entry in payload.get("methods", []):
+                http_method, template = entry["key"].split(" ", 1)
+                routes.append(Route(skill, http_method, prefix + template, entry, model))
+    routes.sort(key=lambda route: route.param_count)
+    return routes, catalog
+
+
+class StandInConfig:
+    def __init__(self, latency_ms=0.0, rows=200, download_bytes=8 * 1024 * 1024):
+        self.latency_ms = latency_ms
+        self.rows = rows
+        self.download_bytes = download_bytes
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b"", content_type="application/json; charset=utf-8"):
+        latency_ms = self.server.config.latency_ms
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_json(self, payload, status=200):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+    def _consume_body(self):
+        remaining = int(self.headers.get("Content-Length") or 0)
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+
+    def _handle(self):
+        self._consume_body()
+        parts = urlsplit(self.path)
+        if self.command == "POST" and parts.path == TOKEN_PATH:
+            self._send_json({"access_token": "stand-in-token", "token_type": "Bearer", "expires_in": 3600})
+            return
+
+        route, path_values = self.server.match(self.command, parts.path)
+        if route is None:
+            self._send_json({"error": f"No stand-in route for {self.command} {parts.path}"}, status=404)
+            return
+
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        if route.returns_binary:
+            self._send(200, self.server.download_payload, content_type="application/octet-stream")
+            return
+        if self.command in ("PATCH", "PUT", "DELETE"):
+            self._send(204)
+            return
+        if self.command == "POST":
+            self._send_json({"id": 1})
+            return
+        self._send_json_for_get(route, path_values, query)
+
+    def _send_json_for_get(self, route, path_values, query):
+        config = self.server.config
+        catalog = self.server.catalog
+        if route.is_count:
+            self._send(200, str(config.rows).encode("ascii"), content_type="text/plain")
+            return
+
+        if path_values:
+            try:
+                index = int(path_values[-1]) - 1
+            except ValueError:
+                index = 0
+            self._send_json(catalog.row(route.skill, route.model, max(index, 0), pascal_case=route.is_odata))
+            return
+
+        skip = int(query.get("$skip", 0))
+        top = int(query.get("$top", config.rows))
+        indexes = range(skip, min(skip + top, config.rows))
+        rows = [catalog.row(route.skill, route.model, index, pascal_case=route.is_odata) for index in indexes]
+        if route.is_odata and query.get("$select"):
+            selected = {name.strip().split("/", 1)[0] for name in query["$select"].split(",")}
+            rows = [{key: value for key, value in row.items() if key in selected} for row in rows]
+        if route.is_odata:
+            self._send_json({"@odata.context": "$metadata", "value": rows})
+        else:
+            self._send_json(rows)
+
+    do_GET = _handle
+    do_POST = _handle
+    do_PATCH = _handle
+    do_PUT = _handle
+    do_DELETE = _handle
+    do_HEAD = _handle
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), config=None, skills_dir=SKILLS_DIR):
+        super().__init__(address, StandInHandler)
+        self.config = config or StandInConfig()
+        self.routes, self.catalog = load_routes(skills_dir)
+        self.download_payload = bytes(range(256)) * (self.config.download_bytes // 256)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def match(self, http_method, path):
+        for route in self.routes:
+            if route.http_method != http_method and not (http_method == "HEAD" and route.http_method == "GET"):
+                continue
+            matched = route.pattern.match(path)
+            if matched:
+                return route, matched.groups()
+        return None, ()
+
+    def environment(self):
+        return {
+            "ERP_API_BASE_URL": self.base_url,
+            "ERP_TOKEN_URL": f"{self.base_url}{TOKEN_PATH}",
+            "ERP_CLIENT_ID": "stand-in",
+            "ERP_CLIENT_SECRET": "stand-in",
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="erp-stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve generated ERP TaskTracker/Files/Calendar responses locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added before every response")
+    parser.add_argument("--rows", type=int, default=200, help="Rows served by collection endpoints")
+    parser.add_argument("--download-mb", type=float, default=8.0, help="Size of binary download responses")
+    args = parser.parse_args()
+
+    config = StandInConfig(
+        latency_ms=args.latency_ms,
+        rows=args.rows,
+        download_bytes=int(args.download_mb * 1024 * 1024),
+    )
+    server = StandInServer((args.host, args.port), config=config)
+    for name, value in server.environment().items():
+        print(f"{name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bench_client import summarize
+from erp_stand_in import StandInConfig, StandInServer
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SKILLS_DIR = ROOT / "skills"
+BENCH_CLIENT = Path(__file__).resolve().parent / "bench_client.py"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+SETTING_KEYS = {"n", "iterations", "calls", "concurrency", "sizeMB"}
+
+COLD_START_COMMANDS = {
+    "tasktracker-api": {
+        "help": ["--help"],
+        "get": ["-m", "odata_task", "--arg", "project_id=1", "--odata-arg", "$top=20"],
+    },
+    "files-api": {
+        "help": ["--help"],
+        "get": ["-m", "get_items", "--arg", "drive_id=1", "--arg", "take=20"],
+    },
+    "calendar-api": {
+        "help": ["--help"],
+        "get": ["-m", "get_event", "--arg", "calendar_id=1"],
+    },
+}
+
+
+def git_revision():
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return completed.stdout.strip()
+
+
+def _run(command, env, cwd=None):
+    started = time.perf_counter()
+    completed = subprocess.run(command, env=env, cwd=cwd, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark command failed: {' '.join(map(str, command))}\n{completed.stderr}")
+    return elapsed, completed
+
+
+def measure_cold_start(env, repeats):
+    results = {}
+    for skill, commands in COLD_START_COMMANDS.items():
+        skill_root = SKILLS_DIR / skill
+        for name, arguments in commands.items():
+            command = [sys.executable, str(skill_root / "api.py"), *arguments]
+            samples = [_run(command, env, cwd=skill_root)[0] for _ in range(repeats)]
+            results[f"{skill}:{name}"] = summarize(samples)
+    return results
+
+
+def parse_import_time(stderr_text, top=10):
+    entries = []
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = (part.strip() for part in line[len("import time:"):].split("|", 2))
+        entries.append((module, int(self_us), int(cumulative_us)))
+    slowest = sorted(entries, key=lambda entry: entry[2], reverse=True)[:top]
+    return {
+        "modules": len(entries),
+        "totalMs": round(sum(entry[1] for entry in entries) / 1000, 3),
+        "slowest": [
+            {"module": module.strip(), "selfMs": round(self_us / 1000, 3), "cumulativeMs": round(cumulative_us / 1000, 3)}
+            for module, self_us, cumulative_us in slowest
+        ],
+    }
+
+
+def measure_import_time(env):
+    results = {}
+    for skill, commands in COLD_START_COMMANDS.items():
+        skill_root = SKILLS_DIR / skill
+        for name, arguments in commands.items():
+            command = [sys.executable, "-X", "importtime", str(skill_root / "api.py"), *arguments]
+            _, completed = _run(command, env, cwd=skill_root)
+            results[f"{skill}:{name}"] = parse_import_time(completed.stderr)
+    return results
+
+
+def run_scenario(env, scenario, *arguments):
+    _, completed = _run([sys.executable, str(BENCH_CLIENT), scenario, *arguments], env)
+    return json.loads(completed.stdout)
+
+
+def compare(previous, current):
+    lines = []
+
+    def walk(prefix, old, new):
+        if isinstance(new, dict):
+            for key, value in new.items():
+                if isinstance(old, dict) and key in old and key not in SETTING_KEYS:
+                    walk(f"{prefix}.{key}" if prefix else key, old[key], value)
+            return
+        if isinstance(new, (int, float)) and isinstance(old, (int, float)) and old:
+            change = (new - old) / old * 100
+            lines.append(f"{prefix}: {old} -> {new} ({change:+.1f}%)")
+
+    walk("", previous.get("results", {}), current.get("results", {}))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ERP skill clients against a local stand-in server")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added by the stand-in before every response")
+    parser.add_argument("--rows", type=int, default=200, help="Rows served by collection endpoints")
+    parser.add_argument("--cold-start-repeats", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=50, help="Sequential calls for the latency scenario")
+    parser.add_argument("--calls", type=int, default=400, help="Total calls for the throughput scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--transfer-mb", type=float, default=8.0, help="Payload size for download and upload scenarios")
+    parser.add_argument("--transfer-iterations", type=int, default=3)
+    parser.add_argument("--output", help="Result JSON path; defaults to benchmarks/results/<git revision>.json")
+    parser.add_argument("--compare", help="Previous result JSON to compare against")
+    args = parser.parse_args()
+
+    config = StandInConfig(
+        latency_ms=args.latency_ms,
+        rows=args.rows,
+        download_bytes=int(args.transfer_mb * 1024 * 1024),
+    )
+    revision = git_revision()
+    with StandInServer(config=config) as server, tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ)
+        for name in ("erp_tasktracker_api_base_url", "erp_client_id", "erp_client_secret"):
+            env.pop(name, None)
+        env.update(server.environment())
+        env["HOME"] = home
+        env["USERPROFILE"] = home
+
+        results = {
+            "coldStart": measure_cold_start(env, args.cold_start_repeats),
+            "importTime": measure_import_time(env),
+            "latency": run_scenario(env, "latency", "--iterations", str(args.iterations)),
+            "throughput": run_scenario(
+                env,
+                "throughput",
+                "--iterations",
+                str(args.calls),
+                "--concurrency",
+                str(args.concurrency),
+            ),
+            "download": run_scenario(env, "download", "--iterations", str(args.transfer_iterations)),
+            "upload": run_scenario(
+                env,
+                "upload",
+                "--iterations",
+                str(args.transfer_iterations),
+                "--upload-mb",
+                str(args.transfer_mb),
+            ),
+        }
+
+    report = {
+        "revision": revision,
+        "createdAt": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "latencyMs": args.latency_ms,
+            "rows": args.rows,
+            "concurrency": args.concurrency,
+            "transferMB": args.transfer_mb,
+        },
+        "results": results,
+    }
+
+    output_path = Path(args.output) if args.output else RESULTS_DIR / f"{revision}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f"Results written to {output_path}", file=sys.stderr)
+
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        for line in compare(previous, report):
+            print(line, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
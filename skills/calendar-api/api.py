@@ -1,20 +1,19 @@
 #!/usr/bin/env python3
-from pathlib import Path
-import runpy
+import os
 import sys
 
 
-SKILL_ROOT = Path(__file__).resolve().parent
-SCRIPTS_DIR = SKILL_ROOT / "scripts"
-SCRIPT_PATH = SCRIPTS_DIR / "calendar_call.py"
+SKILL_ROOT = os.path.dirname(os.path.realpath(__file__))
+SCRIPTS_DIR = os.path.join(SKILL_ROOT, "scripts")
 
 
 def _ensure_scripts_dir_on_path():
-    scripts_dir = str(SCRIPTS_DIR)
-    if scripts_dir not in sys.path:
-        sys.path.insert(0, scripts_dir)
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
 
 
 if __name__ == "__main__":
     _ensure_scripts_dir_on_path()
-    runpy.run_path(str(SCRIPT_PATH), run_name="__main__")
+    from calendar_call import main
+
+    raise SystemExit(main())
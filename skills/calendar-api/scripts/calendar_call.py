@@ -2,9 +2,6 @@
 import argparse
 import json
 import sys
-from pathlib import Path
-
-from calendar_api import CalendarAPI
 
 
 BODY_METHODS = {
@@ -136,6 +133,35 @@ def configure_stdout():
         sys.stderr.reconfigure(encoding="utf-8")
 
 
+def install_trace_printer():
+    import requests
+
+    def print_trace(trace):
+        print(json.dumps(trace.as_dict(), ensure_ascii=False), file=sys.stderr)
+
+    requests.add_trace_hook(print_trace)
+
+
+def install_metrics_textfile(textfile):
+    import metrics
+
+    metrics.enable(textfile=textfile)
+
+
+def install_cassette(record_dir=None, replay_dir=None):
+    import os
+
+    import requests
+
+    if replay_dir:
+        # Client credentials are excluded from request fingerprints, so replays need no real secrets.
+        os.environ.setdefault("ERP_CLIENT_ID", "replay")
+        os.environ.setdefault("ERP_CLIENT_SECRET", "replay")
+        requests.use_cassette(replay_dir, "replay")
+    elif record_dir:
+        requests.use_cassette(record_dir, "record")
+
+
 def normalize_keyword_args(python_method, keyword_args, file_path):
     normalized_args = dict(keyword_args)
     if python_method in IMPORT_METHODS:
@@ -154,6 +180,8 @@ def normalize_keyword_args(python_method, keyword_args, file_path):
 
 
 def write_export_response(response, output_path=None):
+    from pathlib import Path
+
     content = response.content
     if output_path:
         destination = Path(output_path).expanduser()
@@ -183,6 +211,11 @@ def main():
     parser.add_argument("--arg", action="append", default=[], help="Named argument in key=value form; value is parsed as JSON when possible")
     parser.add_argument("--file", help="File path for multipart upload endpoints")
     parser.add_argument("--output", help="Write export response content to this path")
+    parser.add_argument("--trace", action="store_true", help="Print per-request phase timings and byte counts to stderr as JSON lines")
+    parser.add_argument("--metrics-textfile", help="Write request metrics in Prometheus text format to this path on exit")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="DIR", help="Record HTTP exchanges into a cassette directory for later offline replay")
+    cassette_group.add_argument("--replay", metavar="DIR", help="Serve HTTP exchanges from a recorded cassette directory without network access")
     args = parser.parse_args()
 
     positional_args = [parse_value(value) for value in args.posarg]
@@ -192,6 +225,15 @@ def main():
     if args.output and args.python_method not in EXPORT_METHODS:
         raise ValueError("--output is supported only for calendar export endpoints.")
 
+    if args.trace:
+        install_trace_printer()
+    if args.metrics_textfile:
+        install_metrics_textfile(args.metrics_textfile)
+    if args.record or args.replay:
+        install_cassette(record_dir=args.record, replay_dir=args.replay)
+
+    from calendar_api import CalendarAPI
+
     api = CalendarAPI()
     result = api.call_by_python_method(args.python_method, *positional_args, **keyword_args)
     if args.python_method in EXPORT_METHODS:
@@ -0,0 +1,266 @@
+import atexit
+import os
+import re
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock; only threads of one process are serialized there.
+    fcntl = None
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_FAMILIES = {
+    "erp_client_requests_total": ("counter", "HTTP requests completed by the ERP client."),
+    "erp_client_request_duration_seconds": ("histogram", "Wall time of ERP client requests including decode."),
+    "erp_client_request_bytes_total": ("counter", "Request body bytes sent by the ERP client."),
+    "erp_client_response_bytes_total": ("counter", "Response body bytes received by the ERP client."),
+    "erp_client_cache_lookups_total": ("counter", "Client-side cache lookups by cache and result."),
+    "erp_client_token_refreshes_total": ("counter", "Access tokens fetched through client_credentials."),
+}
+
+_default_registry = None
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    rendered = []
+    for name, value in labels:
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        rendered.append(f'{name}="{escaped}"')
+    return "{" + ",".join(rendered) + "}"
+
+
+def _format_number(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+_SAMPLE = re.compile(r"^(\w+)(?:\{(.*)\})? (\S+)$")
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+_UNESCAPE = re.compile(r"\\(.)")
+
+
+def _parse_number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _parse_textfile(text, buckets):
+    # Reads back the families this module writes, so a new run can add its counts to the previous ones.
+    counters = {}
+    histograms = {}
+    bounds = [_format_number(bound) for bound in buckets] + ["+Inf"]
+    for line in text.splitlines():
+        match = _SAMPLE.match(line)
+        if match is None:
+            continue
+        name, rendered_labels, value = match.groups()
+        labels = tuple(
+            (label, _UNESCAPE.sub(lambda escaped: "\n" if escaped.group(1) == "n" else escaped.group(1), raw))
+            for label, raw in _LABEL.findall(rendered_labels or "")
+        )
+        if METRIC_FAMILIES.get(name, ("",))[0] == "counter":
+            counters[(name, labels)] = _parse_number(value)
+            continue
+        family, _, part = name.rpartition("_")
+        if METRIC_FAMILIES.get(family, ("",))[0] != "histogram":
+            continue
+        if part == "bucket":
+            labels, bound = labels[:-1], labels[-1][1]
+        histogram = histograms.setdefault((family, labels), {"bucket": {}, "sum": 0.0, "count": 0})
+        if part == "bucket":
+            histogram["bucket"][bound] = _parse_number(value)
+        elif part in ("sum", "count"):
+            histogram[part] = _parse_number(value)
+    snapshot = {}
+    for key, histogram in histograms.items():
+        if set(histogram["bucket"]) != set(bounds):
+            # Written with other buckets; it cannot be merged bucket by bucket.
+            continue
+        cumulative = [histogram["bucket"][bound] for bound in bounds]
+        counts = [cumulative[0]] + [high - low for low, high in zip(cumulative, cumulative[1:])]
+        snapshot[key] = (counts, histogram["sum"], histogram["count"])
+    return counters, snapshot
+
+
+def _combine(left, right, sign=1):
+    counters = dict(left[0])
+    for key, value in right[0].items():
+        counters[key] = counters.get(key, 0) + sign * value
+    histograms = dict(left[1])
+    for key, (counts, total, count) in right[1].items():
+        base_counts, base_total, base_count = histograms.get(key, ([0] * len(counts), 0.0, 0))
+        histograms[key] = (
+            [base + sign * value for base, value in zip(base_counts, counts)],
+            base_total + sign * total,
+            base_count + sign * count,
+        )
+    return counters, histograms
+
+
+@contextmanager
+def _file_lock(destination):
+    # Concurrent CLI runs share the textfile; the sidecar lock keeps each read-merge-replace from losing another's
+    # counts. The target itself cannot be locked because os.replace swaps it for a new inode.
+    if fcntl is None:
+        yield
+        return
+    with open(destination.with_name(f".{destination.name}.lock"), "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class MetricsRegistry:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._write_lock = threading.Lock()
+        self._written = ({}, {})
+
+    def inc(self, name, labels=(), amount=1):
+        key = (name, tuple(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def record_trace(self, trace):
+        status = str(trace.status_code) if trace.status_code is not None else "error"
+        labels = (("python_method", trace.name), ("status", status))
+        method_labels = (("python_method", trace.name),)
+        self.inc("erp_client_requests_total", labels)
+        self.inc("erp_client_request_bytes_total", method_labels, trace.request_bytes)
+        self.inc("erp_client_response_bytes_total", method_labels, trace.response_bytes)
+        if trace.name == "token" and trace.error is None:
+            self.inc("erp_client_token_refreshes_total")
+        self.observe("erp_client_request_duration_seconds", labels, trace.elapsed)
+
+    def record_cache(self, cache, hit):
+        self.inc("erp_client_cache_lookups_total", (("cache", cache), ("result", "hit" if hit else "miss")))
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {
+                key: (list(histogram.counts), histogram.sum, histogram.count)
+                for key, histogram in self._histograms.items()
+            }
+        return counters, histograms
+
+    def render(self, snapshot=None):
+        counters, histograms = snapshot or self.snapshot()
+        lines = []
+        for family, (metric_type, help_text) in METRIC_FAMILIES.items():
+            if metric_type == "counter":
+                family_samples = counters
+            else:
+                family_samples = histograms
+            samples = sorted(
+                ((labels, value) for (name, labels), value in family_samples.items() if name == family),
+                key=lambda sample: sample[0],
+            )
+            if not samples:
+                continue
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {metric_type}")
+            for labels, value in samples:
+                if metric_type == "counter":
+                    lines.append(f"{family}{_format_labels(labels)} {_format_number(value)}")
+                    continue
+                bucket_counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip((*self.buckets, "+Inf"), bucket_counts):
+                    cumulative += bucket_count
+                    bucket_labels = (*labels, ("le", bound))
+                    lines.append(f"{family}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                lines.append(f"{family}_sum{_format_labels(labels)} {_format_number(total)}")
+                lines.append(f"{family}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        # Every CLI call is its own process, so counters are added to those already in the file; only the
+        # part not yet written by this registry is added, which keeps periodic dumps from counting twice.
+        destination = Path(path).expanduser()
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        temporary = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+        with self._write_lock, _file_lock(destination):
+            current = self.snapshot()
+            try:
+                previous = _parse_textfile(destination.read_text(encoding="utf-8"), self.buckets)
+            except FileNotFoundError:
+                previous = ({}, {})
+            merged = _combine(previous, _combine(current, self._written, sign=-1))
+            temporary.write_text(self.render(merged), encoding="utf-8")
+            os.replace(temporary, destination)
+            self._written = current
+
+    def dump_on_exit(self, path):
+        atexit.register(self.write_textfile, path)
+
+    def dump_periodically(self, path, interval):
+        stopped = threading.Event()
+
+        def run():
+            while not stopped.wait(interval):
+                self.write_textfile(path)
+
+        threading.Thread(target=run, name="metrics-textfile", daemon=True).start()
+        return stopped
+
+
+def enable(textfile=None, interval=None):
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MetricsRegistry()
+        requests.add_trace_hook(_default_registry.record_trace)
+    if textfile:
+        _default_registry.dump_on_exit(textfile)
+        if interval:
+            _default_registry.dump_periodically(textfile, interval)
+    return _default_registry
+
+
+def get_registry():
+    return _default_registry
+
+
+def record_cache(cache, hit):
+    if _default_registry is not None:
+        _default_registry.record_cache(cache, hit)
@@ -1,8 +1,15 @@
+import atexit
+import base64
+import hashlib
+import http.client
 import json
-import mimetypes
+import os
+import re
 import socket
-import uuid
-from dataclasses import dataclass
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from urllib import error, parse, request as urllib_request
 
 
@@ -20,6 +27,149 @@ class HTTPError(RequestException):
         self.response = response
 
 
+CONNECTION_PHASES = ("dns", "connect", "tls")
+
+ODATA_EXPRESSION_PARAMS = ("$filter", "$orderby", "$select", "$expand")
+CREDENTIAL_FORM_FIELDS = ("client_id", "client_secret")
+SECRET_RESPONSE_FIELDS = ("access_token", "refresh_token", "id_token")
+REPLAYED_SECRET = "replayed-secret"
+
+_trace_hooks = []
+_trace_state = threading.local()
+_opener = None
+_cassette = None
+
+
+@dataclass
+class RequestTrace:
+    name: str
+    method: str | None = None
+    url: str | None = None
+    status_code: int | None = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    elapsed: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+
+    def add_phase(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, phase):
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_phase(phase, time.perf_counter() - started)
+
+    def connection_time(self):
+        return sum(self.phases.get(phase, 0.0) for phase in CONNECTION_PHASES)
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "method": self.method,
+            "url": self.url,
+            "statusCode": self.status_code,
+            "requestBytes": self.request_bytes,
+            "responseBytes": self.response_bytes,
+            "elapsedMs": round(self.elapsed * 1000, 3),
+            "phasesMs": {phase: round(seconds * 1000, 3) for phase, seconds in self.phases.items()},
+            "error": self.error,
+        }
+
+
+def add_trace_hook(hook):
+    _trace_hooks.append(hook)
+
+
+def remove_trace_hook(hook):
+    if hook in _trace_hooks:
+        _trace_hooks.remove(hook)
+
+
+def current_trace():
+    return getattr(_trace_state, "trace", None)
+
+
+@contextmanager
+def trace_scope(name):
+    trace = RequestTrace(name=name)
+    previous = current_trace()
+    _trace_state.trace = trace
+    started = time.perf_counter()
+    try:
+        yield trace
+    except Exception as exc:
+        if trace.error is None:
+            trace.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        trace.elapsed = time.perf_counter() - started
+        _trace_state.trace = previous
+        for hook in list(_trace_hooks):
+            hook(trace)
+
+
+def _traced_create_connection(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None):
+    trace = current_trace()
+    if trace is None:
+        return socket.create_connection(address, timeout, source_address)
+
+    host, port = address
+    with trace.phase("dns"):
+        addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    with trace.phase("connect"):
+        last_error = None
+        for _, _, _, _, sockaddr in addresses:
+            try:
+                return socket.create_connection(sockaddr[:2], timeout, source_address)
+            except OSError as exc:
+                last_error = exc
+        raise last_error or OSError(f"getaddrinfo returned no addresses for {host}")
+
+
+class _TracedHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _traced_create_connection
+
+
+class _TracedHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _traced_create_connection
+
+    def connect(self):
+        trace = current_trace()
+        if trace is None:
+            super().connect()
+            return
+        socket_time_before = trace.connection_time()
+        started = time.perf_counter()
+        super().connect()
+        socket_time = trace.connection_time() - socket_time_before
+        trace.add_phase("tls", time.perf_counter() - started - socket_time)
+
+
+class _TracedHTTPHandler(urllib_request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_TracedHTTPConnection, req)
+
+
+class _TracedHTTPSHandler(urllib_request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_TracedHTTPSConnection, req, context=self._context)
+
+
+def _get_opener():
+    global _opener
+    if _opener is None:
+        _opener = urllib_request.build_opener(_TracedHTTPHandler, _TracedHTTPSHandler)
+    return _opener
+
+
 @dataclass
 class Response:
     status_code: int
@@ -36,7 +186,11 @@ class Response:
         return self.content.decode("utf-8", errors="replace")
 
     def json(self):
-        return json.loads(self.text)
+        trace = current_trace()
+        if trace is None:
+            return json.loads(self.text)
+        with trace.phase("decode"):
+            return json.loads(self.text)
 
 
 def _encode_params(params):
@@ -65,6 +219,9 @@ def _prepare_body(data=None, json_body=None, headers=None):
 
 
 def _prepare_multipart(files=None, headers=None):
+    import mimetypes
+    import uuid
+
     normalized_headers = dict(headers or {})
     boundary = f"----CodexBoundary{uuid.uuid4().hex}"
     body = bytearray()
@@ -88,16 +245,198 @@ def _prepare_multipart(files=None, headers=None):
     return bytes(body), normalized_headers
 
 
-def _build_response(raw_response, url):
+def _normalize_odata_expression(value):
+    # Collapse whitespace outside quoted literals; '' escapes split into empty segments.
+    segments = value.split("'")
+    for position in range(0, len(segments), 2):
+        segments[position] = re.sub(r"\s*,\s*", ",", re.sub(r"\s+", " ", segments[position]))
+    return "'".join(segments).strip()
+
+
+def _normalize_body(body, headers):
+    if not body:
+        return b""
+    content_type = ""
+    for name, value in headers.items():
+        if name.lower() == "content-type":
+            content_type = value
+    if "application/x-www-form-urlencoded" in content_type:
+        fields = [
+            (name, value)
+            for name, value in parse.parse_qsl(body.decode("utf-8"), keep_blank_values=True)
+            if name not in CREDENTIAL_FORM_FIELDS
+        ]
+        return parse.urlencode(sorted(fields)).encode("utf-8")
+    if "json" in content_type:
+        try:
+            return json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False).encode("utf-8")
+        except ValueError:
+            return body
+    boundary = re.search(r"boundary=([^;]+)", content_type)
+    if boundary:
+        return body.replace(boundary.group(1).encode("utf-8"), b"boundary")
+    return body
+
+
+def request_fingerprint(method, url, body=None, headers=None):
+    parts = parse.urlsplit(url)
+    query = []
+    for name, value in parse.parse_qsl(parts.query, keep_blank_values=True):
+        if name in ODATA_EXPRESSION_PARAMS:
+            value = _normalize_odata_expression(value)
+        query.append((name, value))
+    body_hash = hashlib.sha256(_normalize_body(body, headers or {})).hexdigest()
+    key = {
+        "method": method.upper(),
+        "path": parts.path.rstrip("/") or "/",
+        "query": sorted(query),
+        "bodySha256": body_hash,
+    }
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return digest[:32], key
+
+
+def _redact_secrets(response):
+    try:
+        payload = json.loads(response.content)
+    except ValueError:
+        return response.content
+    if not isinstance(payload, dict) or not any(name in payload for name in SECRET_RESPONSE_FIELDS):
+        return response.content
+    for name in SECRET_RESPONSE_FIELDS:
+        if name in payload:
+            payload[name] = REPLAYED_SECRET
+    return json.dumps(payload).encode("utf-8")
+
+
+class Cassette:
+    def __init__(self, directory, mode):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.directory = os.path.abspath(os.path.expanduser(str(directory)))
+        self.mode = mode
+        self.index_path = os.path.join(self.directory, "index.json")
+        self._lock = threading.Lock()
+        self._replay_positions = {}
+        self._recorded = set()
+        self._index = {}
+        self._index_changed = False
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as handle:
+                self._index = json.load(handle)
+        elif mode == "replay":
+            raise ValueError(f"Cassette index not found: {self.index_path}")
+        if mode == "record":
+            # The index is written once when recording ends rather than after every response.
+            atexit.register(self.close)
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    def _write_index(self):
+        temporary_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as handle:
+            json.dump(self._index, handle, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.index_path)
+
+    def close(self):
+        with self._lock:
+            if self._index_changed:
+                self._write_index()
+                self._index_changed = False
+
+    def record(self, method, url, body, headers, response):
+        fingerprint, key = request_fingerprint(method, url, body, headers)
+        stored_headers = {name: value for name, value in response.headers.items() if name.lower() != "set-cookie"}
+        with self._lock:
+            entry = self._index.setdefault(fingerprint, {"request": key, "responses": []})
+            if fingerprint not in self._recorded:
+                # A new recording session replaces what an older one captured for this request.
+                self._recorded.add(fingerprint)
+                for stale_path in entry["responses"]:
+                    try:
+                        os.unlink(os.path.join(self.directory, stale_path))
+                    except FileNotFoundError:
+                        pass
+                entry["responses"] = []
+            relative_path = os.path.join("responses", f"{fingerprint}-{len(entry['responses'])}.json")
+            os.makedirs(os.path.join(self.directory, "responses"), exist_ok=True)
+            with open(os.path.join(self.directory, relative_path), "w", encoding="utf-8") as handle:
+                json.dump(
+                    {
+                        "statusCode": response.status_code,
+                        "headers": stored_headers,
+                        "contentBase64": base64.b64encode(_redact_secrets(response)).decode("ascii"),
+                    },
+                    handle,
+                    ensure_ascii=False,
+                )
+            entry["responses"].append(relative_path.replace(os.sep, "/"))
+            self._index_changed = True
+
+    def replay(self, method, url, body, headers):
+        fingerprint, key = request_fingerprint(method, url, body, headers)
+        entry = self._index.get(fingerprint)
+        if entry is None or not entry["responses"]:
+            raise RequestException(
+                f"No recorded response for {key['method']} {key['path']} in cassette {self.directory}"
+            )
+        with self._lock:
+            position = self._replay_positions.get(fingerprint, 0)
+            self._replay_positions[fingerprint] = position + 1
+        relative_path = entry["responses"][min(position, len(entry["responses"]) - 1)]
+        with open(os.path.join(self.directory, relative_path), encoding="utf-8") as handle:
+            stored = json.load(handle)
+        return Response(
+            status_code=stored["statusCode"],
+            headers=stored["headers"],
+            content=base64.b64decode(stored["contentBase64"]),
+            url=url,
+        )
+
+
+def use_cassette(directory, mode):
+    global _cassette
+    if _cassette is not None:
+        _cassette.close()
+    _cassette = Cassette(directory, mode) if directory else None
+    return _cassette
+
+
+def _build_response(raw_response, url, trace):
+    with trace.phase("download"):
+        content = raw_response.read()
+    trace.status_code = getattr(raw_response, "status", raw_response.getcode())
+    trace.response_bytes = len(content)
     return Response(
-        status_code=getattr(raw_response, "status", raw_response.getcode()),
+        status_code=trace.status_code,
         headers=dict(raw_response.headers.items()),
-        content=raw_response.read(),
+        content=content,
         url=url,
     )
 
 
+def _record_time_to_first_byte(trace, started, connection_time_before):
+    connection_time = trace.connection_time() - connection_time_before
+    trace.add_phase("ttfb", time.perf_counter() - started - connection_time)
+
+
 def request(method, url, params=None, json=None, data=None, headers=None, timeout=None, files=None):
+    trace = current_trace()
+    if trace is None:
+        with trace_scope(f"{method.upper()} {parse.urlsplit(url).path}"):
+            return request(
+                method,
+                url,
+                params=params,
+                json=json,
+                data=data,
+                headers=headers,
+                timeout=timeout,
+                files=files,
+            )
+
     query_string = _encode_params(params)
     if query_string:
         separator = "&" if "?" in url else "?"
@@ -113,18 +452,36 @@ def request(method, url, params=None, json=None, data=None, headers=None, timeou
         headers=normalized_headers,
         method=method.upper(),
     )
-
+    trace.method = http_request.get_method()
+    trace.url = url
+    trace.request_bytes = len(body or b"")
+
+    if _cassette is not None and _cassette.replaying:
+        with trace.phase("replay"):
+            response = _cassette.replay(trace.method, url, body, normalized_headers)
+        trace.status_code = response.status_code
+        trace.response_bytes = len(response.content)
+        return response
+
+    connection_time_before = trace.connection_time()
+    started = time.perf_counter()
     try:
-        with urllib_request.urlopen(http_request, timeout=timeout) as raw_response:
-            return _build_response(raw_response, url)
+        with _get_opener().open(http_request, timeout=timeout) as raw_response:
+            _record_time_to_first_byte(trace, started, connection_time_before)
+            response = _build_response(raw_response, url, trace)
     except error.HTTPError as exc:
-        return _build_response(exc, url)
+        _record_time_to_first_byte(trace, started, connection_time_before)
+        response = _build_response(exc, url, trace)
     except (error.URLError, socket.timeout, TimeoutError) as exc:
         reason = getattr(exc, "reason", exc)
         if isinstance(reason, socket.timeout):
             raise Timeout(str(exc)) from exc
         raise RequestException(str(exc)) from exc
 
+    if _cassette is not None:
+        _cassette.record(trace.method, url, body, normalized_headers, response)
+    return response
+
 
 def post(url, data=None, headers=None, timeout=None):
     return request("POST", url, data=data, headers=headers, timeout=timeout)
@@ -84,36 +84,37 @@ class FilesAPI:
             raise RuntimeError("Missing env vars: ERP_CLIENT_ID and/or ERP_CLIENT_SECRET")
 
         token_url = cls._resolve_token_url(base_url, config=config)
-        try:
-            response = requests.post(
-                token_url,
-                data={
-                    "grant_type": "client_credentials",
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=timeout,
-            )
-        except requests.Timeout as exc:
-            raise TimeoutError(f"Token request timed out after {timeout} seconds: {token_url}") from exc
-        except requests.RequestException as exc:
-            raise RuntimeError(f"Token request failed: {token_url}: {exc}") from exc
-
-        if not response.ok:
+        with requests.trace_scope("token"):
             try:
-                error_body = response.json()
-            except ValueError:
-                error_body = response.text
-            raise requests.HTTPError(
-                f"HTTP {response.status_code} for token request {token_url}: {error_body}",
-                response=response,
-            )
+                response = requests.post(
+                    token_url,
+                    data={
+                        "grant_type": "client_credentials",
+                        "client_id": client_id,
+                        "client_secret": client_secret,
+                    },
+                    headers={"Content-Type": "application/x-www-form-urlencoded"},
+                    timeout=timeout,
+                )
+            except requests.Timeout as exc:
+                raise TimeoutError(f"Token request timed out after {timeout} seconds: {token_url}") from exc
+            except requests.RequestException as exc:
+                raise RuntimeError(f"Token request failed: {token_url}: {exc}") from exc
+
+            if not response.ok:
+                try:
+                    error_body = response.json()
+                except ValueError:
+                    error_body = response.text
+                raise requests.HTTPError(
+                    f"HTTP {response.status_code} for token request {token_url}: {error_body}",
+                    response=response,
+                )
 
-        try:
-            payload = response.json()
-        except ValueError as exc:
-            raise ValueError(f"Failed to decode token response JSON for {token_url}: {exc}") from exc
+            try:
+                payload = response.json()
+            except ValueError as exc:
+                raise ValueError(f"Failed to decode token response JSON for {token_url}: {exc}") from exc
 
         access_token = payload.get("access_token")
         if not access_token:
@@ -186,13 +187,14 @@ class FilesAPI:
                 f"{python_method}: {', '.join(sorted(keyword_args))}"
             )
 
-        return self._request(
-            operation["httpMethod"],
-            path,
-            params=params or None,
-            json_body=json_body,
-            save_to=save_to,
-        )
+        with requests.trace_scope(python_method):
+            return self._request(
+                operation["httpMethod"],
+                path,
+                params=params or None,
+                json_body=json_body,
+                save_to=save_to,
+            )
 
     def _request(self, method, path, *, params=None, json_body=None, save_to=None):
         request_headers = dict(self.headers)
@@ -3,8 +3,6 @@ import argparse
 import json
 import sys
 
-from files_api import FilesAPI
-
 
 def parse_value(raw_value):
     try:
@@ -30,6 +28,35 @@ def configure_stdout():
         sys.stderr.reconfigure(encoding="utf-8")
 
 
+def install_trace_printer():
+    import requests
+
+    def print_trace(trace):
+        print(json.dumps(trace.as_dict(), ensure_ascii=False), file=sys.stderr)
+
+    requests.add_trace_hook(print_trace)
+
+
+def install_metrics_textfile(textfile):
+    import metrics
+
+    metrics.enable(textfile=textfile)
+
+
+def install_cassette(record_dir=None, replay_dir=None):
+    import os
+
+    import requests
+
+    if replay_dir:
+        # Client credentials are excluded from request fingerprints, so replays need no real secrets.
+        os.environ.setdefault("ERP_CLIENT_ID", "replay")
+        os.environ.setdefault("ERP_CLIENT_SECRET", "replay")
+        requests.use_cassette(replay_dir, "replay")
+    elif record_dir:
+        requests.use_cassette(record_dir, "record")
+
+
 def main():
     configure_stdout()
     parser = argparse.ArgumentParser(description="Call FilesAPI method by method name")
@@ -50,11 +77,40 @@ def main():
         "--save-to",
         help="Write raw response bytes to this path instead of printing the response body",
     )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Print per-request phase timings and byte counts to stderr as JSON lines",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        help="Write request metrics in Prometheus text format to this path on exit",
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        metavar="DIR",
+        help="Record HTTP exchanges into a cassette directory for later offline replay",
+    )
+    cassette_group.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="Serve HTTP exchanges from a recorded cassette directory without network access",
+    )
     args = parser.parse_args()
 
     positional_args = [parse_value(value) for value in args.posarg]
     keyword_args = dict(parse_named_arg(value) for value in args.arg)
 
+    if args.trace:
+        install_trace_printer()
+    if args.metrics_textfile:
+        install_metrics_textfile(args.metrics_textfile)
+    if args.record or args.replay:
+        install_cassette(record_dir=args.record, replay_dir=args.replay)
+
+    from files_api import FilesAPI
+
     api = FilesAPI()
     result = api.call_by_python_method(
         args.python_method,
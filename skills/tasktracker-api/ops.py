@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+from api import _ensure_scripts_dir_on_path
+
+
+if __name__ == "__main__":
+    _ensure_scripts_dir_on_path()
+    from tasktracker_ops import main
+
+    raise SystemExit(main())
@@ -1,5 +1,6 @@
 import json
 import os
+import threading
 from urllib.parse import quote
 from urllib.parse import urlparse
 
@@ -74,36 +75,37 @@ class TaskTrackerAPI:
             raise RuntimeError("Missing env vars: erp_client_id and/or erp_client_secret")
 
         token_url = cls._resolve_token_url(base_url, config=config)
-        try:
-            response = requests.post(
-                token_url,
-                data={
-                    "grant_type": "client_credentials",
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=timeout,
-            )
-        except requests.Timeout as exc:
-            raise TimeoutError(f"Token request timed out after {timeout} seconds: {token_url}") from exc
-        except requests.RequestException as exc:
-            raise RuntimeError(f"Token request failed: {token_url}: {exc}") from exc
-
-        if not response.ok:
+        with requests.trace_scope("token"):
             try:
-                error_body = response.json()
-            except ValueError:
-                error_body = response.text
-            raise requests.HTTPError(
-                f"HTTP {response.status_code} for token request {token_url}: {error_body}",
-                response=response,
-            )
+                response = requests.post(
+                    token_url,
+                    data={
+                        "grant_type": "client_credentials",
+                        "client_id": client_id,
+                        "client_secret": client_secret,
+                    },
+                    headers={"Content-Type": "application/x-www-form-urlencoded"},
+                    timeout=timeout,
+                )
+            except requests.Timeout as exc:
+                raise TimeoutError(f"Token request timed out after {timeout} seconds: {token_url}") from exc
+            except requests.RequestException as exc:
+                raise RuntimeError(f"Token request failed: {token_url}: {exc}") from exc
+
+            if not response.ok:
+                try:
+                    error_body = response.json()
+                except ValueError:
+                    error_body = response.text
+                raise requests.HTTPError(
+                    f"HTTP {response.status_code} for token request {token_url}: {error_body}",
+                    response=response,
+                )
 
-        try:
-            payload = response.json()
-        except ValueError as exc:
-            raise ValueError(f"Failed to decode token response JSON for {token_url}: {exc}") from exc
+            try:
+                payload = response.json()
+            except ValueError as exc:
+                raise ValueError(f"Failed to decode token response JSON for {token_url}: {exc}") from exc
 
         access_token = payload.get("access_token")
         if not access_token:
@@ -116,20 +118,39 @@ class TaskTrackerAPI:
         self.headers = dict(headers or {})
         self.timeout = timeout
         self.token = self._get_access_token(self.base_url, timeout=timeout, config=self.config)
-        self._extra_query_params = None
+        self._local = threading.local()
+
+    @property
+    def _extra_query_params(self):
+        return getattr(self._local, "extra_query_params", None)
 
-    def call_by_python_method(self, python_method, *args, odata_params=None, **kwargs):
+    @_extra_query_params.setter
+    def _extra_query_params(self, value):
+        self._local.extra_query_params = value
+
+    def call_by_python_method(self, python_method, *args, odata_params=None, fields=None, **kwargs):
         method = getattr(self, python_method, None)
         if method is None:
             raise AttributeError(f"TaskTrackerAPI has no method {python_method}")
+        odata_params = dict(odata_params or {})
+        if fields:
+            from tasktracker_odata import compile_output_fields
+
+            odata_params, fields = compile_output_fields(python_method, fields, odata_params)
         previous_extra_query_params = self._extra_query_params
-        self._extra_query_params = dict(odata_params or {})
+        self._extra_query_params = odata_params
         try:
-            return method(*args, **kwargs)
+            with requests.trace_scope(python_method):
+                result = method(*args, **kwargs)
         finally:
             self._extra_query_params = previous_extra_query_params
+        if fields:
+            from tasktracker_odata import project_fields
+
+            result = project_fields(result, fields)
+        return result
 
-    def _request(self, method, path, *, params=None, json_body=None, data=None, headers=None):
+    def _request(self, method, path, *, params=None, json_body=None, data=None, headers=None, raw=False):
         merged_params = {}
         if params:
             merged_params.update(params)
@@ -170,6 +191,9 @@ class TaskTrackerAPI:
                 response=response,
             )
 
+        if raw:
+            return response
+
         if response.status_code in (204, 205) or not response.content:
             return None
 
@@ -186,6 +210,12 @@ class TaskTrackerAPI:
         except ValueError:
             return response.text if response.text != "" else None
 
+    def get_odata_metadata_document(self, *, etag=None):
+        headers = {"Accept": "application/xml"}
+        if etag:
+            headers["If-None-Match"] = etag
+        return self._request("GET", "/odata/$metadata", headers=headers, raw=True)
+
     def get_board(self, *, project_id=None):
         """
         Get
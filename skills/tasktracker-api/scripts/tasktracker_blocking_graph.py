@@ -0,0 +1,217 @@
+import json
+import sys
+
+from tasktracker_ops_utils import describe_error, run_concurrently, write_ndjson
+
+
+BLOCKING_METHOD = "get_task_query_get_blocking_tasks_task_id"
+CLOSED_STATE = 20
+ID_KEYS = ("id", "ID", "taskId")
+
+
+def _row_id(row):
+    if isinstance(row, dict):
+        for key in ID_KEYS:
+            if row.get(key) is not None:
+                return row[key]
+        return None
+    return row
+
+
+def blocking_rows(response):
+    # The GetBlockingTasks response schema is not published; accept a bare list or an items/value wrapper.
+    if isinstance(response, dict):
+        response = response.get("items") or response.get("value") or []
+    return [row for row in response or [] if _row_id(row) is not None]
+
+
+def _is_closed(row):
+    return isinstance(row, dict) and (row.get("state") or row.get("State")) == CLOSED_STATE
+
+
+def explore(api, root_ids, max_workers=8, max_depth=None, max_nodes=1000, open_only=False):
+    adjacency = {}
+    details = {}
+    depth = {task_id: 0 for task_id in root_ids}
+    errors = {}
+    frontier = list(dict.fromkeys(root_ids))
+    round_trips = 0
+    truncated = {}
+
+    def fetch(task_id):
+        return blocking_rows(api.call_by_python_method(BLOCKING_METHOD, task_id))
+
+    while frontier:
+        # Level by level keeps depths exact; all requests of one level run concurrently.
+        round_trips += 1
+        next_frontier = []
+        for task_id, rows, error in run_concurrently(fetch, frontier, max_workers):
+            if error is not None:
+                errors[task_id] = describe_error(error)
+                adjacency[task_id] = []
+                continue
+            blockers = []
+            for row in rows:
+                blocker_id = _row_id(row)
+                if isinstance(row, dict):
+                    details.setdefault(blocker_id, {key: row[key] for key in ("title", "state") if key in row})
+                if open_only and _is_closed(row):
+                    continue
+                blockers.append(blocker_id)
+                if blocker_id in depth:
+                    continue
+                if len(depth) >= max_nodes:
+                    # Still a blocker, so the edge is kept; the node is reported without being expanded.
+                    truncated.setdefault(blocker_id, depth[task_id] + 1)
+                    continue
+                depth[blocker_id] = depth[task_id] + 1
+                if max_depth is None or depth[blocker_id] < max_depth:
+                    next_frontier.append(blocker_id)
+                else:
+                    adjacency.setdefault(blocker_id, [])
+            adjacency[task_id] = list(dict.fromkeys(blockers))
+        frontier = next_frontier
+    for task_id in depth:
+        adjacency.setdefault(task_id, [])
+    return {
+        "adjacency": adjacency,
+        "depth": depth,
+        "details": details,
+        "errors": errors,
+        "roundTrips": round_trips,
+        "truncated": truncated,
+    }
+
+
+def strongly_connected_components(adjacency):
+    index_of = {}
+    lowlink = {}
+    stack = []
+    on_stack = set()
+    components = []
+    counter = 0
+    for start in adjacency:
+        if start in index_of:
+            continue
+        work = [(start, iter(adjacency.get(start, ())))]
+        index_of[start] = lowlink[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, neighbours = work[-1]
+            advanced = False
+            for neighbour in neighbours:
+                if neighbour not in index_of:
+                    index_of[neighbour] = lowlink[neighbour] = counter
+                    counter += 1
+                    stack.append(neighbour)
+                    on_stack.add(neighbour)
+                    work.append((neighbour, iter(adjacency.get(neighbour, ()))))
+                    advanced = True
+                    break
+                if neighbour in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[neighbour])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def analyze(adjacency, root_ids):
+    components = strongly_connected_components(adjacency)
+    component_of = {node: position for position, component in enumerate(components) for node in component}
+    cycles = [
+        sorted(component, key=str)
+        for component in components
+        if len(component) > 1 or component[0] in adjacency.get(component[0], ())
+    ]
+
+    # Tarjan emits components in reverse topological order, so blockers are finished before the tasks they block.
+    longest = {}
+    following = {}
+    for position, component in enumerate(components):
+        best_length = 0
+        best_next = None
+        for node in component:
+            for neighbour in adjacency.get(node, ()):
+                target = component_of[neighbour]
+                if target != position and longest[target] > best_length:
+                    best_length = longest[target]
+                    best_next = target
+        longest[position] = best_length + len(component)
+        following[position] = best_next
+
+    start = max((component_of[root] for root in root_ids if root in component_of), key=lambda c: longest[c], default=None)
+    critical_path = []
+    while start is not None:
+        critical_path.extend(sorted(components[start], key=str))
+        start = following[start]
+    return {
+        "cycles": cycles,
+        "criticalPath": critical_path,
+        "criticalPathLength": len(critical_path),
+    }
+
+
+def blocking_graph(api, root_ids, max_workers=8, max_depth=None, max_nodes=1000, open_only=False):
+    explored = explore(api, root_ids, max_workers, max_depth, max_nodes, open_only)
+    adjacency = explored["adjacency"]
+    analysis = analyze(adjacency, root_ids)
+    return {
+        "roots": list(root_ids),
+        "nodes": {
+            str(task_id): {"depth": explored["depth"].get(task_id), "blockedBy": blockers, **explored["details"].get(task_id, {})}
+            for task_id, blockers in adjacency.items()
+        }
+        | {
+            str(task_id): {"depth": task_depth, "blockedBy": [], "truncated": True, **explored["details"].get(task_id, {})}
+            for task_id, task_depth in explored["truncated"].items()
+        },
+        "metrics": {
+            "nodes": len(adjacency),
+            "edges": sum(len(blockers) for blockers in adjacency.values()),
+            "maxDepth": max(explored["depth"].values(), default=0),
+            "criticalPathLength": analysis["criticalPathLength"],
+            "cycles": len(analysis["cycles"]),
+            "roundTrips": explored["roundTrips"],
+            "truncated": bool(explored["truncated"]),
+            "truncatedNodes": len(explored["truncated"]),
+        },
+        "criticalPath": analysis["criticalPath"],
+        "cycles": analysis["cycles"],
+        "errors": {str(task_id): error for task_id, error in explored["errors"].items()},
+    }
+
+
+def configure_parser(parser):
+    parser.add_argument("task_ids", nargs="+", type=int, metavar="TASK_ID", help="Task(s) whose blockers to expand")
+    parser.add_argument("--max-depth", type=int, help="Stop expanding blockers deeper than this many hops")
+    parser.add_argument("--max-nodes", type=int, default=1000, help="Stop adding tasks to the graph after this many")
+    parser.add_argument("--open-only", action="store_true", help="Ignore blockers that are already closed (State 20)")
+
+
+def run(api, args):
+    graph = blocking_graph(
+        api,
+        args.task_ids,
+        max_workers=args.workers,
+        max_depth=args.max_depth,
+        max_nodes=args.max_nodes,
+        open_only=args.open_only,
+    )
+    write_ndjson([graph])
+    print(json.dumps(graph["metrics"]), file=sys.stderr)
+    return 1 if graph["errors"] else 0
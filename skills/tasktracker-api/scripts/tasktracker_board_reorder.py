@@ -0,0 +1,171 @@
+import json
+import sys
+from bisect import bisect_left
+
+from tasktracker_odata import Member, normalize_odata_args, parse_orderby, report_field_corrections
+from tasktracker_ops_utils import describe_error, iter_odata_rows, run_concurrently, write_ndjson
+
+
+LIST_KINDS = {
+    "labeled": (
+        "odata_task_in_board_labeled_list",
+        "patch_board_list_command_change_position_in_labeled_list_task_id",
+    ),
+    "system": (
+        "odata_task_in_board_system_list",
+        "patch_board_list_command_change_position_in_system_list_task_id",
+    ),
+}
+# The ChangePosition* request bodies are not described in the shipped indexes; a 0-based target
+# position within the list is assumed.
+LIST_ID_KEY = "boardListId"
+POSITION_KEY = "position"
+
+
+def longest_increasing_subsequence(values):
+    tails = []
+    tail_indexes = []
+    previous = [-1] * len(values)
+    for index, value in enumerate(values):
+        position = bisect_left(tails, value)
+        if position == len(tails):
+            tails.append(value)
+            tail_indexes.append(index)
+        else:
+            tails[position] = value
+            tail_indexes[position] = index
+        previous[index] = tail_indexes[position - 1] if position else -1
+    result = []
+    index = tail_indexes[-1] if tail_indexes else -1
+    while index != -1:
+        result.append(index)
+        index = previous[index]
+    return result[::-1]
+
+
+def complete_target_order(current_ids, target_ids):
+    current = set(current_ids)
+    ordered = [task_id for task_id in dict.fromkeys(target_ids) if task_id in current]
+    listed = set(ordered)
+    return ordered + [task_id for task_id in current_ids if task_id not in listed]
+
+
+def plan_moves(current_ids, target_ids):
+    target_ids = complete_target_order(current_ids, target_ids)
+    target_rank = {task_id: rank for rank, task_id in enumerate(target_ids)}
+    ranks = [target_rank[task_id] for task_id in current_ids]
+    kept = {current_ids[index] for index in longest_increasing_subsequence(ranks)}
+
+    # Tasks outside the LIS move in target order, each right after its target predecessor, which is
+    # already in place by then. Positions are computed on a simulated copy of the list.
+    simulated = list(current_ids)
+    moves = []
+    for rank, task_id in enumerate(target_ids):
+        if task_id in kept:
+            continue
+        simulated.remove(task_id)
+        position = simulated.index(target_ids[rank - 1]) + 1 if rank else 0
+        simulated.insert(position, task_id)
+        moves.append({"taskId": task_id, "position": position, "afterTaskId": target_ids[rank - 1] if rank else None})
+    return moves
+
+
+def resolve_order_by(list_kind, orderby):
+    # Rows are sorted locally by their PascalCase keys, so a camelCase or unknown field would otherwise sort
+    # nothing; names are corrected, and unknown ones rejected, against the list's index model.
+    odata_method, _ = LIST_KINDS[list_kind]
+    normalized_args, corrections = normalize_odata_args(odata_method, {"$orderby": orderby})
+    report_field_corrections(corrections)
+    return normalized_args["$orderby"]
+
+
+def sort_rows(rows, orderby):
+    ordered = list(rows)
+    for item in reversed(parse_orderby(orderby)):
+        if not isinstance(item.expression, Member):
+            raise ValueError(f"--order-by supports field paths only: {orderby}")
+        path = item.expression.path
+
+        def value(row, path=path):
+            for segment in path:
+                row = row.get(segment) if isinstance(row, dict) else None
+            return row
+
+        present = [row for row in ordered if value(row) is not None]
+        missing = [row for row in ordered if value(row) is None]
+        present.sort(key=value, reverse=item.direction == "desc")
+        ordered = present + missing
+    return ordered
+
+
+def load_list(api, list_kind, list_id, order_by=None):
+    odata_method, _ = LIST_KINDS[list_kind]
+    rows = list(
+        iter_odata_rows(
+            api,
+            odata_method,
+            odata_params={"$orderby": "Order,ID"},
+            board_list_id=list_id,
+        )
+    )
+    current_ids = [row["ID"] for row in rows]
+    target_ids = [row["ID"] for row in sort_rows(rows, order_by)] if order_by else None
+    return current_ids, target_ids
+
+
+def apply_moves(api, list_kind, list_id, moves):
+    _, command = LIST_KINDS[list_kind]
+    results = []
+    # Positions depend on the preceding moves, so one list is reordered sequentially.
+    for move in moves:
+        body = {LIST_ID_KEY: list_id, POSITION_KEY: move["position"]}
+        try:
+            api.call_by_python_method(command, move["taskId"], body=body)
+        except Exception as exc:
+            results.append({**move, "listId": list_id, "ok": False, "error": describe_error(exc)})
+            break
+        results.append({**move, "listId": list_id, "ok": True})
+    return results
+
+
+def configure_parser(parser):
+    parser.add_argument("--list-kind", choices=sorted(LIST_KINDS), required=True)
+    parser.add_argument("--list", dest="list_ids", action="append", type=int, default=[], help="Board list ID (repeatable)")
+    target_group = parser.add_mutually_exclusive_group(required=True)
+    target_group.add_argument("--order-by", help="Target order as an OData $orderby, for example 'Weight desc,DueDate'")
+    target_group.add_argument(
+        "--target",
+        help="JSON file mapping list IDs to task IDs in the desired order; tasks not listed keep their relative order at the end",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Print the planned moves without sending them")
+
+
+def run(api, args):
+    targets = {}
+    if args.target:
+        with open(args.target, encoding="utf-8") as handle:
+            targets = {int(list_id): task_ids for list_id, task_ids in json.load(handle).items()}
+    list_ids = list(dict.fromkeys(args.list_ids + list(targets)))
+    if not list_ids:
+        raise ValueError("Pass --list or a --target file with at least one list")
+    order_by = resolve_order_by(args.list_kind, args.order_by) if args.order_by else None
+
+    def reorder(list_id):
+        current_ids, ordered_ids = load_list(api, args.list_kind, list_id, order_by=order_by)
+        moves = plan_moves(current_ids, ordered_ids if ordered_ids is not None else targets.get(list_id, []))
+        if args.dry_run:
+            return [{**move, "listId": list_id} for move in moves], len(current_ids)
+        return apply_moves(api, args.list_kind, list_id, moves), len(current_ids)
+
+    failed = False
+    # Lists are independent of each other, so they are reordered concurrently.
+    for list_id, outcome, error in run_concurrently(reorder, list_ids, args.workers):
+        if error is not None:
+            failed = True
+            print(json.dumps({"listId": list_id, "ok": False, "error": describe_error(error)}), file=sys.stderr)
+            continue
+        results, size = outcome
+        write_ndjson(results)
+        failed = failed or not all(result.get("ok", True) for result in results)
+        print(json.dumps({"listId": list_id, "tasks": size, "moves": len(results)}), file=sys.stderr)
+    return 1 if failed else 0
@@ -4,7 +4,13 @@ import json
 import re
 import sys
 
-from tasktracker_api import TaskTrackerAPI
+from tasktracker_odata import (
+    HIDDEN_FILTER,
+    compile_output_fields,
+    inject_hidden_filter,
+    normalize_odata_args,
+    report_field_corrections,
+)
 from tasktracker_url_utils import get_epic_id_from_url, get_project_id_from_url, get_task_id_from_url
 
 
@@ -28,7 +34,6 @@ ODATA_METHODS_REQUIRING_PROJECT_ID = {
 }
 
 
-HIDDEN_FILTER = "Hidden eq false"
 ENTRY_STATE_HINTS = {
     "10": "open entries",
     "20": "closed entries",
@@ -63,6 +68,35 @@ def configure_stdout():
         sys.stderr.reconfigure(encoding="utf-8")
 
 
+def install_trace_printer():
+    import requests
+
+    def print_trace(trace):
+        print(json.dumps(trace.as_dict(), ensure_ascii=False), file=sys.stderr)
+
+    requests.add_trace_hook(print_trace)
+
+
+def install_metrics_textfile(textfile):
+    import metrics
+
+    metrics.enable(textfile=textfile)
+
+
+def install_cassette(record_dir=None, replay_dir=None):
+    import os
+
+    import requests
+
+    if replay_dir:
+        # Client credentials are excluded from request fingerprints, so replays need no real secrets.
+        os.environ.setdefault("ERP_CLIENT_ID", "replay")
+        os.environ.setdefault("ERP_CLIENT_SECRET", "replay")
+        requests.use_cassette(replay_dir, "replay")
+    elif record_dir:
+        requests.use_cassette(record_dir, "record")
+
+
 def has_exact_select_field(select_value, field_name):
     if not isinstance(select_value, str):
         return False
@@ -99,26 +133,31 @@ def apply_default_hidden_filter(python_method, odata_args, include_hidden=False)
 
     normalized_args = dict(odata_args)
     raw_filter = normalized_args.get("$filter")
-    if raw_filter is None:
-        normalized_args["$filter"] = HIDDEN_FILTER
-        return normalized_args
-
-    if not isinstance(raw_filter, str):
+    if raw_filter is not None and not isinstance(raw_filter, str):
         raise ValueError("$filter must be a string when passed through --odata-arg.")
 
-    stripped_filter = raw_filter.strip()
-    if not stripped_filter:
-        normalized_args["$filter"] = HIDDEN_FILTER
-        return normalized_args
+    normalized_args["$filter"] = inject_hidden_filter(raw_filter)
+    return normalized_args
 
-    if stripped_filter == HIDDEN_FILTER:
-        normalized_args["$filter"] = HIDDEN_FILTER
-        return normalized_args
 
-    normalized_args["$filter"] = f"({stripped_filter}) and {HIDDEN_FILTER}"
+def normalize_odata_field_names(python_method, odata_args, validate_fields=True, model=None):
+    normalized_args, corrections = normalize_odata_args(
+        python_method,
+        odata_args,
+        validate_fields=validate_fields,
+        model=model,
+    )
+    report_field_corrections(corrections)
     return normalized_args
 
 
+def load_metadata_model(api, python_method):
+    import tasktracker_metadata
+
+    schema = tasktracker_metadata.load_schema(api)
+    return tasktracker_metadata.model_for_method(schema, python_method)
+
+
 def validate_odata_usage(python_method, keyword_args, odata_args):
     if not python_method.startswith("odata_"):
         return
@@ -214,14 +253,49 @@ def main():
         default=[],
         help="OData query argument in key=value form, for example $filter=Status eq 'Open'",
     )
+    parser.add_argument(
+        "--fields",
+        help="Comma-separated output fields, for example ID,Title,State,Labels/Title; "
+        "compiled into $select/$expand for OData endpoints and projected client-side otherwise",
+    )
     parser.add_argument(
         "--include-hidden",
         action="store_true",
         help="Allow reading hidden entities in OData endpoints without the default Hidden eq false filter",
     )
+    parser.add_argument(
+        "--skip-field-check",
+        action="store_true",
+        help="Send OData field names as given instead of checking them against the local index models",
+    )
+    parser.add_argument(
+        "--metadata-check",
+        action="store_true",
+        help="Check OData field names against the server $metadata schema (cached on disk) instead of the index models",
+    )
     parser.add_argument("--task-url", help="Extract taskId from URL and prepend it to positional arguments")
     parser.add_argument("--epic-url", help="Extract epicId from URL and prepend it to positional arguments")
     parser.add_argument("--project-url", help="Extract projectId from URL and prepend it to positional arguments")
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Print per-request phase timings and byte counts to stderr as JSON lines",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        help="Write request metrics in Prometheus text format to this path on exit",
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        metavar="DIR",
+        help="Record HTTP exchanges into a cassette directory for later offline replay",
+    )
+    cassette_group.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="Serve HTTP exchanges from a recorded cassette directory without network access",
+    )
     args = parser.parse_args()
     python_method = args.python_method
 
@@ -236,6 +310,36 @@ def main():
     positional_args = derived_positional_args + positional_args
     keyword_args = dict(parse_named_arg(value) for value in args.arg)
     odata_args = dict(parse_named_arg(value) for value in args.odata_arg)
+    fields = args.fields
+
+    if args.trace:
+        install_trace_printer()
+    if args.metrics_textfile:
+        install_metrics_textfile(args.metrics_textfile)
+    if args.record or args.replay:
+        install_cassette(record_dir=args.record, replay_dir=args.replay)
+
+    api = None
+    model = None
+    if args.metadata_check and python_method.startswith("odata_"):
+        # The live schema is loaded first so that names are normalized against it before anything validates them.
+        from tasktracker_api import TaskTrackerAPI
+
+        api = TaskTrackerAPI()
+        model = load_metadata_model(api, python_method)
+    odata_args = normalize_odata_field_names(
+        python_method,
+        odata_args,
+        validate_fields=not args.skip_field_check,
+        model=model,
+    )
+    odata_args, fields = compile_output_fields(
+        python_method,
+        fields,
+        odata_args,
+        validate_fields=not args.skip_field_check,
+        model=model,
+    )
     odata_args = apply_default_hidden_filter(
         python_method,
         odata_args,
@@ -243,11 +347,15 @@ def main():
     )
     validate_odata_usage(python_method, keyword_args, odata_args)
 
-    api = TaskTrackerAPI()
+    if api is None:
+        from tasktracker_api import TaskTrackerAPI
+
+        api = TaskTrackerAPI()
     result = api.call_by_python_method(
         python_method,
         *positional_args,
         odata_params=odata_args,
+        fields=fields,
         **keyword_args,
     )
     print(json.dumps(result, ensure_ascii=False, indent=2))
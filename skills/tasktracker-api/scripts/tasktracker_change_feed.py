@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+from tasktracker_metadata import default_cache_dir
+from tasktracker_ops_utils import describe_error, odata_rows, run_concurrently, write_ndjson
+
+
+FEEDS = {
+    "task": ("odata_task_history", "TaskId"),
+    "epic": ("odata_epic_history", "EpicId"),
+}
+PAGE_SIZE = 200
+MIN_INTERVAL_SECONDS = 5.0
+MAX_INTERVAL_SECONDS = 120.0
+BACKOFF = 2.0
+RECENT_IDS = 10000
+
+
+def default_cursor_path(base_url):
+    digest = hashlib.sha256(base_url.rstrip("/").encode("utf-8")).hexdigest()[:16]
+    return default_cache_dir() / f"tasktracker-changefeed-{digest}.json"
+
+
+class ChangeFeed:
+    def __init__(self, api, feeds=tuple(FEEDS), cursor_path=None, page_size=PAGE_SIZE, from_start=False):
+        self.api = api
+        self.feeds = tuple(feeds)
+        self.cursor_path = Path(cursor_path) if cursor_path else None
+        self.page_size = page_size
+        self.from_start = from_start
+        self.cursor = {}
+        self._recent = {feed: (deque(maxlen=RECENT_IDS), set()) for feed in self.feeds}
+        if self.cursor_path is not None:
+            try:
+                self.cursor = json.loads(self.cursor_path.read_text(encoding="utf-8")).get("cursor", {})
+            except (OSError, ValueError):
+                self.cursor = {}
+
+    def save(self):
+        if self.cursor_path is None:
+            return
+        self.cursor_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.cursor_path.with_suffix(f".{os.getpid()}.tmp")
+        temporary_path.write_text(json.dumps({"cursor": self.cursor}), encoding="utf-8")
+        os.replace(temporary_path, self.cursor_path)
+
+    def _latest_id(self, feed):
+        python_method, _ = FEEDS[feed]
+        rows = odata_rows(
+            self.api.call_by_python_method(python_method, odata_params={"$select": "ID", "$orderby": "ID desc", "$top": 1})
+        )
+        return rows[0]["ID"] if rows else 0
+
+    def _read(self, feed):
+        python_method, entity_key = FEEDS[feed]
+        if feed not in self.cursor and not self.from_start:
+            # A new cursor starts at the newest entry unless the whole history was asked for.
+            self.cursor[feed] = self._latest_id(feed)
+            return []
+        last_id = self.cursor.get(feed, 0)
+        rows = []
+        # Keyset paging on ID: an idle poll is one request, and new entries never shift the pages.
+        while True:
+            page = odata_rows(
+                self.api.call_by_python_method(
+                    python_method,
+                    odata_params={"$filter": f"ID gt {last_id}", "$orderby": "ID", "$top": self.page_size},
+                )
+            )
+            # Rows at or before the cursor mean the filter was not applied; stop rather than loop on them.
+            new_rows = [row for row in page if row["ID"] > last_id]
+            rows.extend(new_rows)
+            if len(page) < self.page_size or not new_rows:
+                break
+            last_id = max(row["ID"] for row in new_rows)
+        return [self._event(feed, entity_key, row) for row in rows]
+
+    @staticmethod
+    def _event(feed, entity_key, row):
+        return {
+            "feed": feed,
+            "id": row["ID"],
+            "entityId": row.get(entity_key),
+            "command": row.get("CommandName") or row.get("Command"),
+            "createdAt": row.get("CreatedAt"),
+            "executorId": row.get("ExecutorId"),
+            "data": row.get("Data"),
+        }
+
+    def _fresh(self, feed, events):
+        order, seen = self._recent[feed]
+        fresh = []
+        for event in sorted(events, key=lambda event: event["id"]):
+            if event["id"] in seen:
+                continue
+            if len(order) == order.maxlen:
+                seen.discard(order[0])
+            order.append(event["id"])
+            seen.add(event["id"])
+            fresh.append(event)
+        return fresh
+
+    def poll(self):
+        events = []
+        errors = []
+        for feed, feed_events, error in run_concurrently(self._read, self.feeds, len(self.feeds)):
+            if error is not None:
+                errors.append({"feed": feed, "ok": False, "error": describe_error(error)})
+                continue
+            events.extend(self._fresh(feed, feed_events))
+        return events, errors
+
+    def acknowledge(self, events):
+        for event in events:
+            self.cursor[event["feed"]] = max(self.cursor.get(event["feed"], 0), event["id"])
+
+
+def coalesce(events):
+    merged = {}
+    for event in events:
+        key = (event["feed"], event["entityId"])
+        if key not in merged:
+            merged[key] = {**event, "commands": []}
+        entry = merged[key]
+        entry["commands"].append(event["command"])
+        entry.update({"id": event["id"], "createdAt": event["createdAt"], "command": event["command"], "data": event["data"]})
+    return list(merged.values())
+
+
+def watch(
+    feed,
+    callback,
+    min_interval=MIN_INTERVAL_SECONDS,
+    max_interval=MAX_INTERVAL_SECONDS,
+    max_polls=None,
+    on_error=None,
+    sleep=time.sleep,
+):
+    interval = min_interval
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        events, errors = feed.poll()
+        polls += 1
+        if events:
+            callback(events)
+            # The cursor only moves past events the callback has handled, so delivery is at least once.
+            feed.acknowledge(events)
+        feed.save()
+        for error in errors:
+            if on_error is not None:
+                on_error(error)
+        # Poll quickly while changes keep coming, and back off while the feeds are idle.
+        interval = min_interval if events else min(max_interval, interval * BACKOFF)
+        if max_polls is None or polls < max_polls:
+            sleep(interval)
+    return polls
+
+
+def configure_parser(parser):
+    parser.add_argument("--feed", dest="feeds", action="append", choices=sorted(FEEDS), help="History feed (repeatable; default both)")
+    parser.add_argument("--cursor", help="Cursor file (default: ERP_CACHE_DIR/tasktracker-changefeed-<server>.json)")
+    parser.add_argument("--from-start", action="store_true", help="Replay the whole history when the cursor file is new")
+    parser.add_argument("--coalesce", action="store_true", help="Emit one event per changed task or epic per poll")
+    parser.add_argument("--min-interval", type=float, default=MIN_INTERVAL_SECONDS, help="Seconds between polls while changes arrive")
+    parser.add_argument("--max-interval", type=float, default=MAX_INTERVAL_SECONDS, help="Longest wait between idle polls")
+    parser.add_argument("--once", action="store_true", help="Poll once, print the changes and exit")
+
+
+def run(api, args):
+    feed = ChangeFeed(
+        api,
+        feeds=args.feeds or tuple(FEEDS),
+        cursor_path=args.cursor or default_cursor_path(api.base_url),
+        from_start=args.from_start,
+    )
+
+    def emit(events):
+        write_ndjson(coalesce(events) if args.coalesce else events)
+        sys.stdout.flush()
+
+    def report(error):
+        print(json.dumps(error), file=sys.stderr)
+
+    try:
+        watch(feed, emit, args.min_interval, args.max_interval, max_polls=1 if args.once else None, on_error=report)
+    except KeyboardInterrupt:
+        feed.save()
+    return 0
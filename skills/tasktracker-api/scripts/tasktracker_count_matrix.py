@@ -0,0 +1,117 @@
+import json
+import sys
+
+from tasktracker_odata import inject_hidden_filter, normalize_odata_args, parse_filter, to_odata
+from tasktracker_ops_utils import ResultCache, describe_error, run_concurrently, write_csv, write_ndjson
+
+
+COUNT_METHODS = {
+    "task": "odata_task_count",
+    "epic": "odata_epic_count",
+    "milestone": "odata_milestone_count",
+}
+CACHE_NAME = "count-matrix"
+COUNT_CACHE_TTL_SECONDS = 60
+
+
+def parse_filter_spec(spec, default_entity="task"):
+    name, separator, expression = spec.partition("=")
+    if not separator or not name.strip():
+        raise ValueError(f"Expected [ENTITY:]NAME=FILTER, got {spec!r}")
+    entity, colon, short_name = name.partition(":")
+    if colon and entity.strip() in COUNT_METHODS:
+        return short_name.strip(), entity.strip(), expression.strip()
+    return name.strip(), default_entity, expression.strip()
+
+
+def canonical_filter(python_method, expression, include_hidden=False):
+    if expression:
+        args, _ = normalize_odata_args(python_method, {"$filter": expression})
+        expression = to_odata(parse_filter(args["$filter"]))
+    return expression if include_hidden else inject_hidden_filter(expression or None)
+
+
+def plan_queries(project_ids, filters, include_hidden=False):
+    # Cells that resolve to the same (method, project, filter) share one request.
+    cells = {}
+    for project_id in project_ids:
+        for name, entity, expression in filters:
+            python_method = COUNT_METHODS[entity]
+            cells[(project_id, name)] = (python_method, project_id, canonical_filter(python_method, expression, include_hidden))
+    return cells, list(dict.fromkeys(cells.values()))
+
+
+def count_matrix(api, project_ids, filters, max_workers=8, cache=None, include_hidden=False):
+    cells, queries = plan_queries(project_ids, filters, include_hidden)
+    counts = {}
+    pending = []
+    for query in queries:
+        hit, value = cache.get(json.dumps(query)) if cache is not None else (False, None)
+        if hit:
+            counts[query] = (value, None)
+        else:
+            pending.append(query)
+
+    def count(query):
+        python_method, project_id, odata_filter = query
+        odata_params = {"$filter": odata_filter} if odata_filter else None
+        return int(api.call_by_python_method(python_method, odata_params=odata_params, project_id=project_id))
+
+    for query, value, error in run_concurrently(count, pending, max_workers):
+        counts[query] = (value, error)
+        if error is None and cache is not None:
+            cache.put(json.dumps(query), value)
+    if cache is not None:
+        cache.save()
+
+    names = list(dict.fromkeys(name for name, _, _ in filters))
+    rows = []
+    errors = []
+    for project_id in project_ids:
+        row = {"projectId": project_id}
+        for name in names:
+            value, error = counts[cells[(project_id, name)]]
+            row[name] = value
+            if error is not None:
+                errors.append({"projectId": project_id, "name": name, "ok": False, "error": describe_error(error)})
+        rows.append(row)
+    stats = {"cells": len(cells), "queries": len(queries), "requests": len(pending)}
+    return rows, errors, stats
+
+
+def configure_parser(parser):
+    parser.add_argument("--project", dest="project_ids", action="append", type=int, required=True, help="Project ID (repeatable)")
+    parser.add_argument(
+        "--filter",
+        dest="filters",
+        action="append",
+        required=True,
+        help="Matrix column as [task|epic|milestone:]NAME=FILTER, for example 'epic:open=State eq 10' (repeatable; "
+        "an empty FILTER counts everything)",
+    )
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--include-hidden", action="store_true", help="Do not add 'Hidden eq false' to every filter")
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=COUNT_CACHE_TTL_SECONDS,
+        help="Reuse counts fetched within this many seconds (0 disables the cache)",
+    )
+
+
+def run(api, args):
+    filters = [parse_filter_spec(spec) for spec in args.filters]
+    names = [name for name, _, _ in filters]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Column names must be unique: {', '.join(names)}")
+    cache = ResultCache(CACHE_NAME, api.base_url, ttl=args.cache_ttl) if args.cache_ttl > 0 else None
+    project_ids = list(dict.fromkeys(args.project_ids))
+    rows, errors, stats = count_matrix(api, project_ids, filters, args.workers, cache, args.include_hidden)
+    if args.format == "csv":
+        write_csv(rows)
+    else:
+        write_ndjson(rows)
+    for error in errors:
+        print(json.dumps(error), file=sys.stderr)
+    print(json.dumps(stats), file=sys.stderr)
+    return 1 if errors else 0
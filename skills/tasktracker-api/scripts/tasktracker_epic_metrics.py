@@ -0,0 +1,114 @@
+import json
+import sys
+
+from tasktracker_ops_utils import (
+    RESULT_CACHE_TTL_SECONDS,
+    RateLimiter,
+    ResultCache,
+    describe_error,
+    iter_odata_rows,
+    run_concurrently,
+    write_csv,
+    write_ndjson,
+)
+
+
+METRICS_METHOD = "get_epic_query_get_metrics_epic_id"
+CACHE_NAME = "epic-metrics"
+OPEN_EPICS_FILTER = "State eq 10"
+EPIC_SELECT = "ID,Title,ProjectId,DueDate"
+
+
+def flatten(value, prefix=""):
+    # The GetMetrics response schema is not published; nested objects become dotted columns.
+    if not isinstance(value, dict):
+        return {prefix or "metrics": value}
+    flat = {}
+    for key, item in value.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(item, dict):
+            flat.update(flatten(item, name))
+        else:
+            flat[name] = item
+    return flat
+
+
+def list_open_epics(api, project_ids, max_workers=8):
+    def epics(project_id):
+        return list(
+            iter_odata_rows(
+                api,
+                "odata_epic",
+                odata_params={"$filter": OPEN_EPICS_FILTER, "$select": EPIC_SELECT},
+                project_id=project_id,
+            )
+        )
+
+    listed = []
+    errors = []
+    for project_id, rows, error in run_concurrently(epics, project_ids, max_workers):
+        if error is not None:
+            errors.append({"projectId": project_id, "ok": False, "error": describe_error(error)})
+            continue
+        listed.extend((project_id, row) for row in rows)
+    return listed, errors
+
+
+def fetch_metrics(api, epic_ids, max_workers=8, rate=None, cache=None):
+    limiter = RateLimiter(rate)
+
+    def load(epic_id):
+        if cache is not None:
+            hit, value = cache.get(str(epic_id))
+            if hit:
+                return value
+        limiter.wait()
+        value = api.call_by_python_method(METRICS_METHOD, epic_id)
+        if cache is not None:
+            cache.put(str(epic_id), value)
+        return value
+
+    try:
+        return {epic_id: (value, error) for epic_id, value, error in run_concurrently(load, epic_ids, max_workers)}
+    finally:
+        if cache is not None:
+            cache.save()
+
+
+def dashboard(api, project_ids, max_workers=8, rate=None, cache=None):
+    epics, errors = list_open_epics(api, project_ids, max_workers)
+    fetched = fetch_metrics(api, list(dict.fromkeys(epic["ID"] for _, epic in epics)), max_workers, rate, cache)
+    rows = []
+    for project_id, epic in epics:
+        value, error = fetched[epic["ID"]]
+        if error is not None:
+            errors.append({"projectId": project_id, "epicId": epic["ID"], "ok": False, "error": describe_error(error)})
+            continue
+        row = {"projectId": project_id, "epicId": epic["ID"], "title": epic.get("Title"), "dueDate": epic.get("DueDate")}
+        rows.append({**row, **flatten(value)})
+    return rows, errors
+
+
+def configure_parser(parser):
+    parser.add_argument("--project", dest="project_ids", action="append", type=int, required=True, help="Project ID (repeatable)")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--rate", type=float, default=10.0, help="Maximum GetMetrics requests per second (0 disables the limit)")
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=RESULT_CACHE_TTL_SECONDS,
+        help="Reuse metrics fetched within this many seconds (0 disables the cache)",
+    )
+
+
+def run(api, args):
+    cache = ResultCache(CACHE_NAME, api.base_url, ttl=args.cache_ttl) if args.cache_ttl > 0 else None
+    rows, errors = dashboard(api, args.project_ids, args.workers, args.rate or None, cache)
+    if args.format == "csv":
+        write_csv(rows)
+    else:
+        write_ndjson(rows)
+    for error in errors:
+        print(json.dumps(error), file=sys.stderr)
+    print(json.dumps({"projects": len(args.project_ids), "epics": len(rows), "errors": len(errors)}), file=sys.stderr)
+    return 1 if errors else 0
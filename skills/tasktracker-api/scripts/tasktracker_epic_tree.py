@@ -0,0 +1,164 @@
+import json
+import sys
+
+from tasktracker_ops_utils import describe_error, iter_odata_rows, run_concurrently, write_ndjson
+
+
+OPEN_STATE = 10
+CLOSED_STATE = 20
+EPIC_SELECT = "ID,Title,State,ParentId,RoadmapOrder,StartDate,DueDate"
+TASK_SELECT = "ID,State,Weight"
+ROLLUP_FIELDS = ("tasks", "openTasks", "closedTasks", "weight", "openWeight")
+
+
+def load_epics(api, project_id, include_closed=True):
+    params = {"$select": EPIC_SELECT}
+    if not include_closed:
+        params["$filter"] = f"State eq {OPEN_STATE}"
+    return list(iter_odata_rows(api, "odata_epic", odata_params=params, project_id=project_id))
+
+
+def build_tree(epics):
+    nodes = {epic["ID"]: epic for epic in epics}
+    children = {epic_id: [] for epic_id in nodes}
+    roots = []
+    for epic in epics:
+        parent_id = epic.get("ParentId")
+        # Parents outside the loaded set (another project, hidden or filtered out) make the epic a root.
+        if parent_id in nodes and parent_id != epic["ID"]:
+            children[parent_id].append(epic["ID"])
+        else:
+            roots.append(epic["ID"])
+
+    def order(epic_id):
+        epic = nodes[epic_id]
+        return (epic.get("RoadmapOrder") is None, epic.get("RoadmapOrder") or 0, epic_id)
+
+    roots.sort(key=order)
+    for child_ids in children.values():
+        child_ids.sort(key=order)
+
+    # Parent links that loop back on themselves never reach a root; break such cycles at their smallest ID.
+    reachable = set()
+    stack = list(roots)
+    while stack:
+        epic_id = stack.pop()
+        reachable.add(epic_id)
+        stack.extend(children[epic_id])
+    for epic_id in sorted(set(nodes) - reachable):
+        if epic_id in reachable:
+            continue
+        # The epic may only hang off a cycle, so follow its parents until one repeats to find the cycle itself.
+        path = []
+        seen = set()
+        current = epic_id
+        while current not in seen:
+            seen.add(current)
+            path.append(current)
+            current = nodes[current]["ParentId"]
+        cycle_root = min(path[path.index(current):])
+        children[nodes[cycle_root]["ParentId"]].remove(cycle_root)
+        roots.append(cycle_root)
+        stack = [cycle_root]
+        while stack:
+            current = stack.pop()
+            reachable.add(current)
+            stack.extend(children[current])
+    return roots, children
+
+
+def summarize_tasks(rows):
+    rollup = dict.fromkeys(ROLLUP_FIELDS, 0)
+    for row in rows:
+        weight = row.get("Weight") or 0
+        rollup["tasks"] += 1
+        rollup["weight"] += weight
+        if row.get("State") == CLOSED_STATE:
+            rollup["closedTasks"] += 1
+        else:
+            rollup["openTasks"] += 1
+            rollup["openWeight"] += weight
+    return rollup
+
+
+def load_rollups(api, epic_ids, max_workers=8):
+    def rollup(epic_id):
+        return summarize_tasks(
+            iter_odata_rows(api, "odata_task_in_epic", odata_params={"$select": TASK_SELECT}, epic_id=epic_id)
+        )
+
+    rollups = {}
+    errors = {}
+    for epic_id, result, error in run_concurrently(rollup, epic_ids, max_workers):
+        if error is not None:
+            errors[epic_id] = describe_error(error)
+            result = dict.fromkeys(ROLLUP_FIELDS, 0)
+        rollups[epic_id] = result
+    return rollups, errors
+
+
+def materialize(epics, rollups):
+    nodes = {epic["ID"]: epic for epic in epics}
+    roots, children = build_tree(epics)
+    rows = []
+    totals = {}
+    # One iterative depth-first pass: rows are emitted in preorder and subtree totals filled in on the way back up.
+    stack = [(epic_id, 0, None, False) for epic_id in reversed(roots)]
+    while stack:
+        epic_id, depth, parent_id, finished = stack.pop()
+        if finished:
+            subtree = dict(rollups.get(epic_id) or dict.fromkeys(ROLLUP_FIELDS, 0))
+            for child_id in children[epic_id]:
+                for key in ROLLUP_FIELDS:
+                    subtree[key] += totals[child_id][key]
+            totals[epic_id] = subtree
+            continue
+        epic = nodes[epic_id]
+        rows.append(
+            {
+                "epicId": epic_id,
+                "title": epic.get("Title"),
+                "state": epic.get("State"),
+                "parentId": parent_id,
+                "depth": depth,
+                "children": list(children[epic_id]),
+                "own": rollups.get(epic_id) or dict.fromkeys(ROLLUP_FIELDS, 0),
+            }
+        )
+        stack.append((epic_id, depth, parent_id, True))
+        stack.extend((child_id, depth + 1, epic_id, False) for child_id in reversed(children[epic_id]))
+    for row in rows:
+        row["subtree"] = totals[row["epicId"]]
+    return rows
+
+
+def nest(rows):
+    by_id = {row["epicId"]: {key: value for key, value in row.items() if key != "children"} for row in rows}
+    roots = []
+    for row in rows:
+        node = by_id[row["epicId"]]
+        node["children"] = [by_id[child_id] for child_id in row["children"]]
+        if row["parentId"] is None:
+            roots.append(node)
+    return roots
+
+
+def configure_parser(parser):
+    parser.add_argument("--project", dest="project_id", type=int, required=True, help="Project ID")
+    parser.add_argument("--open-only", action="store_true", help="Load open epics only (State eq 10)")
+    parser.add_argument("--no-tasks", action="store_true", help="Skip the per-epic task rollups")
+    parser.add_argument("--nested", action="store_true", help="Print one nested JSON tree instead of NDJSON rows")
+
+
+def run(api, args):
+    epics = load_epics(api, args.project_id, include_closed=not args.open_only)
+    rollups, errors = ({}, {}) if args.no_tasks else load_rollups(api, [epic["ID"] for epic in epics], args.workers)
+    rows = materialize(epics, rollups)
+    if args.nested:
+        write_ndjson([nest(rows)])
+    else:
+        write_ndjson(rows)
+    for epic_id, error in errors.items():
+        print(json.dumps({"epicId": epic_id, "ok": False, "error": error}), file=sys.stderr)
+    print(json.dumps({"projectId": args.project_id, "epics": len(rows), "roots": sum(row["parentId"] is None for row in rows)}), file=sys.stderr)
+    return 1 if errors else 0
@@ -0,0 +1,181 @@
+import threading
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import quote_plus
+
+from tasktracker_odata import and_filters, parse_fields
+
+
+MAX_FILTER_LENGTH = 1500
+MAX_BATCH_SIZE = 100
+KEY_FIELD = "ID"
+
+
+class _LoaderFuture(Future):
+    def __init__(self, loader):
+        super().__init__()
+        self._loader = loader
+
+    def result(self, timeout=None):
+        if not self.done():
+            self._loader.dispatch()
+        return super().result(timeout)
+
+    def exception(self, timeout=None):
+        if not self.done():
+            self._loader.dispatch()
+        return super().exception(timeout)
+
+
+def chunk_ids(
+    ids,
+    max_filter_length=MAX_FILTER_LENGTH,
+    max_batch_size=MAX_BATCH_SIZE,
+    base_filter=None,
+    key_field=KEY_FIELD,
+):
+    # Length of the URL-encoded "$filter" value; every extra key costs its digits plus an encoded comma.
+    overhead = len(quote_plus(f"({base_filter}) and {key_field} in ()" if base_filter else f"{key_field} in ()"))
+    chunks = []
+    current = []
+    length = overhead
+    for key in ids:
+        key_length = len(quote_plus(str(key))) + (len(quote_plus(",")) if current else 0)
+        if current and (length + key_length > max_filter_length or len(current) >= max_batch_size):
+            chunks.append(current)
+            current = []
+            length = overhead
+            key_length = len(quote_plus(str(key)))
+        current.append(key)
+        length += key_length
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _settle(future, row=None, error=None):
+    # prime() may resolve a key while its batch is in flight; the first value wins.
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(row)
+    except InvalidStateError:
+        pass
+
+
+class ODataLoader:
+    def __init__(
+        self,
+        api,
+        python_method,
+        *,
+        fields=None,
+        odata_filter=None,
+        max_filter_length=MAX_FILTER_LENGTH,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_workers=4,
+        **method_kwargs,
+    ):
+        self.api = api
+        self.python_method = python_method
+        self.method_kwargs = method_kwargs
+        self.odata_filter = odata_filter
+        self.max_filter_length = max_filter_length
+        self.max_batch_size = max_batch_size
+        self.max_workers = max_workers
+        self.fields = None
+        if fields:
+            paths = parse_fields(fields)
+            if not any(path == (KEY_FIELD,) for path in paths):
+                paths = ((KEY_FIELD,),) + paths
+            self.fields = ["/".join(path) for path in paths]
+        self._futures = {}
+        self._pending = []
+        self._lock = threading.Lock()
+        self._batch_depth = 0
+        self.round_trips = 0
+
+    def load(self, key):
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = _LoaderFuture(self)
+                self._futures[key] = future
+                self._pending.append(key)
+            return future
+
+    def load_many(self, keys):
+        return [self.load(key) for key in keys]
+
+    def prime(self, key, row):
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or future.done():
+                future = Future()
+                self._futures[key] = future
+            elif key in self._pending:
+                self._pending.remove(key)
+        _settle(future, row)
+
+    def clear(self, key=None):
+        with self._lock:
+            if key is None:
+                self._futures = {key: future for key, future in self._futures.items() if not future.done()}
+            elif key in self._futures and self._futures[key].done():
+                del self._futures[key]
+
+    @contextmanager
+    def batch(self):
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost:
+                self.dispatch()
+
+    def dispatch(self):
+        with self._lock:
+            keys, self._pending = self._pending, []
+            futures = {key: self._futures[key] for key in keys}
+        if not keys:
+            return
+        chunks = chunk_ids(keys, self.max_filter_length, self.max_batch_size, self.odata_filter)
+        if len(chunks) == 1 or self.max_workers <= 1:
+            for chunk in chunks:
+                self._fetch(chunk, futures)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+            list(executor.map(lambda chunk: self._fetch(chunk, futures), chunks))
+
+    def _fetch(self, chunk, futures):
+        odata_params = {
+            "$filter": and_filters(self.odata_filter, f"{KEY_FIELD} in ({','.join(str(key) for key in chunk)})"),
+            "$top": len(chunk),
+        }
+        with self._lock:
+            self.round_trips += 1
+        try:
+            response = self.api.call_by_python_method(
+                self.python_method,
+                odata_params=odata_params,
+                fields=self.fields,
+                **self.method_kwargs,
+            )
+        except Exception as exc:
+            for key in chunk:
+                _settle(futures[key], error=exc)
+            return
+
+        rows = response.get("value", []) if isinstance(response, dict) else list(response or [])
+        rows_by_key = {str(row.get(KEY_FIELD)): row for row in rows if isinstance(row, dict)}
+        for key in chunk:
+            row = rows_by_key.get(str(key))
+            if row is None:
+                _settle(futures[key], error=LookupError(f"{self.python_method} returned no row with {KEY_FIELD} {key}"))
+            else:
+                _settle(futures[key], row)
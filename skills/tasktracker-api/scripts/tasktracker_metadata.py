@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from xml.etree import ElementTree
+
+import metrics
+from tasktracker_odata import ODataField, ODataModel, entity_set_for_method
+
+
+METADATA_TTL_SECONDS = 24 * 60 * 60
+CACHE_NAME = "odata_metadata"
+
+_schemas = {}
+
+
+def default_cache_dir():
+    return Path(os.getenv("ERP_CACHE_DIR") or "~/.cache/erp").expanduser()
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _children(element, name):
+    return [child for child in element if _local_name(child.tag) == name]
+
+
+def _header(response, name):
+    return next((value for key, value in response.headers.items() if key.lower() == name.lower()), None)
+
+
+def _structured_type(element):
+    key = [
+        reference.get("Name")
+        for key_element in _children(element, "Key")
+        for reference in _children(key_element, "PropertyRef")
+    ]
+    properties = {
+        prop.get("Name"): {"type": prop.get("Type"), "nullable": prop.get("Nullable", "true") != "false"}
+        for prop in _children(element, "Property")
+    }
+    navigation = {
+        prop.get("Name"): prop.get("Type")
+        for prop in _children(element, "NavigationProperty")
+    }
+    base_type = element.get("BaseType")
+    return {
+        "key": key,
+        "properties": properties,
+        "navigationProperties": navigation,
+        "baseType": base_type,
+    }
+
+
+def _merge_base_types(types):
+    resolved = {}
+
+    def resolve(name, seen=()):
+        if name in resolved:
+            return resolved[name]
+        definition = dict(types[name])
+        base_type = definition.pop("baseType", None)
+        if base_type in types and base_type not in seen:
+            base = resolve(base_type, seen + (name,))
+            definition["key"] = definition["key"] or base["key"]
+            definition["properties"] = {**base["properties"], **definition["properties"]}
+            definition["navigationProperties"] = {
+                **base["navigationProperties"],
+                **definition["navigationProperties"],
+            }
+        resolved[name] = definition
+        return definition
+
+    return {name: resolve(name) for name in types}
+
+
+def parse_csdl(document):
+    root = ElementTree.fromstring(document)
+    entity_types = {}
+    complex_types = {}
+    enum_types = {}
+    entity_sets = {}
+    for schema in root.iter():
+        if _local_name(schema.tag) != "Schema":
+            continue
+        namespace = schema.get("Namespace", "")
+        for element in schema:
+            kind = _local_name(element.tag)
+            full_name = f"{namespace}.{element.get('Name')}"
+            if kind == "EntityType":
+                entity_types[full_name] = _structured_type(element)
+            elif kind == "ComplexType":
+                complex_types[full_name] = _structured_type(element)
+            elif kind == "EnumType":
+                members = {}
+                for position, member in enumerate(_children(element, "Member")):
+                    value = member.get("Value")
+                    members[member.get("Name")] = int(value) if value is not None else position
+                enum_types[full_name] = members
+            elif kind == "EntityContainer":
+                for entity_set in _children(element, "EntitySet"):
+                    entity_sets[entity_set.get("Name")] = entity_set.get("EntityType")
+    return {
+        "entitySets": entity_sets,
+        "entityTypes": _merge_base_types(entity_types),
+        "complexTypes": _merge_base_types(complex_types),
+        "enumTypes": enum_types,
+    }
+
+
+class MetadataCache:
+    def __init__(self, directory=None, ttl=METADATA_TTL_SECONDS):
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.ttl = ttl
+
+    def path_for(self, base_url):
+        digest = hashlib.sha256(base_url.rstrip("/").encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"tasktracker-metadata-{digest}.json"
+
+    def read(self, base_url):
+        try:
+            entry = json.loads(self.path_for(base_url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if entry.get("baseUrl") != base_url or "schema" not in entry:
+            return None
+        return entry
+
+    def write(self, base_url, entry):
+        path = self.path_for(base_url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporary_path, path)
+
+    def is_fresh(self, entry, now):
+        return now - entry.get("fetchedAt", 0) < self.ttl
+
+
+def load_schema(api, cache=None, refresh=False):
+    base_url = api.base_url
+    if not refresh and base_url in _schemas:
+        metrics.record_cache(CACHE_NAME, True)
+        return _schemas[base_url]
+
+    cache = cache or MetadataCache()
+    now = time.time()
+    entry = cache.read(base_url)
+    if entry is not None and not refresh and cache.is_fresh(entry, now):
+        metrics.record_cache(CACHE_NAME, True)
+        _schemas[base_url] = entry["schema"]
+        return entry["schema"]
+
+    response = api.get_odata_metadata_document(etag=entry.get("etag") if entry and not refresh else None)
+    if response.status_code == 304 and entry is not None:
+        metrics.record_cache(CACHE_NAME, True)
+        entry["fetchedAt"] = now
+    else:
+        etag = _header(response, "ETag")
+        version = etag or hashlib.sha256(response.content).hexdigest()
+        unchanged = entry is not None and entry.get("version") == version
+        metrics.record_cache(CACHE_NAME, unchanged)
+        entry = {
+            "baseUrl": base_url,
+            "etag": etag,
+            "version": version,
+            "fetchedAt": now,
+            "schema": entry["schema"] if unchanged else parse_csdl(response.content),
+        }
+    cache.write(base_url, entry)
+    _schemas[base_url] = entry["schema"]
+    return entry["schema"]
+
+
+def _type_name(type_name):
+    if type_name.startswith("Collection(") and type_name.endswith(")"):
+        return type_name[len("Collection("):-1], True
+    return type_name, False
+
+
+def build_model(schema, type_name, _models=None):
+    models = {} if _models is None else _models
+    if type_name in models:
+        return models[type_name]
+    definition = schema["entityTypes"].get(type_name) or schema["complexTypes"].get(type_name)
+    if definition is None:
+        return None
+
+    fields = []
+    for name, prop in definition["properties"].items():
+        element_type, is_collection = _type_name(prop["type"])
+        is_structured = element_type in schema["complexTypes"]
+        fields.append(
+            ODataField(
+                name,
+                prop["type"],
+                model_reference=element_type if is_structured else None,
+                is_collection=is_collection,
+                is_navigation=False,
+            )
+        )
+    for name, nav_type in definition["navigationProperties"].items():
+        element_type, is_collection = _type_name(nav_type)
+        fields.append(
+            ODataField(name, nav_type, model_reference=element_type, is_collection=is_collection, is_navigation=True)
+        )
+    model = ODataModel(type_name, fields, resolve_reference=lambda reference: build_model(schema, reference, models))
+    models[type_name] = model
+    return model
+
+
+def model_for_method(schema, python_method):
+    entity_set = entity_set_for_method(python_method)
+    type_name = schema["entitySets"].get(entity_set) if entity_set else None
+    return build_model(schema, type_name) if type_name else None
+
+
+def enum_values(schema, enum_name):
+    for full_name, members in schema["enumTypes"].items():
+        if full_name == enum_name or full_name.rsplit(".", 1)[-1] == enum_name:
+            return members
+    return None
@@ -0,0 +1,791 @@
+import json
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+
+SKILL_ROOT = Path(__file__).resolve().parent.parent
+INDEX_DIR = SKILL_ROOT / "assets" / "index"
+MANIFEST_PATH = INDEX_DIR / "manifest.json"
+
+HIDDEN_FILTER = "Hidden eq false"
+EXPRESSION_PARAMS = ("$filter", "$orderby", "$select", "$expand")
+
+_COMPARISON_OPERATORS = {"eq", "ne", "gt", "ge", "lt", "le", "has", "in"}
+_ADDITIVE_OPERATORS = {"add", "sub"}
+_MULTIPLICATIVE_OPERATORS = {"mul", "div", "divby", "mod"}
+_PRECEDENCE = {"or": 1, "and": 2, **dict.fromkeys(_COMPARISON_OPERATORS, 3)}
+_PRECEDENCE.update(dict.fromkeys(_ADDITIVE_OPERATORS, 4))
+_PRECEDENCE.update(dict.fromkeys(_MULTIPLICATIVE_OPERATORS, 5))
+_UNARY_PRECEDENCE = 6
+_LAMBDA_OPERATORS = {"any", "all"}
+_KEYWORD_LITERALS = {"true": True, "false": False, "null": None}
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<ws>\s+)
+    | (?P<string>'(?:[^']|'')*')
+    | (?P<datetime>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:\d{2})?)
+    | (?P<guid>[0-9A-Fa-f]{8}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{12})
+    | (?P<date>\d{4}-\d{2}-\d{2})
+    | (?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?[mMdDfFlL]?)
+    | (?P<name>[$@]?[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)
+    | (?P<punct>[()/,:;=*-])
+    """,
+    re.VERBOSE,
+)
+
+
+class ODataSyntaxError(ValueError):
+    def __init__(self, message, text, position):
+        super().__init__(f"Invalid OData expression: {message} at position {position} in {text!r}")
+        self.text = text
+        self.position = position
+
+
+class ODataFieldError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Literal:
+    raw: str
+    value: object
+
+
+@dataclass(frozen=True)
+class Member:
+    path: tuple
+
+
+@dataclass(frozen=True)
+class Lambda:
+    collection: Member
+    operator: str
+    variable: str | None = None
+    predicate: object = None
+
+
+@dataclass(frozen=True)
+class Call:
+    name: str
+    args: tuple
+
+
+@dataclass(frozen=True)
+class ListExpr:
+    items: tuple
+
+
+@dataclass(frozen=True)
+class Group:
+    expression: object
+
+
+@dataclass(frozen=True)
+class UnaryOp:
+    operator: str
+    operand: object
+
+
+@dataclass(frozen=True)
+class BinaryOp:
+    operator: str
+    left: object
+    right: object
+
+
+@dataclass(frozen=True)
+class OrderByItem:
+    expression: object
+    direction: str | None = None
+
+
+@dataclass(frozen=True)
+class ExpandItem:
+    path: tuple
+    options: tuple = ()
+
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if match is None:
+            raise ODataSyntaxError(f"Unexpected character {text[position]!r}", text, position)
+        kind = match.lastgroup
+        if kind != "ws":
+            tokens.append((kind, match.group(), position))
+        position = match.end()
+    return tokens
+
+
+def _literal_value(kind, raw):
+    if kind == "string":
+        return raw[1:-1].replace("''", "'")
+    if kind == "number":
+        digits = raw.rstrip("mMdDfFlL")
+        if re.fullmatch(r"\d+", digits):
+            return int(digits)
+        return float(digits)
+    return raw
+
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.index = 0
+
+    def _peek(self, offset=0):
+        position = self.index + offset
+        if position < len(self.tokens):
+            return self.tokens[position]
+        return ("end", "", len(self.text))
+
+    def _next(self):
+        token = self._peek()
+        self.index += 1
+        return token
+
+    def _error(self, message, token=None):
+        token = token or self._peek()
+        return ODataSyntaxError(message, self.text, token[2])
+
+    def _accept(self, value):
+        kind, token_value, _ = self._peek()
+        if kind in ("punct", "name") and token_value == value:
+            self.index += 1
+            return True
+        return False
+
+    def _expect(self, value):
+        if not self._accept(value):
+            found = self._peek()[1] or "end of expression"
+            raise self._error(f"Expected {value!r}, found {found!r}")
+
+    def _peek_keyword(self, keywords):
+        kind, value, _ = self._peek()
+        if kind == "name" and value in keywords:
+            return value
+        return None
+
+    def at_end(self):
+        return self.index >= len(self.tokens)
+
+    def expect_end(self):
+        if not self.at_end():
+            raise self._error(f"Unexpected {self._peek()[1]!r}")
+
+    def parse_expression(self):
+        return self._parse_binary(1)
+
+    def _parse_binary(self, level):
+        if level > 5:
+            return self._parse_unary()
+        left = self._parse_binary(level + 1)
+        while True:
+            operator = self._peek_keyword([name for name, rank in _PRECEDENCE.items() if rank == level])
+            if operator is None:
+                return left
+            self._next()
+            right = self._parse_binary(level + 1)
+            left = BinaryOp(operator, left, right)
+
+    def _parse_unary(self):
+        if self._peek_keyword({"not"}):
+            self._next()
+            return UnaryOp("not", self._parse_unary())
+        if self._accept("-"):
+            return UnaryOp("-", self._parse_unary())
+        return self._parse_primary()
+
+    def _parse_primary(self):
+        token = self._peek()
+        kind, value, position = token
+        if kind in ("string", "number", "date", "datetime", "guid"):
+            self._next()
+            return Literal(value, _literal_value(kind, value))
+        if kind == "punct" and value == "(":
+            self._next()
+            first = self.parse_expression()
+            if self._accept(","):
+                items = [first]
+                while True:
+                    items.append(self.parse_expression())
+                    if not self._accept(","):
+                        break
+                self._expect(")")
+                return ListExpr(tuple(items))
+            self._expect(")")
+            return Group(first)
+        if kind == "name":
+            self._next()
+            if value in _KEYWORD_LITERALS:
+                return Literal(value, _KEYWORD_LITERALS[value])
+            following = self._peek()
+            if following[0] == "string" and following[2] == position + len(value):
+                self._next()
+                return Literal(value + following[1], _literal_value("string", following[1]))
+            if following[0] == "punct" and following[1] == "(":
+                return self._parse_call(value)
+            return self._parse_path(value)
+        raise self._error(f"Unexpected {value or 'end of expression'!r}", token)
+
+    def _parse_call(self, name):
+        self._expect("(")
+        args = []
+        if not self._accept(")"):
+            while True:
+                args.append(self.parse_expression())
+                if self._accept(")"):
+                    break
+                self._expect(",")
+        return Call(name, tuple(args))
+
+    def _parse_path(self, first_segment):
+        segments = [first_segment]
+        while self._accept("/"):
+            kind, value, _ = self._next()
+            if kind != "name":
+                raise self._error(f"Expected a property name after '/', found {value!r}")
+            following = self._peek()
+            if value in _LAMBDA_OPERATORS and following[0] == "punct" and following[1] == "(":
+                return self._parse_lambda(Member(tuple(segments)), value)
+            segments.append(value)
+        return Member(tuple(segments))
+
+    def _parse_lambda(self, collection, operator):
+        self._expect("(")
+        if self._accept(")"):
+            return Lambda(collection, operator)
+        kind, variable, _ = self._next()
+        if kind != "name":
+            raise self._error(f"Expected a lambda variable, found {variable!r}")
+        self._expect(":")
+        predicate = self.parse_expression()
+        self._expect(")")
+        return Lambda(collection, operator, variable, predicate)
+
+    def parse_path_only(self):
+        kind, value, _ = self._next()
+        if kind == "punct" and value == "*":
+            return ("*",)
+        if kind != "name":
+            raise self._error(f"Expected a property name, found {value!r}")
+        segments = [value]
+        while self._accept("/"):
+            kind, value, _ = self._next()
+            if kind not in ("name", "punct") or (kind == "punct" and value != "*"):
+                raise self._error(f"Expected a property name after '/', found {value!r}")
+            segments.append(value)
+        return tuple(segments)
+
+
+def _split_top_level(text, separator):
+    parts = []
+    depth = 0
+    in_string = False
+    start = 0
+    for position, character in enumerate(text):
+        if character == "'":
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif character == "(":
+            depth += 1
+        elif character == ")":
+            depth -= 1
+        elif character == separator and depth == 0:
+            parts.append(text[start:position])
+            start = position + 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts]
+
+
+@lru_cache(maxsize=512)
+def parse_filter(text):
+    parser = _Parser(text)
+    if parser.at_end():
+        raise ODataSyntaxError("Empty expression", text, 0)
+    expression = parser.parse_expression()
+    parser.expect_end()
+    return expression
+
+
+@lru_cache(maxsize=256)
+def parse_orderby(text):
+    items = []
+    for part in _split_top_level(text, ","):
+        parser = _Parser(part)
+        expression = parser.parse_expression()
+        direction = parser._peek_keyword({"asc", "desc"})
+        if direction:
+            parser._next()
+        parser.expect_end()
+        items.append(OrderByItem(expression, direction))
+    return tuple(items)
+
+
+@lru_cache(maxsize=256)
+def parse_select(text):
+    items = []
+    for part in _split_top_level(text, ","):
+        parser = _Parser(part)
+        items.append(parser.parse_path_only())
+        parser.expect_end()
+    return tuple(items)
+
+
+@lru_cache(maxsize=256)
+def parse_expand(text):
+    items = []
+    for part in _split_top_level(text, ","):
+        options = ()
+        path_text = part
+        if part.endswith(")") and "(" in part:
+            path_text, options_text = part.split("(", 1)
+            options = tuple(
+                tuple(option.split("=", 1))
+                for option in _split_top_level(options_text[:-1], ";")
+                if option
+            )
+            for option in options:
+                if len(option) != 2:
+                    raise ODataSyntaxError("Expand options must be key=value", text, text.find(part))
+        parser = _Parser(path_text)
+        path = parser.parse_path_only()
+        parser.expect_end()
+        items.append(ExpandItem(path, tuple((key.strip(), value.strip()) for key, value in options)))
+    return tuple(items)
+
+
+def _wrap(node, parent_rank, right_side=False):
+    rendered = to_odata(node)
+    if isinstance(node, BinaryOp):
+        rank = _PRECEDENCE[node.operator]
+        if rank < parent_rank or (right_side and rank == parent_rank):
+            return f"({rendered})"
+    return rendered
+
+
+def to_odata(node):
+    if isinstance(node, Literal):
+        return node.raw
+    if isinstance(node, Member):
+        return "/".join(node.path)
+    if isinstance(node, Lambda):
+        collection = to_odata(node.collection)
+        if node.variable is None:
+            return f"{collection}/{node.operator}()"
+        return f"{collection}/{node.operator}({node.variable}:{to_odata(node.predicate)})"
+    if isinstance(node, Call):
+        return f"{node.name}({','.join(to_odata(argument) for argument in node.args)})"
+    if isinstance(node, ListExpr):
+        return f"({','.join(to_odata(item) for item in node.items)})"
+    if isinstance(node, Group):
+        return f"({to_odata(node.expression)})"
+    if isinstance(node, UnaryOp):
+        operand = _wrap(node.operand, _UNARY_PRECEDENCE)
+        return f"not {operand}" if node.operator == "not" else f"-{operand}"
+    if isinstance(node, BinaryOp):
+        rank = _PRECEDENCE[node.operator]
+        return f"{_wrap(node.left, rank)} {node.operator} {_wrap(node.right, rank, right_side=True)}"
+    raise TypeError(f"Not an OData expression node: {node!r}")
+
+
+def format_orderby(items):
+    return ",".join(
+        f"{to_odata(item.expression)} {item.direction}" if item.direction else to_odata(item.expression)
+        for item in items
+    )
+
+
+def format_select(items):
+    return ",".join("/".join(path) for path in items)
+
+
+def format_expand(items):
+    rendered = []
+    for item in items:
+        path = "/".join(item.path)
+        if item.options:
+            path += "(" + ";".join(f"{key}={value}" for key, value in item.options) + ")"
+        rendered.append(path)
+    return ",".join(rendered)
+
+
+def conjuncts(expression):
+    while isinstance(expression, Group):
+        expression = expression.expression
+    if isinstance(expression, BinaryOp) and expression.operator == "and":
+        return conjuncts(expression.left) + conjuncts(expression.right)
+    return [expression]
+
+
+def and_filters(*filters):
+    expressions = [parse_filter(text) for text in filters if text is not None and text.strip()]
+    if not expressions:
+        return None
+    if len(expressions) == 1:
+        return to_odata(expressions[0])
+    combined = Group(expressions[0])
+    for expression in expressions[1:]:
+        if isinstance(expression, BinaryOp) and expression.operator in ("and", "or"):
+            expression = Group(expression)
+        combined = BinaryOp("and", combined, expression)
+    return to_odata(combined)
+
+
+def inject_hidden_filter(filter_text):
+    if filter_text is None or not filter_text.strip():
+        return HIDDEN_FILTER
+    expression = parse_filter(filter_text.strip())
+    hidden_expression = parse_filter(HIDDEN_FILTER)
+    if hidden_expression in conjuncts(expression):
+        return filter_text.strip()
+    return to_odata(BinaryOp("and", Group(expression), hidden_expression))
+
+
+def to_pascal_case(name):
+    if name.lower() == "id":
+        return "ID"
+    return name[:1].upper() + name[1:]
+
+
+class ODataField:
+    __slots__ = ("name", "type", "model_reference", "is_collection", "is_navigation")
+
+    def __init__(self, name, type_spec, model_reference=None, is_collection=None, is_navigation=None):
+        self.name = name
+        self.type = type_spec
+        if is_collection is None:
+            is_collection = type_spec.startswith("array")
+        if model_reference is None:
+            reference = type_spec[len("array["):-1] if type_spec.startswith("array[") else type_spec
+            model_reference = reference if reference.startswith("assets/index/") else None
+        if is_navigation is None:
+            is_navigation = is_collection or model_reference is not None or type_spec in ("object", "null | object")
+        self.model_reference = model_reference
+        self.is_collection = is_collection
+        self.is_navigation = is_navigation
+
+
+class ODataModel:
+    def __init__(self, schema, fields, resolve_reference=None):
+        self.schema = schema
+        self.fields = {field.name: field for field in fields}
+        self._lowercase = {name.lower(): name for name in self.fields}
+        self._resolve_reference = resolve_reference or load_model
+
+    def lookup(self, name):
+        field = self.fields.get(name)
+        if field is not None:
+            return field
+        corrected = self._lowercase.get(name.lower())
+        return self.fields[corrected] if corrected else None
+
+    def nested(self, field):
+        if field.model_reference is None:
+            return None
+        return self._resolve_reference(field.model_reference)
+
+
+@lru_cache(maxsize=None)
+def load_model(reference):
+    index_path = SKILL_ROOT / reference.split("#", 1)[0]
+    try:
+        payload = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    model = payload.get("model") or {}
+    if not model.get("fields"):
+        return None
+    return ODataModel(
+        model.get("schema", reference),
+        [ODataField(to_pascal_case(name), type_spec) for name, type_spec in model["fields"].items()],
+    )
+
+
+def _find_method_entry(index_file, python_method):
+    try:
+        payload = json.loads((SKILL_ROOT / index_file).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    for entry in payload.get("methods", []):
+        if f"-m {python_method} " in f"{entry.get('cliShape', '')} ":
+            return entry
+    return None
+
+
+@lru_cache(maxsize=None)
+def _index_entry_for_method(python_method):
+    base_method = python_method[: -len("_count")] if python_method.endswith("_count") else python_method
+    guessed_file = f"assets/index/{base_method[len('odata_'):].replace('_', '')}.json"
+    entry = _find_method_entry(guessed_file, python_method)
+    if entry is not None:
+        return guessed_file, entry
+    manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    for item in manifest.get("indexes", []):
+        entry = _find_method_entry(item["file"], python_method)
+        if entry is not None:
+            return item["file"], entry
+    return None, None
+
+
+def model_for_method(python_method):
+    if not python_method.startswith("odata_"):
+        return None
+    index_file, _ = _index_entry_for_method(python_method)
+    return load_model(f"{index_file}#model") if index_file else None
+
+
+def entity_set_for_method(python_method):
+    if not python_method.startswith("odata_"):
+        return None
+    _, entry = _index_entry_for_method(python_method)
+    if entry is None:
+        return None
+    path = entry["key"].split(" ", 1)[1]
+    segments = path.split("/")
+    if len(segments) < 3 or segments[1] != "odata" or segments[2].startswith("$"):
+        return None
+    return segments[2]
+
+
+class _FieldResolver:
+    def __init__(self, python_method, param, validate=True):
+        self.python_method = python_method
+        self.param = param
+        self.validate = validate
+        self.corrections = []
+
+    def _unknown(self, name, model):
+        known = ", ".join(sorted(model.fields))
+        return ODataFieldError(
+            f"Unknown field {name!r} in {self.param} for {self.python_method}. Known fields: {known}."
+        )
+
+    def resolve_path(self, path, model, scopes=None):
+        scopes = scopes or {}
+        resolved = []
+        current = model
+        field = None
+        for position, segment in enumerate(path):
+            if position == 0 and segment in scopes:
+                resolved.append(segment)
+                current = scopes[segment]
+                continue
+            if position == 0 and segment == "$it":
+                resolved.append(segment)
+                continue
+            field = None
+            if current is None or segment in ("*", "$count", "$ref"):
+                resolved.append(segment)
+                current = None
+                continue
+            field = current.lookup(segment)
+            if field is None:
+                if self.validate:
+                    raise self._unknown(segment, current)
+                resolved.append(segment)
+                current = None
+                continue
+            if field.name != segment:
+                self.corrections.append((segment, field.name))
+            resolved.append(field.name)
+            current = current.nested(field)
+        return tuple(resolved), current, field
+
+    def resolve_expression(self, node, model, scopes=None):
+        scopes = scopes or {}
+        if isinstance(node, Member):
+            path = self.resolve_path(node.path, model, scopes)[0]
+            return Member(path)
+        if isinstance(node, Lambda):
+            path, element_model, _ = self.resolve_path(node.collection.path, model, scopes)
+            if node.variable is None:
+                return Lambda(Member(path), node.operator)
+            inner_scopes = {**scopes, node.variable: element_model}
+            predicate = self.resolve_expression(node.predicate, model, inner_scopes)
+            return Lambda(Member(path), node.operator, node.variable, predicate)
+        if isinstance(node, Call):
+            return Call(node.name, tuple(self.resolve_expression(arg, model, scopes) for arg in node.args))
+        if isinstance(node, ListExpr):
+            return ListExpr(tuple(self.resolve_expression(item, model, scopes) for item in node.items))
+        if isinstance(node, Group):
+            return Group(self.resolve_expression(node.expression, model, scopes))
+        if isinstance(node, UnaryOp):
+            return UnaryOp(node.operator, self.resolve_expression(node.operand, model, scopes))
+        if isinstance(node, BinaryOp):
+            return BinaryOp(
+                node.operator,
+                self.resolve_expression(node.left, model, scopes),
+                self.resolve_expression(node.right, model, scopes),
+            )
+        return node
+
+    def resolve_expand(self, items, model):
+        resolved_items = []
+        for item in items:
+            path, nested_model, field = self.resolve_path(item.path, model)
+            if self.validate and field is not None and not field.is_navigation:
+                raise ODataFieldError(
+                    f"{'/'.join(path)} in $expand for {self.python_method} is not a navigation property."
+                )
+            options = []
+            for key, value in item.options:
+                if key in EXPRESSION_PARAMS and nested_model is not None:
+                    value = _rewrite_param(key, value, nested_model, self)
+                options.append((key, value))
+            resolved_items.append(ExpandItem(path, tuple(options)))
+        return tuple(resolved_items)
+
+
+def _rewrite_param(param, value, model, resolver):
+    if param == "$filter":
+        return to_odata(resolver.resolve_expression(parse_filter(value), model))
+    if param == "$orderby":
+        return format_orderby(
+            OrderByItem(resolver.resolve_expression(item.expression, model), item.direction)
+            for item in parse_orderby(value)
+        )
+    if param == "$select":
+        return format_select(resolver.resolve_path(path, model)[0] for path in parse_select(value))
+    return format_expand(resolver.resolve_expand(parse_expand(value), model))
+
+
+def normalize_odata_args(python_method, odata_args, validate_fields=True, model=None):
+    normalized_args = dict(odata_args)
+    model = model or model_for_method(python_method)
+    corrections = []
+    for param in EXPRESSION_PARAMS:
+        value = normalized_args.get(param)
+        if not isinstance(value, str) or not value.strip():
+            continue
+        if model is None:
+            _rewrite_param(param, value.strip(), ODataModel(param, []), _FieldResolver(python_method, param, False))
+            continue
+        resolver = _FieldResolver(python_method, param, validate=validate_fields)
+        rewritten = _rewrite_param(param, value.strip(), model, resolver)
+        if resolver.corrections:
+            normalized_args[param] = rewritten
+            corrections.extend(resolver.corrections)
+    return normalized_args, list(dict.fromkeys(corrections))
+
+
+def parse_fields(fields):
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    paths = []
+    for field in fields:
+        path = tuple(segment.strip() for segment in str(field).split("/") if segment.strip())
+        if path:
+            paths.append(path)
+    if not paths:
+        raise ValueError("fields must name at least one field, for example ID,Title,State")
+    return tuple(paths)
+
+
+def _field_tree(paths):
+    tree = {}
+    for path in paths:
+        node = tree
+        for segment in path:
+            node = node.setdefault(segment, {})
+    return tree
+
+
+def _compile_tree(tree, model):
+    select = []
+    expand = []
+    for name, children in tree.items():
+        field = model.lookup(name) if model is not None else None
+        is_navigation = field.is_navigation if field is not None else bool(children)
+        if field is not None and not field.is_navigation and field.model_reference is None and children:
+            raise ODataFieldError(f"{name} is not a structured property and has no subfields.")
+        if not is_navigation:
+            if children:
+                select.extend(f"{name}/{path}" for path in _flatten_tree(children))
+            else:
+                select.append(name)
+            continue
+        select.append(name)
+        options = []
+        if children:
+            nested_select, nested_expand = _compile_tree(children, model.nested(field) if field else None)
+            options.append(("$select", ",".join(nested_select)))
+            if nested_expand:
+                options.append(("$expand", format_expand(nested_expand)))
+        expand.append(ExpandItem((name,), tuple(options)))
+    return select, expand
+
+
+def _flatten_tree(tree):
+    for name, children in tree.items():
+        if children:
+            yield from (f"{name}/{path}" for path in _flatten_tree(children))
+        else:
+            yield name
+
+
+def is_odata_collection_method(python_method):
+    return python_method.startswith("odata_") and not python_method.endswith("_count")
+
+
+def report_field_corrections(corrections):
+    for original, corrected in corrections:
+        print(
+            f"[tasktracker-api] Hint: field {original} was sent as {corrected}; OData field names are PascalCase.",
+            file=sys.stderr,
+        )
+
+
+def compile_fields(python_method, fields, validate_fields=True, model=None):
+    model = model or model_for_method(python_method)
+    resolver = _FieldResolver(python_method, "fields", validate=validate_fields)
+    paths = parse_fields(fields)
+    if model is not None:
+        paths = [resolver.resolve_path(path, model)[0] for path in paths]
+    select, expand = _compile_tree(_field_tree(paths), model)
+    odata_args = {"$select": ",".join(select)}
+    if expand:
+        odata_args["$expand"] = format_expand(expand)
+    return odata_args, list(dict.fromkeys(resolver.corrections))
+
+
+def compile_output_fields(python_method, fields, odata_args, validate_fields=True, model=None):
+    # OData collections get fields as $select/$expand; other endpoints keep them for client-side projection.
+    if not fields:
+        return odata_args, fields
+    if python_method.startswith("odata_") and not is_odata_collection_method(python_method):
+        raise ValueError(f"fields cannot be used with {python_method}; count methods return a number.")
+    if not is_odata_collection_method(python_method):
+        return odata_args, fields
+    if "$select" in odata_args or "$expand" in odata_args:
+        raise ValueError("Pass either fields or $select/$expand, not both.")
+    compiled, corrections = compile_fields(python_method, fields, validate_fields=validate_fields, model=model)
+    report_field_corrections(corrections)
+    return {**odata_args, **compiled}, None
+
+
+def _project(value, tree):
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    if not isinstance(value, dict) or not tree:
+        return value
+    lowered_tree = {name.lower(): children for name, children in tree.items()}
+    if "value" not in lowered_tree and isinstance(value.get("value"), list):
+        return {**value, "value": _project(value["value"], tree)}
+    return {
+        key: _project(item, lowered_tree[key.lower()])
+        for key, item in value.items()
+        if key.lower() in lowered_tree
+    }
+
+
+def project_fields(value, fields):
+    return _project(value, _field_tree(parse_fields(fields)))
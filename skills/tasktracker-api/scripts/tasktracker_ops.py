@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+import argparse
+import importlib
+import sys
+import threading
+
+from tasktracker_call import configure_stdout, install_cassette, install_metrics_textfile, install_trace_printer
+
+
+SUBCOMMANDS = {
+    "bulk-edit": (
+        "tasktracker_bulk_edit",
+        "Apply per-task field changes with as few BulkEdit calls as possible",
+    ),
+    "board-reorder": (
+        "tasktracker_board_reorder",
+        "Reorder board lists to a target order with the fewest position changes",
+    ),
+    "blocking-graph": (
+        "tasktracker_blocking_graph",
+        "Expand blocking tasks breadth-first into a dependency graph with cycles and critical path",
+    ),
+    "epic-tree": (
+        "tasktracker_epic_tree",
+        "Load a project's epics into a parent/child tree with task rollups per epic and subtree",
+    ),
+    "epic-metrics": (
+        "tasktracker_epic_metrics",
+        "Fetch GetMetrics for every open epic of several projects into one table",
+    ),
+    "count-matrix": (
+        "tasktracker_count_matrix",
+        "Count tasks, epics or milestones for every project x filter combination concurrently",
+    ),
+    "timesheet-import": (
+        "tasktracker_timesheet_import",
+        "Import daily time entries, merging consecutive working days into CreateForDateRange calls",
+    ),
+    "time-report": (
+        "tasktracker_time_report",
+        "Aggregate time spent per user, task or project and time bucket from streamed TaskTime pages",
+    ),
+    "sprint-charts": (
+        "tasktracker_sprint_charts",
+        "Compute burndown/burnup series for many sprints locally from task history",
+    ),
+    "watch": (
+        "tasktracker_change_feed",
+        "Poll task and epic history after a persisted cursor and print new changes",
+    ),
+    "snapshot": (
+        "tasktracker_snapshot",
+        "Export a project's entity sets into one archive of compressed NDJSON members with a manifest",
+    ),
+    "snapshot-diff": (
+        "tasktracker_snapshot_diff",
+        "Compare two snapshot archives and list added, removed and changed entities field by field",
+    ),
+    "search": (
+        "tasktracker_search",
+        "Search task and epic titles, descriptions and comments in a local full-text index",
+    ),
+    "task-stats": (
+        "tasktracker_task_table",
+        "Count tasks and sum weight per group locally from a columnar table with bitmap indexes",
+    ),
+    "registry-export": (
+        "tasktracker_registry_export",
+        "Export cross-project registry tasks joined with project, milestone, sprint, epic and label titles as NDJSON",
+    ),
+}
+
+
+class LazyAPI:
+    # Operations that never reach the server (for example --dry-run plans) skip the token request.
+    def __init__(self):
+        self._api = None
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        # Local-only operations key their files on the server URL, which resolves from config without a token.
+        with self._lock:
+            if self._api is not None:
+                return self._api.base_url
+        from tasktracker_api import TaskTrackerAPI
+
+        return TaskTrackerAPI._resolve_base_url()
+
+    def __getattr__(self, name):
+        with self._lock:
+            if self._api is None:
+                from tasktracker_api import TaskTrackerAPI
+
+                self._api = TaskTrackerAPI()
+        return getattr(self._api, name)
+
+
+def build_parser(argv):
+    parser = argparse.ArgumentParser(description="Run multi-request TaskTracker operations")
+    parser.add_argument("--workers", type=int, default=8, help="Maximum concurrent requests")
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Print per-request phase timings and byte counts to stderr as JSON lines",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        help="Write request metrics in Prometheus text format to this path on exit",
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        metavar="DIR",
+        help="Record HTTP exchanges into a cassette directory for later offline replay",
+    )
+    cassette_group.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="Serve HTTP exchanges from a recorded cassette directory without network access",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Only the selected operation module is imported; the others just contribute their help line.
+    selected = next((value for value in argv if value in SUBCOMMANDS), None)
+    for name, (module_name, help_text) in SUBCOMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text, description=help_text)
+        if name == selected:
+            module = importlib.import_module(module_name)
+            module.configure_parser(subparser)
+            subparser.set_defaults(run=module.run)
+    return parser
+
+
+def main(argv=None):
+    configure_stdout()
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser(argv).parse_args(argv)
+
+    if args.trace:
+        install_trace_printer()
+    if args.metrics_textfile:
+        install_metrics_textfile(args.metrics_textfile)
+    if args.record or args.replay:
+        install_cassette(record_dir=args.record, replay_dir=args.replay)
+
+    return args.run(LazyAPI(), args) or 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,222 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import metrics
+from tasktracker_metadata import default_cache_dir
+from tasktracker_odata import and_filters, inject_hidden_filter
+
+
+ODATA_PAGE_SIZE = 500
+RESULT_CACHE_TTL_SECONDS = 5 * 60
+
+
+def parse_cell(raw_value):
+    try:
+        return json.loads(raw_value)
+    except json.JSONDecodeError:
+        return raw_value
+
+
+def _open_text(path):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    return open(path, encoding="utf-8", newline="")
+
+
+def read_records(path):
+    with _open_text(path) as handle:
+        if str(path).lower().endswith(".csv"):
+            return [
+                {key: parse_cell(value) for key, value in row.items() if value not in (None, "")}
+                for row in csv.DictReader(handle)
+            ]
+        text = handle.read().strip()
+    if not text:
+        return []
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def write_ndjson(rows, stream=None):
+    stream = stream or sys.stdout
+    for row in rows:
+        stream.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")))
+        stream.write("\n")
+
+
+def write_csv(rows, stream=None):
+    rows = list(rows)
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    writer = csv.DictWriter(stream or sys.stdout, fieldnames=columns, lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(
+            {
+                key: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+                for key, value in row.items()
+            }
+        )
+
+
+def odata_rows(page):
+    if isinstance(page, dict):
+        return page.get("value") or []
+    return page or []
+
+
+def iter_odata_rows(
+    api,
+    python_method,
+    *,
+    odata_params=None,
+    fields=None,
+    page_size=ODATA_PAGE_SIZE,
+    include_hidden=False,
+    **method_kwargs,
+):
+    params = dict(odata_params or {})
+    if not include_hidden:
+        params["$filter"] = inject_hidden_filter(params.get("$filter"))
+    # A stable order keeps $skip paging consistent while other writers touch the collection.
+    params.setdefault("$orderby", "ID")
+    skip = 0
+    while True:
+        page = api.call_by_python_method(
+            python_method,
+            odata_params={**params, "$top": page_size, "$skip": skip},
+            fields=fields,
+            **method_kwargs,
+        )
+        rows = odata_rows(page)
+        yield from rows
+        has_next_link = isinstance(page, dict) and "@odata.nextLink" in page
+        if not rows or (len(rows) < page_size and not has_next_link):
+            return
+        skip += len(rows)
+
+
+def iter_odata_rows_by_key(
+    api,
+    python_method,
+    *,
+    odata_params=None,
+    fields=None,
+    page_size=ODATA_PAGE_SIZE,
+    include_hidden=False,
+    key_field="ID",
+    after=None,
+    **method_kwargs,
+):
+    # Pages continue after the last key read instead of at a $skip offset, so rows inserted, deleted or
+    # hidden while reading cannot shift later pages into repeats or gaps.
+    params = dict(odata_params or {})
+    base_filter = params.get("$filter")
+    if not include_hidden:
+        base_filter = inject_hidden_filter(base_filter)
+    params["$orderby"] = key_field
+    last = after
+    while True:
+        params["$filter"] = and_filters(base_filter, f"{key_field} gt {last}" if last is not None else None)
+        page = api.call_by_python_method(
+            python_method,
+            odata_params={**params, "$top": page_size},
+            fields=fields,
+            **method_kwargs,
+        )
+        page_rows = odata_rows(page)
+        rows = [row for row in page_rows if row.get(key_field) is not None and (last is None or row[key_field] > last)]
+        yield from rows
+        # A server capping $top returns short pages with a nextLink; only a short page without one is the end.
+        has_next_link = isinstance(page, dict) and "@odata.nextLink" in page
+        if not rows or (len(page_rows) < page_size and not has_next_link):
+            return
+        last = rows[-1][key_field]
+
+
+def run_concurrently(func, items, max_workers=8):
+    def call(item):
+        try:
+            return item, func(item), None
+        except Exception as exc:
+            return item, None, exc
+
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(call, items))
+
+
+def describe_error(exc):
+    return f"{type(exc).__name__}: {exc}"
+
+
+class RateLimiter:
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class ResultCache:
+    # Short-lived results of read-only calls, one JSON file per operation and server under ERP_CACHE_DIR.
+    def __init__(self, name, base_url, directory=None, ttl=RESULT_CACHE_TTL_SECONDS):
+        self.name = name
+        self.base_url = base_url
+        self.ttl = ttl
+        digest = hashlib.sha256(base_url.rstrip("/").encode("utf-8")).hexdigest()[:16]
+        self.path = (Path(directory) if directory else default_cache_dir()) / f"tasktracker-{name}-{digest}.json"
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            entry = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            entry = {}
+        now = time.time()
+        self._entries = {
+            key: item
+            for key, item in (entry.get("entries") or {}).items()
+            if entry.get("baseUrl") == base_url and now - item.get("fetchedAt", 0) < ttl
+        }
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+        hit = item is not None and time.time() - item["fetchedAt"] < self.ttl
+        metrics.record_cache(self.name, hit)
+        return (True, item["value"]) if hit else (False, None)
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = {"fetchedAt": time.time(), "value": value}
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({"baseUrl": self.base_url, "entries": self._entries}, ensure_ascii=False)
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        temporary_path.write_text(payload, encoding="utf-8")
+        os.replace(temporary_path, self.path)
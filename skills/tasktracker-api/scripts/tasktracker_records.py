@@ -0,0 +1,159 @@
+import keyword
+
+from tasktracker_odata import load_model, model_for_method
+from tasktracker_ops_utils import iter_odata_rows
+
+
+# Top-level free text is unique per entity, so interning it would only grow the pool; every other string
+# (names, titles of related entities, colors, roles) repeats across rows and is stored once.
+FREE_TEXT_FIELDS = frozenset({"Title", "Description", "Text", "ParentText", "Data", "Files"})
+SCALAR_TYPES = ("integer", "number", "boolean")
+_MISSING = object()
+_TYPES = {}
+
+
+class Record:
+    __slots__ = ()
+    _fields = ()
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def get(self, name, default=None):
+        return getattr(self, name, default) if name in self._fields else default
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._values() == other._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({values})"
+
+    def to_dict(self):
+        return {name: _plain(getattr(self, name)) for name in self._fields}
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _assigning_init(fields):
+    def __init__(self, *values):
+        for field, value in zip(fields, values):
+            setattr(self, field, value)
+        for field in fields[len(values):]:
+            setattr(self, field, None)
+
+    return __init__
+
+
+def record_type(name, fields):
+    fields = tuple(fields)
+    key = (name, fields)
+    if key not in _TYPES:
+        if any(keyword.iskeyword(field) for field in fields):
+            # Keys such as "from" or "class" are valid slots but cannot appear in generated source.
+            init = _assigning_init(fields)
+        else:
+            # A generated __init__ assigns the slots directly, as namedtuple does for its fields.
+            arguments = "".join(f", {field}=None" for field in fields)
+            body = "".join(f"\n    self.{field} = {field}" for field in fields) or "\n    pass"
+            namespace = {}
+            exec(f"def __init__(self{arguments}):{body}", namespace)
+            init = namespace["__init__"]
+        _TYPES[key] = type(name, (Record,), {"__slots__": fields, "_fields": fields, "__init__": init})
+    return _TYPES[key]
+
+
+def _type_name(schema):
+    stem = schema.split("#", 1)[0].rsplit("/", 1)[-1].split(".", 1)[0]
+    return f"{stem[:1].upper()}{stem[1:]}Record"
+
+
+def _camel(name):
+    return "id" if name == "ID" else name[:1].lower() + name[1:]
+
+
+class RecordDecoder:
+    # Nested entities (labels, assignees) are decoded once per distinct value and shared by every row.
+    def __init__(self, model, strings=None, shared=None, top_level=True):
+        self.model = model
+        self.top_level = top_level
+        self.type = record_type(_type_name(model.schema), list(model.fields))
+        self._strings = {} if strings is None else strings
+        self._shared = {} if shared is None else shared
+        self._plan = [(field.name, _camel(field.name), self._converter(field)) for field in model.fields.values()]
+
+    @classmethod
+    def for_method(cls, python_method):
+        model = model_for_method(python_method)
+        if model is None:
+            raise ValueError(f"No index model for {python_method}")
+        return cls(model)
+
+    def _converter(self, field):
+        if field.is_navigation:
+            model = load_model(field.model_reference) if field.model_reference else None
+            if model is None:
+                return self._generic
+            decoder = RecordDecoder(model, self._strings, self._shared, top_level=False)
+            if field.is_collection:
+                return lambda items: tuple(decoder.decode(item) for item in items)
+            return decoder.decode
+        if field.type.startswith(SCALAR_TYPES):
+            return None
+        if field.type.startswith("string:date-time"):
+            # Timestamps are close to unique, so pooling them would cost more than it saves.
+            return None
+        if field.type.startswith("string"):
+            return None if self.top_level and field.name in FREE_TEXT_FIELDS else self._generic
+        # Enums arrive as numbers; anything else unexpected goes through the generic path.
+        return self._generic
+
+    def _generic(self, value):
+        # Objects whose type is outside the shipped indexes keep the keys they arrive with; keys that are
+        # not identifiers (such as "@odata.type" annotations) are left out.
+        if isinstance(value, dict):
+            items = [(key, item) for key, item in value.items() if key.isidentifier()]
+            record = record_type("Record", [key for key, _ in items])(*(self._generic(item) for _, item in items))
+            return self._shared.setdefault(record, record)
+        if isinstance(value, list):
+            return tuple(self._generic(item) for item in value)
+        if isinstance(value, str):
+            return self._strings.setdefault(value, value)
+        return value
+
+    def decode(self, row):
+        get = row.get
+        values = []
+        for name, camel, convert in self._plan:
+            value = get(name, _MISSING)
+            if value is _MISSING:
+                # REST responses use camelCase names; fields left out by $select stay None.
+                value = get(camel)
+            if value is not None and convert is not None:
+                value = convert(value)
+            values.append(value)
+        record = self.type(*values)
+        return record if self.top_level else self._shared.setdefault(record, record)
+
+    def decode_many(self, rows):
+        return (self.decode(row) for row in rows)
+
+
+def iter_records(api, python_method, decoder=None, **kwargs):
+    decoder = decoder or RecordDecoder.for_method(python_method)
+    return decoder.decode_many(iter_odata_rows(api, python_method, **kwargs))
@@ -0,0 +1,182 @@
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from tasktracker_ops_utils import (
+    ODATA_PAGE_SIZE,
+    describe_error,
+    iter_odata_rows,
+    iter_odata_rows_by_key,
+    odata_rows,
+    write_ndjson,
+)
+from tasktracker_odata import and_filters, inject_hidden_filter
+
+
+TASK_METHOD = "odata_task_in_registry"
+# Tasks carry only the IDs of their project, milestone, sprint, epic and labels; titles and colors come from
+# the much smaller lookup sets.
+TASK_FIELDS = (
+    "ID,Title,ProjectId,State,DueDate,Weight,MilestoneId,SprintId,EpicId,AuthorId,AuthorFullName,CreatedAt,"
+    "CurrentAssigneeId,CurrentAssigneeFullName,Assignees/ID,Labels/ID"
+)
+LOOKUPS = {
+    "project": ("odata_project_for_task_registry", "ID,Title"),
+    "milestone": ("odata_milestone_for_task_registry", "ID,Title"),
+    "sprint": ("odata_sprint_for_task_registry", "ID,Title"),
+    "epic": ("odata_epic_for_task_registry", "ID,Title"),
+    "label": ("odata_label_for_task_registry", "ID,Title,BackgroundColor"),
+}
+
+
+def load_lookup(api, name):
+    python_method, fields = LOOKUPS[name]
+    # Hidden entries are kept: tasks may still point at an archived sprint or label.
+    return {row["ID"]: row for row in iter_odata_rows(api, python_method, fields=fields, include_hidden=True)}
+
+
+def task_pages(api, executor, odata_filter=None, page_size=ODATA_PAGE_SIZE, max_workers=8, **method_kwargs):
+    # The ID span up to the newest task is split into ranges of about one page each, and every range is
+    # paged by key, so ranges load concurrently and rows removed mid-export cannot shift others out of it.
+    # The last range is open-ended and also picks up tasks created during the export. The first ranges are
+    # submitted before returning, so they load while the caller still waits on other work.
+    base_params = {"$filter": odata_filter} if odata_filter else {}
+    count = int(api.call_by_python_method(f"{TASK_METHOD}_count", odata_params=base_params or None, **method_kwargs))
+    newest = odata_rows(
+        api.call_by_python_method(
+            TASK_METHOD,
+            odata_params={**base_params, "$select": "ID", "$orderby": "ID desc", "$top": 1},
+            **method_kwargs,
+        )
+    )
+    max_id = newest[0]["ID"] if newest else 0
+    ranges = max(1, -(-count // page_size))
+    bounds = [max_id * index // ranges for index in range(ranges)] + [None]
+
+    def fetch(span):
+        low, high = span
+        params = {"$filter": and_filters(odata_filter, f"ID le {high}" if high is not None else None)}
+        return list(
+            iter_odata_rows_by_key(
+                api,
+                TASK_METHOD,
+                odata_params=params,
+                fields=TASK_FIELDS,
+                page_size=page_size,
+                include_hidden=True,
+                after=low,
+                **method_kwargs,
+            )
+        )
+
+    spans = iter(zip(bounds, bounds[1:]))
+    pending = [executor.submit(fetch, span) for _, span in zip(range(max(max_workers, 1)), spans)]
+    return _pages_in_order(executor, fetch, spans, pending)
+
+
+def _pages_in_order(executor, fetch, spans, pending):
+    while pending:
+        yield pending.pop(0).result()
+        span = next(spans, None)
+        if span is not None:
+            pending.append(executor.submit(fetch, span))
+
+
+def _title(lookup, key):
+    row = lookup.get(key) if key is not None else None
+    return row.get("Title") if row else None
+
+
+def denormalize(task, lookups, explode_labels=False):
+    labels = [lookups["label"].get(item.get("ID"), item) for item in task.get("Labels") or ()]
+    row = {
+        "taskId": task.get("ID"),
+        "title": task.get("Title"),
+        "state": task.get("State"),
+        "dueDate": task.get("DueDate"),
+        "weight": task.get("Weight"),
+        "createdAt": task.get("CreatedAt"),
+        "projectId": task.get("ProjectId"),
+        "projectTitle": _title(lookups["project"], task.get("ProjectId")),
+        "milestoneId": task.get("MilestoneId"),
+        "milestoneTitle": _title(lookups["milestone"], task.get("MilestoneId")),
+        "sprintId": task.get("SprintId"),
+        "sprintTitle": _title(lookups["sprint"], task.get("SprintId")),
+        "epicId": task.get("EpicId"),
+        "epicTitle": _title(lookups["epic"], task.get("EpicId")),
+        "authorId": task.get("AuthorId"),
+        "authorFullName": task.get("AuthorFullName"),
+        "currentAssigneeId": task.get("CurrentAssigneeId"),
+        "currentAssigneeFullName": task.get("CurrentAssigneeFullName"),
+        "assigneeIds": [item.get("ID") for item in task.get("Assignees") or ()],
+    }
+    if not explode_labels:
+        row["labelIds"] = [label.get("ID") for label in labels]
+        row["labelTitles"] = [label.get("Title") for label in labels]
+        return [row]
+    # One row per task and label keeps every column scalar; unlabelled tasks keep a single row.
+    return [
+        {**row, "labelId": label.get("ID"), "labelTitle": label.get("Title"), "labelColor": label.get("BackgroundColor")}
+        for label in labels or [{}]
+    ]
+
+
+def export_registry(
+    api,
+    odata_filter=None,
+    max_workers=8,
+    include_hidden=False,
+    explode_labels=False,
+    stats=None,
+    page_size=ODATA_PAGE_SIZE,
+    **method_kwargs,
+):
+    if not include_hidden:
+        odata_filter = inject_hidden_filter(odata_filter)
+    stats = {} if stats is None else stats
+    stats.update({"tasks": 0, "rows": 0})
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1) + len(LOOKUPS)) as executor:
+        lookup_futures = {name: executor.submit(load_lookup, api, name) for name in LOOKUPS}
+        pages = task_pages(api, executor, odata_filter, page_size, max_workers, **method_kwargs)
+        lookups = {}
+        for name, future in lookup_futures.items():
+            try:
+                lookups[name] = future.result()
+            except Exception as exc:
+                raise RuntimeError(f"{LOOKUPS[name][0]}: {describe_error(exc)}") from exc
+        stats.update({f"{name}s": len(lookup) for name, lookup in lookups.items()})
+        for rows in pages:
+            for task in rows:
+                stats["tasks"] += 1
+                for row in denormalize(task, lookups, explode_labels):
+                    stats["rows"] += 1
+                    yield row
+
+
+def configure_parser(parser):
+    parser.add_argument("--filter", dest="odata_filter", help="OData $filter for registry tasks, for example 'State eq 10'")
+    parser.add_argument("--kind", help="Registry kind passed through to TaskInRegistry")
+    parser.add_argument("--search", help="Registry search text passed through to TaskInRegistry")
+    parser.add_argument("--include-hidden", action="store_true", help="Include hidden tasks")
+    parser.add_argument(
+        "--explode-labels",
+        action="store_true",
+        help="Write one row per task and label with scalar label columns instead of label lists",
+    )
+
+
+def run(api, args):
+    method_kwargs = {name: value for name, value in (("kind", args.kind), ("search", args.search)) if value is not None}
+    stats = {}
+    rows = export_registry(
+        api,
+        odata_filter=and_filters(args.odata_filter),
+        max_workers=args.workers,
+        include_hidden=args.include_hidden,
+        explode_labels=args.explode_labels,
+        stats=stats,
+        **method_kwargs,
+    )
+    write_ndjson(rows)
+    print(json.dumps(stats), file=sys.stderr)
+    return 0
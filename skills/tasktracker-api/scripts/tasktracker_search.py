@@ -0,0 +1,415 @@
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from tasktracker_loader import chunk_ids
+from tasktracker_metadata import default_cache_dir
+from tasktracker_odata import and_filters
+from tasktracker_ops_utils import iter_odata_rows, run_concurrently, write_ndjson
+
+
+# Document rowids are "entity ID * 4 + kind code", so every entity has a stable rowid without a lookup table.
+KINDS = {"task": 0, "epic": 1, "task_comment": 2, "epic_comment": 3}
+KIND_SLOTS = 4
+PARENT_SETS = {
+    "task": ("odata_task", "ID,Hidden,Title,CreatedAt,UpdatedAt"),
+    "epic": ("odata_epic", "ID,Hidden,Title,Description,CreatedAt,UpdatedAt"),
+}
+COMMENT_SETS = {
+    "task_comment": ("odata_task_comment", "task", "TaskId"),
+    "epic_comment": ("odata_epic_comment", "epic", "EpicId"),
+}
+PARENT_CHANGE_FIELDS = ("CreatedAt", "UpdatedAt")
+COMMENT_CHANGE_FIELDS = ("CreatedAt", "EditedAt")
+HISTORY_SELECT = "ID,TaskId,CommandName,Data"
+TITLE_WEIGHT = 5.0
+COMMON_TERM_SHARE = 0.01
+SNIPPET_TOKENS = 12
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS documents (
+    rowid INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    entity_id INTEGER NOT NULL,
+    parent_id INTEGER,
+    project_id INTEGER,
+    title TEXT,
+    body TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_project ON documents (project_id, kind);
+CREATE INDEX IF NOT EXISTS documents_parent ON documents (kind, parent_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body, content='documents', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts (rowid, title, body) VALUES (new.rowid, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, body) VALUES ('delete', old.rowid, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, body) VALUES ('delete', old.rowid, old.title, old.body);
+    INSERT INTO documents_fts (rowid, title, body) VALUES (new.rowid, new.title, new.body);
+END;
+"""
+
+
+def default_index_path(base_url):
+    digest = hashlib.sha256(base_url.rstrip("/").encode("utf-8")).hexdigest()[:16]
+    return default_cache_dir() / f"tasktracker-search-{digest}.sqlite3"
+
+
+def _rowid(kind, entity_id):
+    return entity_id * KIND_SLOTS + KINDS[kind]
+
+
+def _timestamp(value):
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _latest(row, fields, latest):
+    for field in fields:
+        if row.get(field):
+            stamp = _timestamp(row[field])
+            if latest is None or stamp > latest:
+                latest = stamp
+    return latest
+
+
+def query_terms(query):
+    return re.findall(r"\w+", query.lower())
+
+
+def _stem(term):
+    # A crude stem (the word without its last letters) lets "ошибка" also find "ошибки" and "ошибок".
+    if term.isdigit() or len(term) < 5:
+        return None
+    return term[:-2] if len(term) >= 6 else term[:-1]
+
+
+def match_expression(terms, operator="OR"):
+    # Words are ORed, so bm25 ranks documents sharing more (and rarer) words first; exact forms score higher.
+    parts = []
+    for term in dict.fromkeys(terms):
+        stem = _stem(term)
+        parts.append(f'("{term}" OR "{stem}"*)' if stem else f'"{term}"')
+    return f" {operator} ".join(parts)
+
+
+class SearchIndex:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    def commit(self):
+        self._db.commit()
+
+    def watermark(self, project_id, source):
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (f"{source}:{project_id}",)).fetchone()
+        return _timestamp(row[0]) if row else None
+
+    def set_watermark(self, project_id, source, stamp):
+        self._db.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (f"{source}:{project_id}", stamp.isoformat()),
+        )
+
+    def upsert(self, kind, entity_id, title=None, body=None, parent_id=None, project_id=None):
+        self._db.execute(
+            """
+            INSERT INTO documents (rowid, kind, entity_id, parent_id, project_id, title, body)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (rowid) DO UPDATE SET
+                parent_id = excluded.parent_id,
+                project_id = excluded.project_id,
+                title = excluded.title,
+                body = coalesce(excluded.body, documents.body)
+            """,
+            (_rowid(kind, entity_id), kind, entity_id, parent_id, project_id, title, body),
+        )
+
+    def set_body(self, kind, entity_id, body):
+        self._db.execute("UPDATE documents SET body = ? WHERE rowid = ?", (body, _rowid(kind, entity_id)))
+
+    def remove(self, kind, entity_id):
+        self._db.execute("DELETE FROM documents WHERE rowid = ?", (_rowid(kind, entity_id),))
+
+    def remove_children(self, kind, parent_id):
+        self._db.execute("DELETE FROM documents WHERE kind = ? AND parent_id = ?", (kind, parent_id))
+
+    def entity_ids(self, kind, project_id):
+        rows = self._db.execute("SELECT entity_id FROM documents WHERE project_id = ? AND kind = ?", (project_id, kind))
+        return {row[0] for row in rows}
+
+    def selective_terms(self, terms):
+        # bm25 scores every document that matches, and a word found in a large share of documents adds
+        # almost nothing to the ranking, so such words are dropped. The probe stops counting at the
+        # threshold, so it costs little even for the most common words.
+        terms = list(dict.fromkeys(terms))
+        if len(terms) < 2:
+            return terms
+        total = self._db.execute("SELECT count(*) FROM documents_fts_docsize").fetchone()[0]
+        threshold = max(1, int(total * COMMON_TERM_SHARE))
+        selective = [
+            term
+            for term in terms
+            if self._db.execute(
+                "SELECT count(*) FROM (SELECT 1 FROM documents_fts WHERE documents_fts MATCH ? LIMIT ?)",
+                (f'"{term}"', threshold),
+            ).fetchone()[0]
+            < threshold
+        ]
+        return selective
+
+    def search(self, query, limit=20, kinds=None, project_ids=None, by_task=False, raw=False):
+        if raw:
+            expression = query
+        else:
+            terms = query_terms(query)
+            selective = self.selective_terms(terms)
+            # When every word is common, documents must contain all of them instead of any.
+            expression = match_expression(selective) if selective else match_expression(terms, "AND")
+        if not expression:
+            return []
+        conditions = ["documents_fts MATCH ?"]
+        params = [expression]
+        if by_task:
+            kinds = ("task", "task_comment")
+        if kinds:
+            conditions.append(f"d.kind IN ({','.join('?' * len(kinds))})")
+            params.extend(kinds)
+        if project_ids:
+            conditions.append(f"d.project_id IN ({','.join('?' * len(project_ids))})")
+            params.extend(project_ids)
+        where = " AND ".join(conditions)
+        rank = f"bm25(documents_fts, {TITLE_WEIGHT}, 1.0)"
+        if by_task:
+            # A task scores for its own text and for every matching comment, so well-discussed matches rise.
+            # bm25 cannot run inside an aggregate; LIMIT -1 keeps SQLite from flattening the CTE into one
+            # (AS MATERIALIZED would too, but needs SQLite 3.35).
+            sql = f"""
+                WITH matches AS (
+                    SELECT CASE d.kind WHEN 'task' THEN d.entity_id ELSE d.parent_id END AS task_id, {rank} AS score
+                    FROM documents_fts JOIN documents d ON d.rowid = documents_fts.rowid
+                    WHERE {where}
+                    LIMIT -1
+                )
+                SELECT task_id, t.project_id, t.title, -sum(score) AS total, count(*) AS hits
+                FROM matches
+                LEFT JOIN documents t ON t.rowid = task_id * {KIND_SLOTS} + {KINDS['task']}
+                GROUP BY task_id ORDER BY total DESC LIMIT ?
+            """
+            rows = self._db.execute(sql, (*params, limit)).fetchall()
+            return [
+                {"taskId": task_id, "projectId": project_id, "title": title, "score": round(score, 4), "hits": hits}
+                for task_id, project_id, title, score, hits in rows
+            ]
+        sql = f"""
+            SELECT d.kind, d.entity_id, d.parent_id, d.project_id, coalesce(d.title, p.title),
+                   snippet(documents_fts, -1, '[', ']', '...', {SNIPPET_TOKENS}), -{rank} AS score
+            FROM documents_fts
+            JOIN documents d ON d.rowid = documents_fts.rowid
+            LEFT JOIN documents p ON p.rowid = d.parent_id * {KIND_SLOTS} + (
+                CASE d.kind WHEN 'task_comment' THEN {KINDS['task']} ELSE {KINDS['epic']} END
+            ) AND d.parent_id IS NOT NULL
+            WHERE {where}
+            ORDER BY {rank} LIMIT ?
+        """
+        rows = self._db.execute(sql, (*params, limit)).fetchall()
+        return [
+            {
+                "kind": kind,
+                "id": entity_id,
+                "parentId": parent_id,
+                "projectId": project_id,
+                "title": title,
+                "snippet": snippet,
+                "score": round(score, 4),
+            }
+            for kind, entity_id, parent_id, project_id, title, snippet, score in rows
+        ]
+
+
+def _changed_rows(api, python_method, select, since, change_fields, odata_filter=None, **method_kwargs):
+    params = {"$select": select}
+    if since is None:
+        if odata_filter:
+            params["$filter"] = odata_filter
+        return iter_odata_rows(api, python_method, odata_params=params, **method_kwargs)
+    # Incremental passes also read hidden rows so that deletions reach the index.
+    literal = since.strftime("%Y-%m-%dT%H:%M:%SZ")
+    params["$filter"] = and_filters(odata_filter, " or ".join(f"{field} ge {literal}" for field in change_fields))
+    return iter_odata_rows(api, python_method, odata_params=params, include_hidden=True, **method_kwargs)
+
+
+def _payload(raw):
+    if isinstance(raw, dict):
+        payload = raw
+    else:
+        try:
+            payload = json.loads(raw) if raw else {}
+        except ValueError:
+            payload = {}
+    return {str(key).lower(): value for key, value in payload.items()} if isinstance(payload, dict) else {}
+
+
+def load_descriptions(api, task_ids, max_workers=8):
+    # The task OData model carries no description; the latest Create/ChangeDescription history entry does.
+    def pull(chunk):
+        descriptions = {}
+        rows = iter_odata_rows(
+            api,
+            "odata_task_history",
+            odata_params={"$select": HISTORY_SELECT, "$filter": f"TaskId in ({','.join(str(task_id) for task_id in chunk)})"},
+        )
+        for row in rows:
+            name = (row.get("CommandName") or "").lower()
+            if "description" not in name and not name.startswith("create"):
+                continue
+            data = _payload(row.get("Data"))
+            if "description" in data:
+                descriptions[row["TaskId"]] = data["description"]
+        return descriptions
+
+    descriptions = {}
+    errors = []
+    for chunk, result, error in run_concurrently(pull, chunk_ids(sorted(task_ids), key_field="TaskId"), max_workers):
+        if error is not None:
+            errors.append(error)
+            continue
+        descriptions.update(result)
+    return descriptions, errors
+
+
+def _sync_parents(api, index, project_id, kind, stats):
+    python_method, select = PARENT_SETS[kind]
+    since = index.watermark(project_id, kind)
+    latest = since
+    changed = []
+    for row in _changed_rows(api, python_method, select, since, PARENT_CHANGE_FIELDS, project_id=project_id):
+        if row.get("Hidden"):
+            index.remove(kind, row["ID"])
+            index.remove_children(f"{kind}_comment", row["ID"])
+            stats["removed"] += 1
+        else:
+            index.upsert(kind, row["ID"], title=row.get("Title"), project_id=project_id)
+            if "Description" in row:
+                index.set_body(kind, row["ID"], row["Description"])
+            changed.append(row["ID"])
+            stats["indexed"] += 1
+        latest = _latest(row, PARENT_CHANGE_FIELDS, latest)
+    return changed, latest
+
+
+def _sync_comments(api, index, project_id, kind, max_workers, stats):
+    python_method, parent_kind, key_field = COMMENT_SETS[kind]
+    select = f"ID,Hidden,{key_field},Text,CreatedAt,EditedAt"
+    since = index.watermark(project_id, kind)
+    parents = index.entity_ids(parent_kind, project_id)
+    if since is None:
+        # The first pass reads the comments of this project's tasks or epics in "<key> in (...)" chunks.
+        def pull(chunk):
+            return list(_changed_rows(api, python_method, select, None, (), odata_filter=f"{key_field} in ({','.join(map(str, chunk))})"))
+
+        rows = []
+        for _, chunk_rows, error in run_concurrently(pull, chunk_ids(sorted(parents), key_field=key_field), max_workers):
+            if error is not None:
+                raise error
+            rows.extend(chunk_rows)
+    else:
+        # Later passes read every comment changed since the watermark and keep those of this project.
+        rows = _changed_rows(api, python_method, select, since, COMMENT_CHANGE_FIELDS)
+    latest = since
+    for row in rows:
+        latest = _latest(row, COMMENT_CHANGE_FIELDS, latest)
+        if row.get(key_field) not in parents:
+            continue
+        if row.get("Hidden"):
+            index.remove(kind, row["ID"])
+            stats["removed"] += 1
+        else:
+            index.upsert(kind, row["ID"], body=row.get("Text"), parent_id=row[key_field], project_id=project_id)
+            stats["indexed"] += 1
+    return latest
+
+
+def sync_project(api, index, project_id, max_workers=8):
+    stats = {"projectId": project_id, "indexed": 0, "removed": 0, "errors": []}
+    watermarks = {}
+    changed_tasks, watermarks["task"] = _sync_parents(api, index, project_id, "task", stats)
+    _, watermarks["epic"] = _sync_parents(api, index, project_id, "epic", stats)
+    descriptions, errors = load_descriptions(api, changed_tasks, max_workers)
+    for task_id, description in descriptions.items():
+        index.set_body("task", task_id, description)
+    stats["errors"].extend(str(error) for error in errors)
+    for kind in COMMENT_SETS:
+        watermarks[kind] = _sync_comments(api, index, project_id, kind, max_workers, stats)
+    if errors:
+        # Descriptions that failed to load are retried next time by keeping the task watermark where it was.
+        watermarks["task"] = index.watermark(project_id, "task")
+    for source, stamp in watermarks.items():
+        if stamp is not None:
+            index.set_watermark(project_id, source, stamp)
+    index.commit()
+    return stats
+
+
+def configure_parser(parser):
+    parser.add_argument("query", nargs="?", help="Words to look for in titles, descriptions and comments")
+    parser.add_argument("--project", dest="project_ids", type=int, action="append", help="Project ID (repeatable)")
+    parser.add_argument("--sync", action="store_true", help="Update the index for --project before searching")
+    parser.add_argument("--index", help="Index file (default: ERP_CACHE_DIR/tasktracker-search-<server>.sqlite3)")
+    parser.add_argument("--kind", dest="kinds", action="append", choices=sorted(KINDS), help="Only this document kind (repeatable)")
+    parser.add_argument("--by-task", action="store_true", help="Rank tasks by their own and their comments' matches")
+    parser.add_argument("--raw", action="store_true", help="Pass the query to FTS5 unchanged (AND, NEAR, column filters)")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum results")
+
+
+def run(api, args):
+    if args.sync and not args.project_ids:
+        raise ValueError("--sync needs at least one --project")
+    if not args.sync and not args.query:
+        raise ValueError("Pass a query, or --sync with --project to update the index")
+    path = args.index or default_index_path(api.base_url)
+    with SearchIndex(path) as index:
+        failed = False
+        if args.sync:
+            for project_id in args.project_ids:
+                stats = sync_project(api, index, project_id, max_workers=args.workers)
+                failed = failed or bool(stats["errors"])
+                print(json.dumps(stats, ensure_ascii=False), file=sys.stderr)
+        if args.query:
+            started = time.perf_counter()
+            results = index.search(
+                args.query,
+                limit=args.limit,
+                kinds=args.kinds,
+                project_ids=args.project_ids,
+                by_task=args.by_task,
+                raw=args.raw,
+            )
+            write_ndjson(results)
+            elapsed = round((time.perf_counter() - started) * 1000, 2)
+            print(json.dumps({"results": len(results), "ms": elapsed}), file=sys.stderr)
+    return 1 if failed else 0
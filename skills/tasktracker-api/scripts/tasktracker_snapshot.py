@@ -0,0 +1,288 @@
+import gzip
+import heapq
+import io
+import json
+import os
+import sys
+import tarfile
+import tempfile
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+
+from tasktracker_loader import chunk_ids
+from tasktracker_ops_utils import describe_error, iter_odata_rows_by_key, run_concurrently
+
+
+SNAPSHOT_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+PROJECT_SETS = {
+    "tasks": "odata_task",
+    "epics": "odata_epic",
+    "milestones": "odata_milestone",
+    "sprints": "odata_sprint",
+    "labels": "odata_label_for_project",
+    "boards": "odata_board",
+}
+# Child sets are read for the IDs of their parent set in "<key> in (...)" chunks.
+CHILD_SETS = {
+    "task_comments": ("odata_task_comment", "tasks", "TaskId"),
+    "task_history": ("odata_task_history", "tasks", "TaskId"),
+    "task_time": ("odata_task_time", "tasks", "TaskId"),
+    "epic_comments": ("odata_epic_comment", "epics", "EpicId"),
+    "epic_history": ("odata_epic_history", "epics", "EpicId"),
+}
+BOARD_LISTS_METHOD = "get_board_list_query_get_lists_board_id"
+WATERMARK_FIELDS = ("UpdatedAt", "EditedAt", "CreatedAt")
+MERGE_FAN_IN = 64
+
+
+def member_name(entity_set):
+    return f"{entity_set}.ndjson.gz"
+
+
+def _dumps(row):
+    return json.dumps(row, ensure_ascii=False, separators=(",", ":"))
+
+
+class _MemberWriter:
+    def __init__(self, path, key_fields=("ID",)):
+        self.path = path
+        self.key_fields = key_fields
+        self.count = 0
+        self.skipped = 0
+        self.watermark = None
+        self.max_id = None
+        self._last_key = None
+        self._handle = gzip.open(path, "wt", encoding="utf-8")
+
+    def write(self, row):
+        # Rows arrive in key order, so a repeat of the previous key is a row read twice; rows without a key
+        # cannot be matched by snapshot-diff and are left out.
+        key = tuple(row.get(field) for field in self.key_fields)
+        if None in key or key == self._last_key:
+            self.skipped += 1
+            return False
+        self._last_key = key
+        self._handle.write(_dumps(row))
+        self._handle.write("\n")
+        self.count += 1
+        stamp = max((row[field] for field in WATERMARK_FIELDS if row.get(field)), default=None)
+        if stamp is not None and (self.watermark is None or stamp > self.watermark):
+            self.watermark = stamp
+        if isinstance(row.get("ID"), int) and (self.max_id is None or row["ID"] > self.max_id):
+            self.max_id = row["ID"]
+        return True
+
+    def close(self):
+        self._handle.close()
+        return {"count": self.count, "skipped": self.skipped, "maxId": self.max_id, "watermark": self.watermark}
+
+
+def _read_member_file(path):
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            yield json.loads(line)
+
+
+def _merge_files(paths, writer, directory):
+    # Merge at most MERGE_FAN_IN sorted files at a time so large projects stay within open-file limits.
+    paths = list(paths)
+    generation = 0
+    while len(paths) > MERGE_FAN_IN:
+        merged = []
+        for start in range(0, len(paths), MERGE_FAN_IN):
+            group = paths[start:start + MERGE_FAN_IN]
+            path = directory / f".merge.{generation}.{start}.ndjson.gz"
+            with gzip.open(path, "wt", encoding="utf-8") as handle:
+                for row in heapq.merge(*(_read_member_file(item) for item in group), key=lambda row: row["ID"]):
+                    handle.write(_dumps(row))
+                    handle.write("\n")
+            for item in group:
+                item.unlink()
+            merged.append(path)
+        paths = merged
+        generation += 1
+    # A row matched by two chunks (for example after it moved to another parent) is written once by the writer.
+    for row in heapq.merge(*(_read_member_file(path) for path in paths), key=lambda row: row["ID"]):
+        writer.write(row)
+
+
+def _pull_set(api, python_method, path, ids=None, include_hidden=True, **method_kwargs):
+    writer = _MemberWriter(path)
+    try:
+        # Paging by ID keeps rows inserted or deleted during the export from shifting later pages.
+        for row in iter_odata_rows_by_key(api, python_method, include_hidden=include_hidden, **method_kwargs):
+            if writer.write(row) and ids is not None:
+                ids.append(row["ID"])
+    finally:
+        summary = writer.close()
+    return summary
+
+
+def _pull_chunk(api, python_method, key_field, chunk, path, include_hidden=True):
+    odata_filter = f"{key_field} in ({','.join(str(key) for key in chunk)})"
+    return _pull_set(api, python_method, path, include_hidden=include_hidden, odata_params={"$filter": odata_filter})
+
+
+def _board_rows(response):
+    # GetLists publishes no response schema; a bare list or an items/value wrapper is accepted. Lists keep the
+    # server order; a repeated id keeps its first position and its last row. Rows without an id are passed on
+    # for the writer to skip and count.
+    if isinstance(response, dict):
+        response = response.get("items") or response.get("value") or []
+    rows = {}
+    for position, row in enumerate(response or []):
+        if isinstance(row, dict):
+            rows[row["id"] if row.get("id") is not None else (None, position)] = row
+    return list(rows.values())
+
+
+def export_snapshot(api, project_id, output, max_workers=8, include_hidden=True, entity_sets=None):
+    output = Path(output)
+    wanted = set(entity_sets or (*PROJECT_SETS, *CHILD_SETS, "board_lists"))
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "projectId": project_id,
+        "createdAt": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "baseUrl": getattr(api, "base_url", None),
+        "entities": {},
+        "errors": {},
+    }
+    with tempfile.TemporaryDirectory(dir=output.parent, prefix=".snapshot-") as directory:
+        directory = Path(directory)
+        # Parent sets keep only their IDs, in compact arrays, for the child pulls.
+        parent_ids = {name: array("q") for name in ("tasks", "epics", "boards")}
+        needed_parents = {parent for name, (_, parent, _) in CHILD_SETS.items() if name in wanted}
+        if "board_lists" in wanted:
+            needed_parents.add("boards")
+
+        def pull_project_set(name):
+            return _pull_set(
+                api,
+                PROJECT_SETS[name],
+                directory / member_name(name),
+                ids=parent_ids[name] if name in parent_ids else None,
+                include_hidden=include_hidden,
+                project_id=project_id,
+            )
+
+        project_sets = [name for name in PROJECT_SETS if name in wanted or name in needed_parents]
+        for name, summary, error in run_concurrently(pull_project_set, project_sets, max_workers):
+            if error is not None:
+                manifest["errors"][name] = describe_error(error)
+            elif name in wanted:
+                manifest["entities"][name] = {"member": member_name(name), "method": PROJECT_SETS[name], **summary}
+
+        # Every child set is split into ID chunks; all chunks of all sets share one worker pool.
+        jobs = []
+        for name, (python_method, parent, key_field) in CHILD_SETS.items():
+            if name not in wanted:
+                continue
+            if parent in manifest["errors"]:
+                manifest["errors"][name] = f"not exported: {parent} failed"
+                continue
+            for index, chunk in enumerate(chunk_ids(sorted(parent_ids[parent]), key_field=key_field)):
+                jobs.append((name, python_method, key_field, chunk, directory / f"{name}.{index}.ndjson.gz"))
+        if "board_lists" in wanted and "boards" in manifest["errors"]:
+            manifest["errors"]["board_lists"] = "not exported: boards failed"
+        elif "board_lists" in wanted:
+            jobs.extend(("board_lists", BOARD_LISTS_METHOD, None, board_id, None) for board_id in parent_ids["boards"])
+
+        def pull_job(job):
+            name, python_method, key_field, chunk, path = job
+            if name == "board_lists":
+                rows = _board_rows(api.call_by_python_method(python_method, chunk))
+                return [{"boardId": chunk, **row} for row in rows]
+            return _pull_chunk(api, python_method, key_field, chunk, path, include_hidden)
+
+        parts = {}
+        for job, result, error in run_concurrently(pull_job, jobs, max_workers):
+            name = job[0]
+            if error is not None:
+                manifest["errors"].setdefault(name, describe_error(error))
+                continue
+            parts.setdefault(name, []).append((job, result))
+
+        # Chunk files are each sorted by ID; a k-way merge writes the member in ID order without loading it.
+        for name in CHILD_SETS:
+            if name not in wanted or name in manifest["errors"]:
+                continue
+            writer = _MemberWriter(directory / member_name(name))
+            _merge_files([job[4] for job, _ in parts.get(name, [])], writer, directory)
+            manifest["entities"][name] = {"member": member_name(name), "method": CHILD_SETS[name][0], **writer.close()}
+        if "board_lists" in wanted and "board_lists" not in manifest["errors"]:
+            writer = _MemberWriter(directory / member_name("board_lists"), key_fields=("boardId", "id"))
+            for _, rows in sorted(parts.get("board_lists", []), key=lambda part: part[0][3]):
+                for row in rows:
+                    writer.write(row)
+            manifest["entities"]["board_lists"] = {
+                "member": member_name("board_lists"),
+                "method": BOARD_LISTS_METHOD,
+                **writer.close(),
+            }
+
+        temporary_output = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+        with tarfile.open(temporary_output, "w") as archive:
+            payload = json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(payload)
+            archive.addfile(info, io.BytesIO(payload))
+            for name, entry in manifest["entities"].items():
+                archive.add(directory / entry["member"], arcname=entry["member"])
+        os.replace(temporary_output, output)
+    return manifest
+
+
+class Snapshot:
+    def __init__(self, path):
+        self._archive = tarfile.open(path, "r")
+        self.manifest = json.load(self._archive.extractfile(MANIFEST_NAME))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._archive.close()
+
+    def entity_sets(self):
+        return list(self.manifest["entities"])
+
+    def rows(self, entity_set):
+        entry = self.manifest["entities"].get(entity_set)
+        if entry is None:
+            return
+        with gzip.open(self._archive.extractfile(entry["member"]), "rt", encoding="utf-8") as handle:
+            for line in handle:
+                yield json.loads(line)
+
+
+def configure_parser(parser):
+    parser.add_argument("--project", dest="project_id", type=int, required=True, help="Project ID")
+    parser.add_argument("--output", "-o", required=True, help="Archive path, for example project-12.tar")
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=sorted((*PROJECT_SETS, *CHILD_SETS, "board_lists")),
+        help="Export only this entity set (repeatable)",
+    )
+    parser.add_argument("--exclude-hidden", action="store_true", help="Leave out hidden (deleted) rows")
+
+
+def run(api, args):
+    manifest = export_snapshot(
+        api,
+        args.project_id,
+        args.output,
+        max_workers=args.workers,
+        include_hidden=not args.exclude_hidden,
+        entity_sets=args.only,
+    )
+    for name, error in manifest["errors"].items():
+        print(json.dumps({"entitySet": name, "ok": False, "error": error}), file=sys.stderr)
+    counts = {name: entry["count"] for name, entry in manifest["entities"].items()}
+    print(json.dumps({"output": str(args.output), "counts": counts}), file=sys.stderr)
+    return 1 if manifest["errors"] else 0
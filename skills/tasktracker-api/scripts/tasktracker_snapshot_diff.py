@@ -0,0 +1,123 @@
+import json
+import sys
+from itertools import groupby
+
+from tasktracker_ops_utils import write_ndjson
+from tasktracker_snapshot import Snapshot
+
+
+# board_lists rows keep the server order within a board, so they are keyed and sorted one board at a time.
+GROUPED_SETS = {"board_lists": ("boardId", "id")}
+_MISSING = object()
+
+
+def _sort_key(key):
+    # Missing keys sort before every other value, so archives written before keyless rows were skipped still join.
+    if isinstance(key, tuple):
+        return tuple(_sort_key(part) for part in key)
+    return (key is not None, key)
+
+
+def keyed_rows(rows, entity_set):
+    if entity_set in GROUPED_SETS:
+        group_field, key_field = GROUPED_SETS[entity_set]
+        for group_key, group in groupby(rows, key=lambda row: row.get(group_field)):
+            for row in sorted(group, key=lambda row: _sort_key(row.get(key_field))):
+                yield (group_key, row.get(key_field)), row
+        return
+    for row in rows:
+        yield row.get("ID"), row
+
+
+def _checked(pairs, entity_set, side):
+    # Yields (sort key, key, row); rows sharing a key are merged, the last one read wins.
+    pending = None
+    for key, row in pairs:
+        order = _sort_key(key)
+        if pending is not None:
+            try:
+                descending = order < pending[0]
+            except TypeError:
+                raise ValueError(f"{side} {entity_set} mixes key types: {key!r} follows {pending[1]!r}") from None
+            if descending:
+                raise ValueError(f"{side} {entity_set} is not sorted by key: {key!r} follows {pending[1]!r}")
+            if order != pending[0]:
+                yield pending
+        pending = (order, key, row)
+    if pending is not None:
+        yield pending
+
+
+def field_changes(before, after, ignore=()):
+    changes = {}
+    for field in before.keys() | after.keys():
+        if field in ignore:
+            continue
+        old = before.get(field, _MISSING)
+        new = after.get(field, _MISSING)
+        if old != new:
+            changes[field] = {
+                "before": None if old is _MISSING else old,
+                "after": None if new is _MISSING else new,
+            }
+    return dict(sorted(changes.items()))
+
+
+def diff_rows(before, after, entity_set, ignore=()):
+    # Both sides are sorted by key, so one forward pass pairs them up with a single row of each in memory.
+    before = _checked(keyed_rows(before, entity_set), entity_set, "before")
+    after = _checked(keyed_rows(after, entity_set), entity_set, "after")
+    old = next(before, None)
+    new = next(after, None)
+    while old is not None or new is not None:
+        if new is None or (old is not None and old[0] < new[0]):
+            yield {"entitySet": entity_set, "id": old[1], "change": "removed", "row": old[2]}
+            old = next(before, None)
+        elif old is None or new[0] < old[0]:
+            yield {"entitySet": entity_set, "id": new[1], "change": "added", "row": new[2]}
+            new = next(after, None)
+        else:
+            changes = field_changes(old[2], new[2], ignore)
+            if changes:
+                yield {"entitySet": entity_set, "id": new[1], "change": "changed", "fields": changes}
+            old = next(before, None)
+            new = next(after, None)
+
+
+def diff_snapshots(before, after, entity_sets=None, ignore=()):
+    summary = {}
+
+    def generate():
+        for entity_set in dict.fromkeys([*before.entity_sets(), *after.entity_sets()]):
+            if entity_sets and entity_set not in entity_sets:
+                continue
+            if entity_set not in before.manifest["entities"] or entity_set not in after.manifest["entities"]:
+                summary[entity_set] = {"skipped": "missing in " + ("before" if entity_set in after.manifest["entities"] else "after")}
+                continue
+            counts = summary.setdefault(entity_set, {"added": 0, "removed": 0, "changed": 0})
+            for event in diff_rows(before.rows(entity_set), after.rows(entity_set), entity_set, ignore):
+                counts[event["change"]] += 1
+                yield event
+
+    return generate(), summary
+
+
+def configure_parser(parser):
+    parser.add_argument("before", help="Older snapshot archive")
+    parser.add_argument("after", help="Newer snapshot archive")
+    parser.add_argument("--only", action="append", help="Compare only this entity set (repeatable)")
+    parser.add_argument("--ignore", action="append", default=[], help="Field left out of the comparison (repeatable)")
+    parser.add_argument("--summary", action="store_true", help="Print one row of counts per entity set instead of the changes")
+
+
+def run(api, args):
+    with Snapshot(args.before) as before, Snapshot(args.after) as after:
+        events, summary = diff_snapshots(before, after, entity_sets=args.only, ignore=set(args.ignore))
+        if args.summary:
+            for _ in events:
+                pass
+            write_ndjson([{"entitySet": name, **counts} for name, counts in summary.items()])
+        else:
+            write_ndjson(events)
+            print(json.dumps({"summary": summary}, ensure_ascii=False), file=sys.stderr)
+    return 0
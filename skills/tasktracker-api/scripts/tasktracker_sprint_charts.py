@@ -0,0 +1,249 @@
+import json
+import sys
+from datetime import date, datetime, time, timedelta, timezone
+
+from tasktracker_loader import chunk_ids
+from tasktracker_ops_utils import (
+    ResultCache,
+    describe_error,
+    iter_odata_rows,
+    run_concurrently,
+    write_csv,
+    write_ndjson,
+)
+
+
+OPEN_STATE = 10
+CLOSED_STATE = 20
+SPRINT_SELECT = "ID,Title,StartDate,DueDate,State"
+TASK_SELECT = "ID,State,Weight,SprintId,CreatedAt"
+HISTORY_SELECT = "ID,TaskId,CommandName,CreatedAt,Data"
+# TaskHistory.Data is not described in the shipped indexes. It is read as JSON, and the new values are
+# taken from the first of these keys (case-insensitive); commands are recognized by CommandName.
+DATA_KEYS = {
+    "weight": ("weight", "newWeight"),
+    "sprintId": ("sprintId", "newSprintId"),
+}
+VALUE_COMMANDS = ("create", "weight", "sprint", "bulkedit")
+CACHE_NAME = "sprint-charts"
+CLOSED_SPRINT_TTL_SECONDS = 365 * 24 * 60 * 60
+FIELDS = ("state", "weight", "sprintId")
+
+
+def _timestamp(value):
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _day(value):
+    return date.fromisoformat(str(value)[:10])
+
+
+def _data(raw):
+    if isinstance(raw, dict):
+        payload = raw
+    else:
+        try:
+            payload = json.loads(raw) if raw else {}
+        except ValueError:
+            payload = {}
+    return {str(key).lower(): value for key, value in payload.items()} if isinstance(payload, dict) else {}
+
+
+def history_changes(row):
+    name = (row.get("CommandName") or "").lower().replace("command", "").replace("_", "")
+    changes = {}
+    if "reopen" in name:
+        changes["state"] = OPEN_STATE
+    elif "close" in name:
+        changes["state"] = CLOSED_STATE
+    if any(part in name for part in VALUE_COMMANDS):
+        data = _data(row.get("Data"))
+        for field, keys in DATA_KEYS.items():
+            for key in keys:
+                if key.lower() in data:
+                    changes[field] = data[key.lower()]
+                    break
+    return name.startswith("create"), changes
+
+
+def load_sprints(api, project_id, sprint_ids=None):
+    sprints = iter_odata_rows(api, "odata_sprint", odata_params={"$select": SPRINT_SELECT}, project_id=project_id)
+    wanted = set(sprint_ids or ())
+    return [sprint for sprint in sprints if not wanted or sprint["ID"] in wanted]
+
+
+def load_tasks(api, project_id):
+    return list(iter_odata_rows(api, "odata_task", odata_params={"$select": TASK_SELECT}, project_id=project_id))
+
+
+def load_history(api, task_ids, max_workers=8):
+    def pull(chunk):
+        return list(
+            iter_odata_rows(
+                api,
+                "odata_task_history",
+                odata_params={
+                    "$filter": f"TaskId in ({','.join(str(task_id) for task_id in chunk)})",
+                    "$select": HISTORY_SELECT,
+                    "$orderby": "CreatedAt,ID",
+                },
+            )
+        )
+
+    rows = []
+    for chunk, chunk_rows, error in run_concurrently(pull, chunk_ids(sorted(task_ids), key_field="TaskId"), max_workers):
+        if error is not None:
+            raise error
+        rows.extend(chunk_rows)
+    return rows
+
+
+def build_events(tasks, history):
+    per_task = {}
+    for row in history:
+        created, changes = history_changes(row)
+        if created or changes:
+            per_task.setdefault(row["TaskId"], []).append((_timestamp(row["CreatedAt"]), row["ID"], created, changes))
+
+    events = []
+    for task in tasks:
+        task_events = sorted(per_task.get(task["ID"], []), key=lambda event: (event[0], event[1]))
+        current = {"state": task.get("State"), "weight": task.get("Weight"), "sprintId": task.get("SprintId")}
+        initial = {"state": OPEN_STATE, "weight": None, "sprintId": None}
+        changed = set()
+        for _, _, created, changes in task_events:
+            if created:
+                initial.update({field: value for field, value in changes.items() if field not in changed})
+            changed.update(field for field in changes if not created)
+        # Fields the history never changes keep the value the task has today.
+        initial.update({field: current[field] for field in FIELDS if field not in changed})
+        events.append((_timestamp(task["CreatedAt"]), 0, task["ID"], initial))
+        events.extend(
+            (moment, 1, task["ID"], changes) for moment, _, created, changes in task_events if changes and not created
+        )
+    events.sort(key=lambda event: (event[0], event[1]))
+    return events
+
+
+def replay(sprints, events, today=None):
+    today = today or datetime.now(timezone.utc).date()
+    ranges = {}
+    for sprint in sprints:
+        first, last = _day(sprint["StartDate"]), min(_day(sprint["DueDate"]), today)
+        ranges[sprint["ID"]] = (first, last)
+    boundaries = sorted(
+        {first + timedelta(days=offset) for first, last in ranges.values() for offset in range((last - first).days + 1)}
+    )
+
+    tasks = {}
+    totals = {sprint_id: [0, 0, 0, 0] for sprint_id in ranges}
+    series = {sprint_id: [] for sprint_id in ranges}
+
+    def contribute(state, sign):
+        totals_row = totals.get(state["sprintId"])
+        if totals_row is None:
+            return
+        weight = state["weight"] or 0
+        totals_row[0] += sign
+        totals_row[2] += sign * weight
+        if state["state"] == CLOSED_STATE:
+            totals_row[1] += sign
+            totals_row[3] += sign * weight
+
+    # One sweep over all events: each day boundary snapshots every sprint that is running on that day.
+    position = 0
+    for day in boundaries:
+        cutoff = datetime.combine(day + timedelta(days=1), time(), tzinfo=timezone.utc)
+        while position < len(events) and events[position][0] < cutoff:
+            _, _, task_id, changes = events[position]
+            position += 1
+            state = tasks.get(task_id)
+            if state is not None:
+                contribute(state, -1)
+                state = {**state, **changes}
+            else:
+                state = dict(changes)
+            tasks[task_id] = state
+            contribute(state, 1)
+        for sprint_id, (first, last) in ranges.items():
+            if first <= day <= last:
+                scope, done, scope_weight, done_weight = totals[sprint_id]
+                series[sprint_id].append(
+                    {
+                        "date": day.isoformat(),
+                        "scopeTasks": scope,
+                        "doneTasks": done,
+                        "remainingTasks": scope - done,
+                        "scopeWeight": scope_weight,
+                        "doneWeight": done_weight,
+                        "remainingWeight": scope_weight - done_weight,
+                    }
+                )
+    return series
+
+
+def sprint_chart(sprint, series):
+    last = series[-1] if series else {}
+    return {
+        "sprintId": sprint["ID"],
+        "title": sprint.get("Title"),
+        "startDate": sprint.get("StartDate"),
+        "dueDate": sprint.get("DueDate"),
+        "state": sprint.get("State"),
+        "velocity": {"tasks": last.get("doneTasks", 0), "weight": last.get("doneWeight", 0)},
+        "series": series,
+    }
+
+
+def sprint_charts(api, project_id, sprint_ids=None, max_workers=8, cache=None, today=None):
+    sprints = load_sprints(api, project_id, sprint_ids)
+    charts = {}
+    missing = []
+    for sprint in sprints:
+        hit, chart = cache.get(str(sprint["ID"])) if cache is not None and sprint.get("State") == CLOSED_STATE else (False, None)
+        if hit:
+            charts[sprint["ID"]] = chart
+        else:
+            missing.append(sprint)
+
+    if missing:
+        tasks = load_tasks(api, project_id)
+        history = load_history(api, [task["ID"] for task in tasks], max_workers)
+        series = replay(missing, build_events(tasks, history), today)
+        for sprint in missing:
+            charts[sprint["ID"]] = sprint_chart(sprint, series[sprint["ID"]])
+            # Closed sprints do not change any more, so their charts are kept for a long time.
+            if cache is not None and sprint.get("State") == CLOSED_STATE:
+                cache.put(str(sprint["ID"]), charts[sprint["ID"]])
+        if cache is not None:
+            cache.save()
+    return [charts[sprint["ID"]] for sprint in sprints], len(missing)
+
+
+def configure_parser(parser):
+    parser.add_argument("--project", dest="project_id", type=int, required=True, help="Project ID")
+    parser.add_argument("--sprint", dest="sprint_ids", action="append", type=int, help="Sprint ID (repeatable; default all)")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson", help="csv writes one row per sprint day")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute closed sprints instead of reusing cached charts")
+
+
+def run(api, args):
+    cache = None if args.no_cache else ResultCache(CACHE_NAME, api.base_url, ttl=CLOSED_SPRINT_TTL_SECONDS)
+    try:
+        charts, computed = sprint_charts(api, args.project_id, args.sprint_ids, args.workers, cache)
+    except Exception as exc:
+        print(json.dumps({"projectId": args.project_id, "ok": False, "error": describe_error(exc)}), file=sys.stderr)
+        return 1
+    if args.format == "csv":
+        write_csv(
+            {"sprintId": chart["sprintId"], "title": chart["title"], **point}
+            for chart in charts
+            for point in chart["series"]
+        )
+    else:
+        write_ndjson(charts)
+    print(json.dumps({"sprints": len(charts), "computed": computed, "cached": len(charts) - computed}), file=sys.stderr)
+    return 0
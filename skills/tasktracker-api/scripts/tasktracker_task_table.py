@@ -0,0 +1,252 @@
+import json
+import sys
+from array import array
+from itertools import product
+
+from tasktracker_ops_utils import describe_error, iter_odata_rows, run_concurrently, write_csv, write_ndjson
+
+
+# Scalar columns are typed arrays; a missing ID or weight is stored as 0.
+SCALAR_COLUMNS = {
+    "ID": "q",
+    "ProjectId": "q",
+    "State": "h",
+    "Weight": "q",
+    "SprintId": "q",
+    "MilestoneId": "q",
+    "EpicId": "q",
+    "CurrentAssigneeId": "q",
+    "AuthorId": "q",
+}
+# A bitmap index holds one bitmap per distinct value, which for a unique column is quadratic in the task count;
+# these are answered by scanning the column instead.
+SCANNED_COLUMNS = ("ID",)
+# Collections keep only the IDs of their items and are queried through bitmap indexes.
+SET_COLUMNS = ("Labels", "Assignees")
+LOAD_FIELDS = "ID,State,Weight,SprintId,MilestoneId,EpicId,CurrentAssigneeId,AuthorId,Labels/ID,Assignees/ID"
+ALIASES = {
+    "project": "ProjectId",
+    "state": "State",
+    "weight": "Weight",
+    "sprint": "SprintId",
+    "milestone": "MilestoneId",
+    "epic": "EpicId",
+    "currentAssignee": "CurrentAssigneeId",
+    "author": "AuthorId",
+    "label": "Labels",
+    "assignee": "Assignees",
+}
+NUMPY_TYPES = {"q": "int64", "h": "int16"}
+
+
+def _item_id(item):
+    if isinstance(item, dict):
+        return item.get("ID", item.get("id"))
+    return getattr(item, "ID", item)
+
+
+def _bitmap(positions, size):
+    # Bits are set in a bytearray and converted once; OR-ing into an int per row would copy it every time.
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class Mask:
+    __slots__ = ("bits", "size")
+
+    def __init__(self, bits, size):
+        self.bits = bits
+        self.size = size
+
+    def __and__(self, other):
+        return Mask(self.bits & other.bits, self.size)
+
+    def __or__(self, other):
+        return Mask(self.bits | other.bits, self.size)
+
+    def __sub__(self, other):
+        return Mask(self.bits & ~other.bits, self.size)
+
+    def __invert__(self):
+        return Mask(~self.bits & ((1 << self.size) - 1), self.size)
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def positions(self):
+        raw = self.bits.to_bytes((self.size + 7) // 8, "little")
+        for index, byte in enumerate(raw):
+            while byte:
+                low = byte & -byte
+                yield index * 8 + low.bit_length() - 1
+                byte ^= low
+
+
+class TaskTable:
+    def __init__(self):
+        self.columns = {name: array(code) for name, code in SCALAR_COLUMNS.items()}
+        self.sets = {name: [] for name in SET_COLUMNS}
+        self._index = {}
+
+    @classmethod
+    def from_rows(cls, rows, project_id=None):
+        table = cls()
+        table.extend(rows, project_id)
+        return table
+
+    @classmethod
+    def load(cls, api, project_ids, max_workers=8):
+        def fetch(project_id):
+            return list(iter_odata_rows(api, "odata_task", fields=LOAD_FIELDS, project_id=project_id))
+
+        table = cls()
+        # A dashboard missing one project would be silently wrong, so any failed project fails the load.
+        for project_id, rows, error in run_concurrently(fetch, project_ids, max_workers):
+            if error is not None:
+                raise RuntimeError(f"Project {project_id}: {describe_error(error)}") from error
+            table.extend(rows, project_id)
+        return table
+
+    def extend(self, rows, project_id=None):
+        columns = [(name, self.columns[name].append) for name in SCALAR_COLUMNS if name != "ProjectId"]
+        append_project = self.columns["ProjectId"].append
+        for row in rows:
+            for name, append in columns:
+                append(row.get(name) or 0)
+            append_project(row.get("ProjectId") or project_id or 0)
+            for name in SET_COLUMNS:
+                self.sets[name].append(tuple(_item_id(item) for item in row.get(name) or ()))
+        self._index.clear()
+
+    def __len__(self):
+        return len(self.columns["ID"])
+
+    def column(self, name):
+        return self.columns[ALIASES.get(name, name)]
+
+    def to_numpy(self):
+        import numpy
+
+        return {name: numpy.frombuffer(values, dtype=NUMPY_TYPES[values.typecode]) for name, values in self.columns.items()}
+
+    def all(self):
+        return Mask((1 << len(self)) - 1, len(self))
+
+    def none(self):
+        return Mask(0, len(self))
+
+    def index(self, name):
+        # One pass groups row positions by value; each value's bitmap is then built in a single conversion.
+        name = ALIASES.get(name, name)
+        if name not in self._index:
+            positions = {}
+            if name in self.sets:
+                for position, values in enumerate(self.sets[name]):
+                    for value in values:
+                        positions.setdefault(value, []).append(position)
+            else:
+                for position, value in enumerate(self.columns[name]):
+                    positions.setdefault(value, []).append(position)
+            self._index[name] = {value: _bitmap(rows, len(self)) for value, rows in positions.items()}
+        return self._index[name]
+
+    def _scan(self, name, match):
+        column = self.column(name)
+        return Mask(_bitmap((position for position, value in enumerate(column) if match(value)), len(self)), len(self))
+
+    def eq(self, name, value):
+        if ALIASES.get(name, name) in SCANNED_COLUMNS:
+            return self._scan(name, lambda item: item == value)
+        return Mask(self.index(name).get(value, 0), len(self))
+
+    def isin(self, name, values):
+        if ALIASES.get(name, name) in SCANNED_COLUMNS:
+            wanted = set(values)
+            return self._scan(name, wanted.__contains__)
+        index = self.index(name)
+        bits = 0
+        for value in values:
+            bits |= index.get(value, 0)
+        return Mask(bits, len(self))
+
+    def where(self, name, predicate):
+        if ALIASES.get(name, name) in SCANNED_COLUMNS:
+            return self._scan(name, predicate)
+        # The predicate runs once per distinct value, not once per row.
+        return self.isin(name, [value for value in self.index(name) if predicate(value)])
+
+    def has_all(self, name, values):
+        mask = self.all()
+        for value in values:
+            mask &= self.eq(name, value)
+        return mask
+
+    def sum(self, name, mask=None):
+        bits = self.all().bits if mask is None else mask.bits
+        return sum(value * (bitmap & bits).bit_count() for value, bitmap in self.index(name).items())
+
+    def ids(self, mask):
+        ids = self.columns["ID"]
+        return [ids[position] for position in mask.positions()]
+
+    def group_by(self, names, mask=None, weight=True):
+        names = [ALIASES.get(name, name) for name in ([names] if isinstance(names, str) else names)]
+        selection = self.all().bits if mask is None else mask.bits
+        weights = self.index("Weight").items() if weight else ()
+        groups = [((), selection)]
+        for name in names:
+            # Combinations are narrowed one column at a time, and empty ones are dropped before the next.
+            groups = [
+                (key + (value,), bits & bitmap)
+                for (key, bits), (value, bitmap) in product(groups, self.index(name).items())
+                if bits & bitmap
+            ]
+        rows = []
+        for key, bits in groups:
+            row = dict(zip(names, key))
+            row["count"] = bits.bit_count()
+            if weight:
+                row["weight"] = sum(value * (bits & bitmap).bit_count() for value, bitmap in weights)
+            rows.append(row)
+        return rows
+
+
+def parse_condition(text):
+    name, separator, values = text.partition("=")
+    name = name.strip()
+    if not separator or name not in ALIASES:
+        raise ValueError(f"Expected FIELD=VALUE[,VALUE...] with FIELD one of {', '.join(ALIASES)}, got {text!r}")
+    return name, [int(value) for value in values.split(",") if value.strip()]
+
+
+def configure_parser(parser):
+    parser.add_argument("--project", dest="project_ids", type=int, action="append", required=True, help="Project ID (repeatable)")
+    parser.add_argument(
+        "--group-by",
+        action="append",
+        default=[],
+        choices=sorted(ALIASES),
+        help="Group by this column (repeatable; label and assignee count a task once per item)",
+    )
+    parser.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        help="Keep tasks whose FIELD is one of the values, for example state=10 or label=3,4 (repeatable, ANDed)",
+    )
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson", help="Output format")
+
+
+def run(api, args):
+    conditions = [parse_condition(text) for text in args.where]
+    table = TaskTable.load(api, args.project_ids, args.workers)
+    mask = table.all()
+    for name, values in conditions:
+        mask &= table.isin(name, values)
+    rows = table.group_by(args.group_by, mask)
+    rows.sort(key=lambda row: tuple(row[ALIASES[name]] for name in args.group_by))
+    (write_csv if args.format == "csv" else write_ndjson)(rows)
+    print(json.dumps({"tasks": len(table), "selected": len(mask), "groups": len(rows)}), file=sys.stderr)
+    return 0
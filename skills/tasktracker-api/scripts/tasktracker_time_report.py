@@ -0,0 +1,288 @@
+import argparse
+import base64
+import json
+import os
+import sys
+from array import array
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from tasktracker_loader import ODataLoader
+from tasktracker_odata import and_filters
+from tasktracker_ops_utils import iter_odata_rows, write_csv, write_ndjson
+
+
+TIME_METHOD = "odata_task_time"
+PROJECT_METHOD = "odata_task_in_registry"
+TIME_SELECT = "ID,TaskId,UserId,WorkDate,DurationMinutes,Hidden,CreatedAt,UpdatedAt,DeletedAt,RestoredAt"
+CHANGE_FIELDS = ("CreatedAt", "UpdatedAt", "DeletedAt", "RestoredAt")
+DIMENSIONS = ("user", "task", "project")
+BUCKETS = {
+    "day": lambda day: day.isoformat(),
+    "week": lambda day: "{0}-W{1:02d}".format(*day.isocalendar()),
+    "month": lambda day: f"{day.year}-{day.month:02d}",
+    "all": lambda day: None,
+}
+STATE_VERSION = 1
+COLUMNS = ("ids", "tasks", "users", "days", "minutes")
+
+
+class Accumulator:
+    # Each distinct key gets a slot; totals live in parallel machine-integer arrays instead of per-key objects.
+    def __init__(self):
+        self.slots = {}
+        self.minutes = array("q")
+        self.entries = array("q")
+
+    def add(self, key, minutes, entries=1):
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.slots[key] = len(self.minutes)
+            self.minutes.append(0)
+            self.entries.append(0)
+        self.minutes[slot] += minutes
+        self.entries[slot] += entries
+
+    def items(self):
+        def order(item):
+            return tuple((part is None, 0 if part is None else part) for part in item[0])
+
+        for key, slot in sorted(self.slots.items(), key=order):
+            yield key, self.minutes[slot], self.entries[slot]
+
+
+class TimeEntries:
+    # One row per live time entry, stored column-wise; entries are replaced by ID so re-reading one is harmless.
+    def __init__(self):
+        self.columns = {name: array("q") for name in COLUMNS}
+        self.positions = {}
+        self.watermark = None
+        self.projects = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def upsert(self, entry_id, task_id, user_id, day, minutes):
+        position = self.positions.get(entry_id)
+        values = (entry_id, task_id, user_id, day.toordinal(), minutes)
+        if position is None:
+            self.positions[entry_id] = len(self.columns["ids"])
+            for name, value in zip(COLUMNS, values):
+                self.columns[name].append(value)
+            return
+        for name, value in zip(COLUMNS, values):
+            self.columns[name][position] = value
+
+    def remove(self, entry_id):
+        position = self.positions.pop(entry_id, None)
+        if position is None:
+            return
+        # Swap the last entry into the freed position to keep the columns dense.
+        last = len(self.columns["ids"]) - 1
+        if position != last:
+            for column in self.columns.values():
+                column[position] = column[last]
+            self.positions[self.columns["ids"][position]] = position
+        for column in self.columns.values():
+            column.pop()
+
+    def rows(self):
+        ids, tasks, users, days, minutes = (self.columns[name] for name in COLUMNS)
+        for index in range(len(ids)):
+            yield tasks[index], users[index], date.fromordinal(days[index]), minutes[index]
+
+    def to_json(self):
+        return {
+            "version": STATE_VERSION,
+            "watermark": self.watermark,
+            "columns": {name: base64.b64encode(column.tobytes()).decode("ascii") for name, column in self.columns.items()},
+            "projects": {str(task_id): project_id for task_id, project_id in self.projects.items()},
+        }
+
+    @classmethod
+    def from_json(cls, payload):
+        entries = cls()
+        if payload.get("version") != STATE_VERSION:
+            return entries
+        for name in COLUMNS:
+            entries.columns[name].frombytes(base64.b64decode(payload["columns"][name]))
+        entries.positions = {entry_id: position for position, entry_id in enumerate(entries.columns["ids"])}
+        entries.watermark = payload.get("watermark")
+        entries.projects = {int(task_id): project_id for task_id, project_id in payload.get("projects", {}).items()}
+        return entries
+
+
+def load_state(path):
+    try:
+        return TimeEntries.from_json(json.loads(Path(path).read_text(encoding="utf-8")))
+    except FileNotFoundError:
+        return TimeEntries()
+
+
+def save_state(path, entries):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_suffix(f".{os.getpid()}.tmp")
+    temporary_path.write_text(json.dumps(entries.to_json()), encoding="utf-8")
+    os.replace(temporary_path, path)
+
+
+def _timestamp(value):
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _latest_change(row):
+    stamps = [_timestamp(row[field]) for field in CHANGE_FIELDS if row.get(field)]
+    return max(stamps) if stamps else None
+
+
+def _is_live(row):
+    if row.get("Hidden"):
+        return False
+    # A restored entry keeps its DeletedAt; it counts again once RestoredAt is newer.
+    if row.get("DeletedAt"):
+        return bool(row.get("RestoredAt")) and _timestamp(row["RestoredAt"]) >= _timestamp(row["DeletedAt"])
+    return True
+
+
+def _work_day(row):
+    return date.fromisoformat(str(row["WorkDate"])[:10])
+
+
+def stream_time_rows(api, odata_filter=None, since=None):
+    params = {"$select": TIME_SELECT}
+    if since is None:
+        if odata_filter:
+            params["$filter"] = odata_filter
+        return iter_odata_rows(api, TIME_METHOD, odata_params=params)
+    # Incremental passes must also see entries hidden or deleted since the watermark.
+    literal = since.strftime("%Y-%m-%dT%H:%M:%SZ")
+    params["$filter"] = and_filters(odata_filter, " or ".join(f"{field} ge {literal}" for field in CHANGE_FIELDS))
+    return iter_odata_rows(api, TIME_METHOD, odata_params=params, include_hidden=True)
+
+
+def sync_entries(api, entries):
+    since = _timestamp(entries.watermark) if entries.watermark else None
+    latest = since
+    changed = 0
+    for row in stream_time_rows(api, since=since):
+        changed += 1
+        if _is_live(row):
+            entries.upsert(row["ID"], row["TaskId"], row["UserId"], _work_day(row), row.get("DurationMinutes") or 0)
+        else:
+            entries.remove(row["ID"])
+        stamp = _latest_change(row)
+        if stamp is not None and (latest is None or stamp > latest):
+            latest = stamp
+    if latest is not None:
+        entries.watermark = latest.isoformat()
+    return changed
+
+
+def resolve_projects(api, task_ids, known=None, max_workers=4):
+    projects = dict(known or {})
+    missing = sorted(set(task_ids) - set(projects))
+    if not missing:
+        return projects
+    loader = ODataLoader(api, PROJECT_METHOD, fields="ID,ProjectId", max_workers=max_workers)
+    with loader.batch():
+        futures = dict(zip(missing, loader.load_many(missing)))
+    for task_id, future in futures.items():
+        projects[task_id] = None if future.exception() else future.result().get("ProjectId")
+    return projects
+
+
+def aggregate(rows, bucket="week", date_from=None, date_to=None):
+    # Rows fold into (task, user, bucket) totals first; projects are only looked up for the tasks that remain.
+    accumulator = Accumulator()
+    bucket_key = BUCKETS[bucket]
+    for task_id, user_id, day, minutes in rows:
+        if (date_from and day < date_from) or (date_to and day > date_to):
+            continue
+        accumulator.add((task_id, user_id, bucket_key(day)), minutes)
+    return accumulator
+
+
+def regroup(accumulator, group_by, projects=None):
+    grouped = Accumulator()
+    for (task_id, user_id, bucket), minutes, count in accumulator.items():
+        parts = {"user": user_id, "task": task_id, "project": (projects or {}).get(task_id)}
+        grouped.add(tuple(parts[dimension] for dimension in group_by) + (bucket,), minutes, count)
+    return grouped
+
+
+def report_rows(accumulator, group_by, bucket):
+    for key, minutes, count in accumulator.items():
+        row = {f"{dimension}Id": value for dimension, value in zip(group_by, key)}
+        if bucket != "all":
+            row[bucket] = key[-1]
+        row.update({"minutes": minutes, "hours": round(minutes / 60, 2), "entries": count})
+        yield row
+
+
+def _stream_rows(api, date_from, date_to):
+    conditions = []
+    if date_from:
+        conditions.append(f"WorkDate ge {date_from.isoformat()}")
+    if date_to:
+        conditions.append(f"WorkDate le {date_to.isoformat()}")
+    for row in stream_time_rows(api, " and ".join(conditions) or None):
+        if not _is_live(row):
+            continue
+        yield row["TaskId"], row["UserId"], _work_day(row), row.get("DurationMinutes") or 0
+
+
+def _group_by(value):
+    dimensions = tuple(part.strip() for part in value.split(",") if part.strip())
+    unknown = [dimension for dimension in dimensions if dimension not in DIMENSIONS]
+    if unknown or not dimensions:
+        raise argparse.ArgumentTypeError(f"expected a comma-separated subset of {', '.join(DIMENSIONS)}")
+    return dimensions
+
+
+def configure_parser(parser):
+    parser.add_argument("--group-by", type=_group_by, default=("user", "project"), help="Comma-separated user, task, project")
+    parser.add_argument("--bucket", choices=sorted(BUCKETS), default="week", help="Time bucket for WorkDate")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="First WorkDate to include")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="Last WorkDate to include")
+    parser.add_argument(
+        "--state",
+        help="Keep time entries in this file and only read entries changed since its watermark on later runs",
+    )
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+
+
+def run(api, args):
+    summary = {}
+    entries = None
+    if args.state:
+        entries = load_state(args.state)
+        summary["incremental"] = entries.watermark is not None
+        summary["changedEntries"] = sync_entries(api, entries)
+        summary["entries"] = len(entries)
+        base = aggregate(entries.rows(), args.bucket, args.date_from, args.date_to)
+    else:
+        base = aggregate(_stream_rows(api, args.date_from, args.date_to), args.bucket)
+        summary["entries"] = sum(base.entries)
+
+    projects = None
+    if "project" in args.group_by:
+        task_ids = {task_id for task_id, _, _ in base.slots}
+        projects = resolve_projects(api, task_ids, entries.projects if entries else None, max_workers=args.workers)
+        if entries is not None:
+            entries.projects = projects
+    if entries is not None:
+        save_state(args.state, entries)
+
+    grouped = regroup(base, args.group_by, projects)
+    output = report_rows(grouped, args.group_by, args.bucket)
+    if args.format == "csv":
+        write_csv(output)
+    else:
+        write_ndjson(output)
+    summary["groups"] = len(grouped.slots)
+    print(json.dumps(summary), file=sys.stderr)
+    return 0
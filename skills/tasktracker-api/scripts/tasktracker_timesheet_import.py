@@ -0,0 +1,183 @@
+import json
+import sys
+from collections import Counter
+from datetime import date, timedelta
+
+from tasktracker_ops_utils import describe_error, read_records, run_concurrently, write_ndjson
+
+
+DATE_COMMAND = "post_task_time_command_create_for_date"
+RANGE_COMMAND = "post_task_time_command_create_for_date_range"
+# The CreateForDate/CreateForDateRange bodies are not described in the shipped indexes; keys follow the
+# TaskTime model (taskId, userId, workDate, durationMinutes, comment) plus startDate/endDate for ranges.
+# A range is assumed to create one entry per working day (Monday to Friday) between both dates.
+DATE_KEY = "workDate"
+RANGE_START_KEY = "startDate"
+RANGE_END_KEY = "endDate"
+WORKDAYS = frozenset(range(5))
+
+
+def _work_date(record):
+    value = record.get("workDate") or record.get("date")
+    if not value:
+        raise ValueError(f"Time entry has no workDate: {record}")
+    return date.fromisoformat(str(value)[:10])
+
+
+def _minutes(record):
+    if record.get("durationMinutes") not in (None, ""):
+        return int(record["durationMinutes"])
+    if record.get("hours") not in (None, ""):
+        return round(float(record["hours"]) * 60)
+    raise ValueError(f"Time entry has no durationMinutes or hours: {record}")
+
+
+def collect_entries(records):
+    entries = []
+    for record in records:
+        if "taskId" not in record:
+            raise ValueError(f"Time entry has no taskId: {record}")
+        entries.append(
+            {
+                "taskId": record["taskId"],
+                "userId": record.get("userId"),
+                "workDate": _work_date(record),
+                "durationMinutes": _minutes(record),
+                "comment": record.get("comment"),
+            }
+        )
+    return entries
+
+
+def _next_day(day, workdays_only):
+    day += timedelta(days=1)
+    while workdays_only and day.weekday() not in WORKDAYS:
+        day += timedelta(days=1)
+    return day
+
+
+def plan_import(entries, workdays_only=True):
+    groups = {}
+    for entry in entries:
+        key = (entry["taskId"], entry["userId"], entry["durationMinutes"], entry["comment"])
+        groups.setdefault(key, Counter())[entry["workDate"]] += 1
+
+    operations = []
+    for (task_id, user_id, minutes, comment), days in groups.items():
+        fields = {"taskId": task_id, "userId": user_id, "durationMinutes": minutes, "comment": comment}
+        run = []
+
+        def flush():
+            if len(run) > 1:
+                operations.append({"kind": "range", **fields, "startDate": run[0], "endDate": run[-1], "days": len(run)})
+            elif run:
+                operations.append({"kind": "date", **fields, "workDate": run[0]})
+            run.clear()
+
+        for day in sorted(days):
+            # A range covers each day once: repeated entries and, in workday mode, weekend entries go one by one.
+            operations.extend({"kind": "date", **fields, "workDate": day} for _ in range(days[day] - 1))
+            if workdays_only and day.weekday() not in WORKDAYS:
+                operations.append({"kind": "date", **fields, "workDate": day})
+                continue
+            if run and day != _next_day(run[-1], workdays_only):
+                flush()
+            run.append(day)
+        flush()
+    return operations
+
+
+def _body(operation, **dates):
+    body = {"taskId": operation["taskId"], "durationMinutes": operation["durationMinutes"]}
+    if operation["userId"] is not None:
+        body["userId"] = operation["userId"]
+    if operation["comment"] is not None:
+        body["comment"] = operation["comment"]
+    body.update({key: value.isoformat() for key, value in dates.items()})
+    return body
+
+
+def _range_days(operation, workdays_only):
+    day = operation["startDate"]
+    days = [day]
+    while day < operation["endDate"]:
+        day = _next_day(day, workdays_only)
+        days.append(day)
+    return days
+
+
+def _rejected(error):
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status is not None and 400 <= status < 500
+
+
+def execute_import(api, operations, max_workers=8, workdays_only=True):
+    def create(operation):
+        if operation["kind"] == "range":
+            body = _body(operation, **{RANGE_START_KEY: operation["startDate"], RANGE_END_KEY: operation["endDate"]})
+            return api.call_by_python_method(RANGE_COMMAND, body=body)
+        return api.call_by_python_method(DATE_COMMAND, body=_body(operation, **{DATE_KEY: operation["workDate"]}))
+
+    results = []
+    range_operations = [operation for operation in operations if operation["kind"] == "range"]
+    date_operations = [operation for operation in operations if operation["kind"] == "date"]
+    stats = {"rangeCalls": len(range_operations), "dateCalls": 0, "rangeFallbacks": 0, "rangeUnknown": 0}
+
+    for operation, _, error in run_concurrently(create, range_operations, max_workers):
+        if error is None:
+            results.append({**operation, "ok": True})
+            continue
+        if not _rejected(error):
+            # After a timeout, a dropped connection or a 5xx the range may already be booked; retrying it day by
+            # day could book the hours twice, so the row is reported for a manual check instead.
+            stats["rangeUnknown"] += 1
+            results.append({**operation, "ok": False, "error": describe_error(error), "outcomeUnknown": True})
+            continue
+        # A rejected range is retried day by day so the entries still get created.
+        stats["rangeFallbacks"] += 1
+        results.append({**operation, "ok": False, "error": describe_error(error), "retriedPerDate": True})
+        fields = {key: operation[key] for key in ("taskId", "userId", "durationMinutes", "comment")}
+        date_operations.extend(
+            {"kind": "date", **fields, "workDate": day} for day in _range_days(operation, workdays_only)
+        )
+
+    stats["dateCalls"] = len(date_operations)
+    for operation, _, error in run_concurrently(create, date_operations, max_workers):
+        result = {**operation, "ok": error is None}
+        if error is not None:
+            result["error"] = describe_error(error)
+        results.append(result)
+    return results, stats
+
+
+def _serializable(operation):
+    return {key: value.isoformat() if isinstance(value, date) else value for key, value in operation.items()}
+
+
+def configure_parser(parser):
+    parser.add_argument(
+        "input",
+        help="JSON array, NDJSON or CSV file of time entries (taskId, userId, workDate, durationMinutes or hours, "
+        "comment); - for stdin",
+    )
+    parser.add_argument(
+        "--calendar-days",
+        action="store_true",
+        help="Merge only calendar-consecutive days, for servers whose ranges include weekends",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Print the planned calls without sending them")
+
+
+def run(api, args):
+    entries = collect_entries(read_records(args.input))
+    workdays_only = not args.calendar_days
+    operations = plan_import(entries, workdays_only=workdays_only)
+    if args.dry_run:
+        write_ndjson(_serializable(operation) for operation in operations)
+        return 0
+
+    results, stats = execute_import(api, operations, max_workers=args.workers, workdays_only=workdays_only)
+    write_ndjson(_serializable(result) for result in results)
+    failed = sum(1 for result in results if not result["ok"] and not result.get("retriedPerDate"))
+    print(json.dumps({"entries": len(entries), "failedCalls": failed, **stats}), file=sys.stderr)
+    return 1 if failed else 0
@@ -0,0 +1,62 @@
+import importlib.util
+import json
+import unittest
+from pathlib import Path
+from urllib import request as urllib_request
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "benchmarks" / "erp_stand_in.py"
+
+
+def load_stand_in_module():
+    spec = importlib.util.spec_from_file_location("erp_stand_in_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class StandInServerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_stand_in_module()
+        cls.server = cls.module.StandInServer(config=cls.module.StandInConfig(rows=30, download_bytes=1024)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def get(self, path):
+        with urllib_request.urlopen(f"{self.server.base_url}{path}", timeout=5) as response:
+            return response.headers.get("Content-Type"), response.read()
+
+    def test_odata_collection_uses_pascal_case_model_fields_and_paging(self):
+        _, body = self.get("/tasktracker/odata/Task?projectId=1&%24top=5&%24skip=10")
+        rows = json.loads(body)["value"]
+        self.assertEqual([11, 12, 13, 14, 15], [row["ID"] for row in rows])
+        self.assertIn("MilestoneId", rows[0])
+        self.assertEqual({"ID", "Hidden", "Title", "BackgroundColor", "TaskStatus"}, set(rows[0]["Labels"][0]))
+
+    def test_count_endpoint_returns_row_total(self):
+        _, body = self.get("/tasktracker/odata/Task/$count?projectId=1")
+        self.assertEqual(b"30", body)
+
+    def test_rest_item_endpoint_uses_path_id_and_camel_case(self):
+        _, body = self.get("/tasktracker/Task/query/Get/7")
+        row = json.loads(body)
+        self.assertEqual(7, row["id"])
+        self.assertIn(row["state"], (10, 20))
+
+    def test_binary_endpoint_serves_download_payload(self):
+        content_type, body = self.get("/files/files/download?drive_id=1&item_id=1")
+        self.assertEqual("application/octet-stream", content_type)
+        self.assertEqual(1024, len(body))
+
+    def test_calendar_rows_are_based_on_observed_sample(self):
+        _, body = self.get("/calendar/event/3")
+        self.assertEqual(3, json.loads(body)["ID"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import importlib.util
+import subprocess
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "metrics.py"
+
+
+def load_metrics_module():
+    fake_requests_module = types.ModuleType("requests")
+    fake_requests_module.add_trace_hook = lambda hook: None
+    sys.modules["requests"] = fake_requests_module
+
+    spec = importlib.util.spec_from_file_location("metrics_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_trace(name, status_code=200, elapsed=0.02, request_bytes=0, response_bytes=100, error=None):
+    return types.SimpleNamespace(
+        name=name,
+        status_code=status_code,
+        elapsed=elapsed,
+        request_bytes=request_bytes,
+        response_bytes=response_bytes,
+        error=error,
+    )
+
+
+class MetricsRegistryTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_metrics_module()
+
+    def test_render_counts_requests_per_method_and_status(self):
+        registry = self.module.MetricsRegistry(buckets=(0.01, 0.1))
+        registry.record_trace(make_trace("odata_task", elapsed=0.005))
+        registry.record_trace(make_trace("odata_task", elapsed=0.05, response_bytes=50))
+        registry.record_trace(make_trace("odata_task", status_code=None, error="Timeout: boom"))
+        registry.record_trace(make_trace("token", request_bytes=57))
+
+        lines = registry.render().splitlines()
+
+        self.assertIn('erp_client_requests_total{python_method="odata_task",status="200"} 2', lines)
+        self.assertIn('erp_client_requests_total{python_method="odata_task",status="error"} 1', lines)
+        self.assertIn('erp_client_response_bytes_total{python_method="odata_task"} 250', lines)
+        self.assertIn('erp_client_request_bytes_total{python_method="token"} 57', lines)
+        self.assertIn("erp_client_token_refreshes_total 1", lines)
+        self.assertIn(
+            'erp_client_request_duration_seconds_bucket{python_method="odata_task",status="200",le="0.01"} 1',
+            lines,
+        )
+        self.assertIn(
+            'erp_client_request_duration_seconds_bucket{python_method="odata_task",status="200",le="+Inf"} 2',
+            lines,
+        )
+        self.assertIn('erp_client_request_duration_seconds_count{python_method="odata_task",status="200"} 2', lines)
+        self.assertIn("# TYPE erp_client_request_duration_seconds histogram", lines)
+
+    def test_cache_lookups_are_labeled_by_result(self):
+        registry = self.module.MetricsRegistry()
+        registry.record_cache("metadata", hit=True)
+        registry.record_cache("metadata", hit=False)
+        registry.record_cache("metadata", hit=True)
+
+        lines = registry.render().splitlines()
+
+        self.assertIn('erp_client_cache_lookups_total{cache="metadata",result="hit"} 2', lines)
+        self.assertIn('erp_client_cache_lookups_total{cache="metadata",result="miss"} 1', lines)
+
+    def test_label_values_are_escaped(self):
+        registry = self.module.MetricsRegistry()
+        registry.record_cache('a"b\\c', hit=True)
+        self.assertIn('cache="a\\"b\\\\c"', registry.render())
+
+    def test_write_textfile_replaces_target_atomically(self):
+        registry = self.module.MetricsRegistry()
+        registry.record_trace(make_trace("odata_task"))
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "nested" / "erp.prom"
+            registry.write_textfile(target)
+            self.assertIn("erp_client_requests_total", target.read_text(encoding="utf-8"))
+            self.assertEqual([".erp.prom.lock", "erp.prom"], sorted(path.name for path in target.parent.iterdir()))
+
+    def test_textfile_accumulates_across_runs_without_double_counting(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "erp.prom"
+            first = self.module.MetricsRegistry(buckets=(0.01, 0.1))
+            first.record_trace(make_trace("odata_task", elapsed=0.005))
+            first.record_cache('a"b', hit=True)
+            first.write_textfile(target)
+            first.record_trace(make_trace("odata_task", elapsed=0.05))
+            first.write_textfile(target)
+            second = self.module.MetricsRegistry(buckets=(0.01, 0.1))
+            second.record_trace(make_trace("odata_task", elapsed=0.5))
+            second.record_cache('a"b', hit=True)
+            second.write_textfile(target)
+
+            lines = target.read_text(encoding="utf-8").splitlines()
+
+        self.assertIn('erp_client_requests_total{python_method="odata_task",status="200"} 3', lines)
+        self.assertIn('erp_client_response_bytes_total{python_method="odata_task"} 300', lines)
+        self.assertIn('erp_client_cache_lookups_total{cache="a\\"b",result="hit"} 2', lines)
+        self.assertIn('erp_client_request_duration_seconds_bucket{python_method="odata_task",status="200",le="0.01"} 1', lines)
+        self.assertIn('erp_client_request_duration_seconds_bucket{python_method="odata_task",status="200",le="0.1"} 2', lines)
+        self.assertIn('erp_client_request_duration_seconds_bucket{python_method="odata_task",status="200",le="+Inf"} 3', lines)
+        self.assertIn('erp_client_request_duration_seconds_count{python_method="odata_task",status="200"} 3', lines)
+
+    @unittest.skipIf(sys.platform == "win32", "flock is POSIX only")
+    def test_concurrent_processes_do_not_lose_counts(self):
+        script = (
+            "import sys, types\n"
+            "sys.modules['requests'] = types.SimpleNamespace(add_trace_hook=lambda hook: None)\n"
+            "import importlib.util\n"
+            f"spec = importlib.util.spec_from_file_location('metrics', {str(MODULE_PATH)!r})\n"
+            "module = importlib.util.module_from_spec(spec)\n"
+            "spec.loader.exec_module(module)\n"
+            "registry = module.MetricsRegistry()\n"
+            "for _ in range(50):\n"
+            "    registry.inc('erp_client_token_refreshes_total')\n"
+            "    registry.write_textfile(sys.argv[1])\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "erp.prom"
+            runs = [subprocess.Popen([sys.executable, "-c", script, str(target)]) for _ in range(4)]
+            self.assertEqual([0, 0, 0, 0], [run.wait() for run in runs])
+            lines = target.read_text(encoding="utf-8").splitlines()
+
+        self.assertIn("erp_client_token_refreshes_total 200", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "requests.py"
+
+
+def load_requests_shim_module():
+    spec = importlib.util.spec_from_file_location("requests_shim_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/oidc/connect/token":
+            body = json.dumps({"access_token": "live-secret", "expires_in": 3600}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RequestTraceTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_requests_shim_module()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _JsonHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.traces = []
+        self.module.add_trace_hook(self.traces.append)
+
+    def tearDown(self):
+        self.module.remove_trace_hook(self.traces.append)
+
+    def test_scope_records_phases_and_byte_counts(self):
+        with self.module.trace_scope("odata_task"):
+            response = self.module.request("GET", f"{self.base_url}/odata/Task", params={"$top": 1})
+            payload = response.json()
+
+        self.assertEqual("/odata/Task?%24top=1", payload["path"])
+        self.assertEqual(1, len(self.traces))
+        trace = self.traces[0]
+        self.assertEqual("odata_task", trace.name)
+        self.assertEqual("GET", trace.method)
+        self.assertEqual(200, trace.status_code)
+        self.assertEqual(len(response.content), trace.response_bytes)
+        for phase in ("dns", "connect", "ttfb", "download", "decode"):
+            self.assertIn(phase, trace.phases)
+        self.assertGreaterEqual(trace.elapsed, sum(trace.phases.values()) * 0.99)
+
+    def test_request_outside_scope_emits_its_own_trace(self):
+        response = self.module.post(f"{self.base_url}/token", data={"grant_type": "client_credentials"})
+
+        self.assertEqual(404, response.status_code)
+        self.assertEqual(1, len(self.traces))
+        self.assertEqual("POST /token", self.traces[0].name)
+        self.assertEqual(len(b"grant_type=client_credentials"), self.traces[0].request_bytes)
+        self.assertEqual(404, self.traces[0].as_dict()["statusCode"])
+
+    def test_failed_request_records_error(self):
+        with self.assertRaises(self.module.RequestException):
+            self.module.request("GET", "http://127.0.0.1:9/unreachable", timeout=1)
+
+        self.assertEqual(1, len(self.traces))
+        self.assertIn("RequestException", self.traces[0].error)
+
+
+class CassetteTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_requests_shim_module()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _JsonHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def tearDown(self):
+        self.module.use_cassette(None, None)
+
+    def test_fingerprint_normalizes_query_order_and_filter_whitespace(self):
+        first, _ = self.module.request_fingerprint(
+            "get",
+            "https://a.example/tasktracker/odata/Task?projectId=1&%24filter=State%20%20eq%2010%20and%20Title%20eq%20%27a%20%20b%27",
+        )
+        second, key = self.module.request_fingerprint(
+            "GET",
+            "https://b.example/tasktracker/odata/Task?%24filter=State%20eq%2010%20and%20Title%20eq%20%27a%20%20b%27&projectId=1",
+        )
+        third, _ = self.module.request_fingerprint(
+            "GET",
+            "https://b.example/tasktracker/odata/Task?%24filter=State%20eq%2010%20and%20Title%20eq%20%27a%20b%27&projectId=1",
+        )
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, third)
+        self.assertEqual(["$filter", "State eq 10 and Title eq 'a  b'"], list(key["query"][0]))
+
+    def test_fingerprint_ignores_client_credentials_in_token_body(self):
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        first, _ = self.module.request_fingerprint(
+            "POST", "https://id.example/oidc/connect/token", b"grant_type=client_credentials&client_id=a&client_secret=b", headers
+        )
+        second, _ = self.module.request_fingerprint(
+            "POST", "https://id.example/oidc/connect/token", b"client_secret=c&grant_type=client_credentials", headers
+        )
+        self.assertEqual(first, second)
+
+    def test_recorded_exchanges_replay_without_network_and_redact_tokens(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.module.use_cassette(tmp, "record")
+            token = self.module.post(f"{self.base_url}/oidc/connect/token", data={"client_secret": "s"})
+            recorded = self.module.request("GET", f"{self.base_url}/odata/Task", params={"$top": 2})
+            self.assertEqual("live-secret", token.json()["access_token"])
+
+            self.module.use_cassette(tmp, "replay")
+            replayed = self.module.request("GET", "http://127.0.0.1:9/odata/Task", params={"$top": 2})
+            replayed_token = self.module.post("http://127.0.0.1:9/oidc/connect/token", data={"client_secret": "x"})
+
+            self.assertEqual(recorded.content, replayed.content)
+            self.assertEqual(200, replayed.status_code)
+            self.assertEqual("replayed-secret", replayed_token.json()["access_token"])
+            with self.assertRaises(self.module.RequestException):
+                self.module.request("GET", "http://127.0.0.1:9/odata/Task", params={"$top": 3})
+
+    def test_index_is_written_on_close_and_rerecording_drops_stale_responses(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cassette = self.module.use_cassette(tmp, "record")
+            for _ in range(3):
+                self.module.request("GET", f"{self.base_url}/odata/Task", params={"$top": 2})
+            self.assertFalse(os.path.exists(cassette.index_path))
+            cassette.close()
+            self.assertEqual(3, len(os.listdir(os.path.join(tmp, "responses"))))
+
+            self.module.use_cassette(tmp, "record")
+            self.module.request("GET", f"{self.base_url}/odata/Task", params={"$top": 2})
+            self.module.use_cassette(None, None)
+
+            with open(cassette.index_path, encoding="utf-8") as handle:
+                (entry,) = json.load(handle).values()
+            self.assertEqual(1, len(entry["responses"]))
+            self.assertEqual([os.path.basename(entry["responses"][0])], os.listdir(os.path.join(tmp, "responses")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import importlib.util
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_blocking_graph.py"
+
+
+def load_tasktracker_blocking_graph_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_blocking_graph_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeAPI:
+    def __init__(self, blockers, closed=()):
+        self.blockers = blockers
+        self.closed = set(closed)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def call_by_python_method(self, python_method, task_id):
+        with self._lock:
+            self.calls.append((python_method, task_id))
+        if task_id == "boom":
+            raise RuntimeError("down")
+        return [
+            {"id": blocker, "title": f"Task {blocker}", "state": 20 if blocker in self.closed else 10}
+            for blocker in self.blockers.get(task_id, [])
+        ]
+
+
+class BlockingGraphTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_blocking_graph_module()
+
+    def test_each_task_is_fetched_once_per_level(self):
+        api = _FakeAPI({1: [2, 3], 2: [4], 3: [4], 4: [5]})
+
+        graph = self.module.blocking_graph(api, [1], max_workers=4)
+
+        self.assertEqual([1, 2, 3, 4, 5], sorted(task_id for _, task_id in api.calls))
+        self.assertEqual(4, graph["metrics"]["roundTrips"])
+        self.assertEqual({"1": 0, "2": 1, "3": 1, "4": 2, "5": 3}, {key: node["depth"] for key, node in graph["nodes"].items()})
+        self.assertEqual([1, 2, 4, 5], graph["criticalPath"])
+        self.assertEqual([], graph["cycles"])
+
+    def test_cycles_are_reported_and_collapsed_on_the_critical_path(self):
+        api = _FakeAPI({1: [2], 2: [3], 3: [2, 4]})
+
+        graph = self.module.blocking_graph(api, [1])
+
+        self.assertEqual([[2, 3]], graph["cycles"])
+        self.assertEqual([1, 2, 3, 4], graph["criticalPath"])
+        self.assertEqual(1, graph["metrics"]["cycles"])
+
+    def test_limits_and_closed_blockers(self):
+        api = _FakeAPI({1: [2, 3], 2: [4], 3: [5]}, closed={3})
+
+        graph = self.module.blocking_graph(api, [1], max_depth=1, open_only=True)
+
+        self.assertEqual([2], graph["nodes"]["1"]["blockedBy"])
+        self.assertEqual({"1", "2"}, set(graph["nodes"]))
+        self.assertEqual([1], [task_id for _, task_id in api.calls])
+
+    def test_blockers_past_the_node_cap_become_truncated_stubs(self):
+        api = _FakeAPI({1: [2, 3, 4], 2: [5]})
+
+        graph = self.module.blocking_graph(api, [1], max_nodes=3)
+
+        self.assertEqual([2, 3, 4], graph["nodes"]["1"]["blockedBy"])
+        self.assertEqual({"depth": 1, "blockedBy": [], "truncated": True, "title": "Task 4", "state": 10}, graph["nodes"]["4"])
+        self.assertEqual({"depth": 2, "blockedBy": [], "truncated": True, "title": "Task 5", "state": 10}, graph["nodes"]["5"])
+        self.assertNotIn("truncated", graph["nodes"]["2"])
+        targets = {target for node in graph["nodes"].values() for target in node["blockedBy"]}
+        self.assertTrue({str(target) for target in targets} <= set(graph["nodes"]))
+        self.assertEqual((True, 2), (graph["metrics"]["truncated"], graph["metrics"]["truncatedNodes"]))
+        self.assertNotIn(4, [task_id for _, task_id in api.calls])
+
+    def test_failed_fetches_are_reported(self):
+        api = _FakeAPI({1: ["boom"]})
+
+        graph = self.module.blocking_graph(api, [1])
+
+        self.assertEqual({"boom": "RuntimeError: down"}, graph["errors"])
+
+    def test_wrapped_and_scalar_responses(self):
+        self.assertEqual([{"ID": 3}], self.module.blocking_rows({"value": [{"ID": 3}, {"name": "x"}]}))
+        self.assertEqual([7, 8], self.module.blocking_rows([7, 8]))
+
+
+if __name__ == "__main__":
+    unittest.main()
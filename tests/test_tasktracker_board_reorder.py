@@ -0,0 +1,114 @@
+import importlib.util
+import io
+import random
+import sys
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_board_reorder.py"
+
+
+def load_tasktracker_board_reorder_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_board_reorder_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def apply_positions(current_ids, moves):
+    board = list(current_ids)
+    for move in moves:
+        board.remove(move["taskId"])
+        board.insert(move["position"], move["taskId"])
+    return board
+
+
+class _FakeAPI:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def call_by_python_method(self, python_method, *args, odata_params=None, fields=None, **kwargs):
+        self.calls.append((python_method, args, kwargs))
+        if python_method.startswith("odata_"):
+            skip = odata_params["$skip"]
+            return {"value": self.rows[skip:skip + odata_params["$top"]]}
+        return None
+
+
+class PlanMovesTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_board_reorder_module()
+
+    def test_longest_increasing_subsequence_indexes(self):
+        self.assertEqual([1, 2, 4], self.module.longest_increasing_subsequence([3, 0, 1, 0, 2]))
+
+    def test_only_tasks_outside_the_lis_move(self):
+        moves = self.module.plan_moves([4, 3, 1, 2], [1, 2, 3, 4])
+
+        self.assertEqual([3, 4], [move["taskId"] for move in moves])
+        self.assertEqual([1, 2, 3, 4], apply_positions([4, 3, 1, 2], moves))
+
+    def test_random_permutations_reach_target(self):
+        generator = random.Random(7)
+        for _ in range(50):
+            current = list(range(30))
+            target = current[:]
+            generator.shuffle(current)
+            generator.shuffle(target)
+
+            moves = self.module.plan_moves(current, target)
+
+            self.assertEqual(target, apply_positions(current, moves))
+            ranks = [target.index(task_id) for task_id in current]
+            self.assertEqual(len(current) - len(self.module.longest_increasing_subsequence(ranks)), len(moves))
+
+    def test_partial_target_keeps_unlisted_tasks_at_the_end(self):
+        moves = self.module.plan_moves([1, 2, 3, 4], [3])
+
+        self.assertEqual([3, 1, 2, 4], apply_positions([1, 2, 3, 4], moves))
+        self.assertEqual(1, len(moves))
+
+
+class BoardReorderTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_board_reorder_module()
+
+    def test_order_by_sorts_with_missing_values_last(self):
+        rows = [{"ID": 1, "Weight": None}, {"ID": 2, "Weight": 3}, {"ID": 3, "Weight": 5}]
+
+        self.assertEqual([3, 2, 1], [row["ID"] for row in self.module.sort_rows(rows, "Weight desc")])
+
+    def test_order_by_fields_are_corrected_or_rejected(self):
+        hints = io.StringIO()
+        with redirect_stderr(hints):
+            self.assertEqual("DueDate desc,Weight", self.module.resolve_order_by("labeled", "dueDate desc,weight"))
+
+        self.assertIn("field dueDate was sent as DueDate", hints.getvalue())
+        with self.assertRaisesRegex(ValueError, "Unknown field 'Nope'"):
+            self.module.resolve_order_by("system", "Nope")
+
+    def test_moves_are_sent_with_list_and_position(self):
+        api = _FakeAPI([{"ID": 1, "Weight": 1}, {"ID": 2, "Weight": 2}, {"ID": 3, "Weight": 3}])
+
+        current_ids, target_ids = self.module.load_list(api, "labeled", 9, order_by="Weight desc")
+        results = self.module.apply_moves(api, "labeled", 9, self.module.plan_moves(current_ids, target_ids))
+
+        self.assertEqual(2, len(results))
+        self.assertEqual({"board_list_id": 9}, api.calls[0][2])
+        self.assertEqual(
+            ("patch_board_list_command_change_position_in_labeled_list_task_id", (2,), {"body": {"boardListId": 9, "position": 2}}),
+            api.calls[1],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
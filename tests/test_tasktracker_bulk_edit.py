@@ -0,0 +1,113 @@
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_bulk_edit.py"
+
+
+def load_tasktracker_bulk_edit_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_bulk_edit_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeAPI:
+    def __init__(self, reject_bulk=False):
+        self.calls = []
+        self.reject_bulk = reject_bulk
+
+    def call_by_python_method(self, python_method, *args, **kwargs):
+        self.calls.append((python_method, args, kwargs))
+        if python_method == "patch_task_command_bulk_edit" and self.reject_bulk:
+            raise RuntimeError("HTTP 400")
+        return None
+
+
+class PlanBulkEditTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_bulk_edit_module()
+
+    def test_identical_change_sets_share_chunked_bulk_calls(self):
+        changes = self.module.collect_changes(
+            [{"taskId": task_id, "sprintId": 5, "labelIds": [2, 1]} for task_id in range(1, 6)]
+        )
+
+        operations = self.module.plan_bulk_edit(changes, chunk_size=2)
+
+        self.assertEqual(3, len(operations))
+        self.assertEqual({"sprintId": 5, "labelIds": [1, 2]}, operations[0]["changes"])
+        self.assertEqual([1, 2], operations[0]["taskIds"])
+
+    def test_shared_field_values_are_split_out_when_cheaper(self):
+        records = [
+            {"taskId": task_id, "sprintId": task_id % 3, "milestoneId": task_id // 3}
+            for task_id in range(9)
+        ]
+
+        operations = self.module.plan_bulk_edit(self.module.collect_changes(records))
+
+        self.assertEqual(6, len(operations))
+        self.assertIn({"kind": "bulk", "taskIds": [0, 3, 6], "changes": {"sprintId": 0}}, operations)
+
+    def test_fields_without_bulk_support_become_task_commands(self):
+        changes = self.module.collect_changes([{"id": 7, "title": "New", "state": "closed"}])
+
+        operations = self.module.plan_bulk_edit(changes)
+
+        self.assertEqual(
+            [
+                {"kind": "task", "taskId": 7, "field": "title", "value": "New"},
+                {"kind": "task", "taskId": 7, "field": "state", "value": 20},
+            ],
+            operations,
+        )
+
+    def test_unknown_field_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.module.collect_changes([{"taskId": 1, "colour": "red"}])
+
+
+class ExecutePlanTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_bulk_edit_module()
+
+    def test_results_are_reported_per_task_and_field(self):
+        api = _FakeAPI()
+        changes = self.module.collect_changes([{"taskId": 1, "sprintId": 5, "state": 20}, {"taskId": 2, "sprintId": 5}])
+
+        results, stats = self.module.execute_plan(api, self.module.plan_bulk_edit(changes), max_workers=1)
+
+        self.assertEqual({"via": "bulk", "ok": True}, results[2]["sprintId"])
+        self.assertEqual({"via": "task", "ok": True}, results[1]["state"])
+        self.assertEqual(1, stats["bulkCalls"])
+        self.assertIn(
+            ("patch_task_command_bulk_edit", (), {"body": {"taskIds": [1, 2], "sprintId": 5}}),
+            api.calls,
+        )
+        self.assertIn(("patch_task_command_close_task_id", (1,), {}), api.calls)
+
+    def test_rejected_bulk_edit_falls_back_to_task_commands(self):
+        api = _FakeAPI(reject_bulk=True)
+        changes = self.module.collect_changes([{"taskId": 1, "labelIds": [3]}, {"taskId": 2, "labelIds": [3]}])
+
+        results, stats = self.module.execute_plan(api, self.module.plan_bulk_edit(changes), max_workers=2)
+
+        self.assertEqual(1, stats["bulkFallbacks"])
+        self.assertEqual({"via": "task", "ok": True}, results[1]["labelIds"])
+        self.assertIn(
+            ("patch_task_command_change_labels_task_id", (2,), {"body": {"labelIds": [3]}}),
+            api.calls,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
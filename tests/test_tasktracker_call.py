@@ -3,8 +3,9 @@ import io
 import sys
 import types
 import unittest
-from contextlib import redirect_stderr
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
+from unittest import mock
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -21,6 +22,8 @@ def load_tasktracker_call_module():
     fake_url_utils_module.get_project_id_from_url = lambda value: value
     fake_url_utils_module.get_task_id_from_url = lambda value: value
     sys.modules["tasktracker_url_utils"] = fake_url_utils_module
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
 
     spec = importlib.util.spec_from_file_location("tasktracker_call_under_test", MODULE_PATH)
     module = importlib.util.module_from_spec(spec)
@@ -140,5 +143,58 @@ class ValidateODataUsageHintTests(unittest.TestCase):
         self.assertIn("PascalCase", stderr_output)
 
 
+class FieldsOptionTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_call_module()
+
+    def run_main(self, *argv):
+        calls = []
+
+        class _FakeAPI:
+            def call_by_python_method(self, python_method, *args, odata_params=None, fields=None, **kwargs):
+                calls.append((python_method, odata_params, fields))
+                return {"value": []}
+
+        stderr = io.StringIO()
+        with mock.patch.object(sys, "argv", ["api.py", *argv]), mock.patch.object(
+            sys.modules["tasktracker_api"], "TaskTrackerAPI", _FakeAPI
+        ), redirect_stdout(io.StringIO()), redirect_stderr(stderr):
+            self.module.main()
+        return calls, stderr.getvalue()
+
+    def test_fields_are_compiled_with_hints_before_the_call(self):
+        calls, stderr = self.run_main("-m", "odata_task", "--arg", "project_id=1", "--fields", "id,Title")
+
+        self.assertEqual([("odata_task", {"$filter": "Hidden eq false", "$select": "ID,Title"}, None)], calls)
+        self.assertIn("field id was sent as ID", stderr)
+
+    def test_fields_use_the_metadata_model_with_metadata_check(self):
+        model = self.module.normalize_odata_args.__globals__["model_for_method"]("odata_task")
+        with mock.patch.object(self.module, "load_metadata_model", return_value=model) as load_model, mock.patch.object(
+            self.module, "compile_output_fields", wraps=self.module.compile_output_fields
+        ) as compile_fields:
+            calls, _ = self.run_main("-m", "odata_task", "--arg", "project_id=1", "--fields", "ID", "--metadata-check")
+
+        load_model.assert_called_once()
+        self.assertIs(model, compile_fields.call_args.kwargs["model"])
+        self.assertEqual("ID", calls[0][1]["$select"])
+
+    def test_metadata_check_normalizes_before_the_pascal_case_hints(self):
+        model = self.module.normalize_odata_args.__globals__["model_for_method"]("odata_task")
+        with mock.patch.object(self.module, "load_metadata_model", return_value=model):
+            calls, stderr = self.run_main(
+                "-m", "odata_task", "--arg", "project_id=1", "--odata-arg", "$select=id,title", "--metadata-check"
+            )
+
+        self.assertEqual("ID,Title", calls[0][1]["$select"])
+        self.assertIn("field id was sent as ID", stderr)
+        self.assertNotIn("prefer $select=ID,Title,Labels", stderr)
+
+    def test_fields_are_rejected_for_count_methods(self):
+        with self.assertRaises(ValueError):
+            self.run_main("-m", "odata_task_count", "--arg", "project_id=1", "--fields", "ID")
+
+
 if __name__ == "__main__":
     unittest.main()
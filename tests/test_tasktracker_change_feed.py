@@ -0,0 +1,96 @@
+import importlib.util
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_change_feed.py"
+
+
+def load_tasktracker_change_feed_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_change_feed_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeAPI:
+    base_url = "https://erp.example/tasktracker"
+
+    def __init__(self):
+        self.history = {"odata_task_history": [], "odata_epic_history": []}
+        self.calls = []
+
+    def add(self, python_method, entry_id, entity_id, command="Close"):
+        key = "TaskId" if python_method == "odata_task_history" else "EpicId"
+        self.history[python_method].append({"ID": entry_id, key: entity_id, "CommandName": command})
+
+    def call_by_python_method(self, python_method, odata_params=None):
+        self.calls.append((python_method, dict(odata_params)))
+        rows = sorted(self.history[python_method], key=lambda row: row["ID"])
+        if odata_params.get("$orderby") == "ID desc":
+            return {"value": rows[-1:]}
+        after = int(re.fullmatch(r"ID gt (\d+)", odata_params["$filter"]).group(1))
+        return {"value": [row for row in rows if row["ID"] > after][:odata_params["$top"]]}
+
+
+class ChangeFeedTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_change_feed_module()
+
+    def test_new_cursor_starts_at_latest_entry_and_pages_by_id(self):
+        api = _FakeAPI()
+        api.add("odata_task_history", 5, 100)
+        with tempfile.TemporaryDirectory() as directory:
+            cursor_path = Path(directory) / "cursor.json"
+            feed = self.module.ChangeFeed(api, feeds=("task",), cursor_path=cursor_path, page_size=2)
+            self.assertEqual(([], []), feed.poll())
+            for entry_id in (6, 7, 8):
+                api.add("odata_task_history", entry_id, 100 + entry_id)
+
+            events, errors = feed.poll()
+            feed.acknowledge(events)
+            feed.save()
+            restored = self.module.ChangeFeed(api, feeds=("task",), cursor_path=cursor_path)
+
+        self.assertEqual([], errors)
+        self.assertEqual([6, 7, 8], [event["id"] for event in events])
+        self.assertEqual({"task": 8}, restored.cursor)
+        filters = [call[1]["$filter"] for call in api.calls if "$filter" in call[1]]
+        self.assertEqual(["ID gt 5", "ID gt 7"], filters)
+
+    def test_watch_backs_off_while_idle_and_coalesces(self):
+        api = _FakeAPI()
+        feed = self.module.ChangeFeed(api, from_start=True)
+        api.add("odata_task_history", 1, 100, "ChangeTitle")
+        api.add("odata_task_history", 2, 100, "Close")
+        api.add("odata_epic_history", 1, 200)
+        delivered = []
+        sleeps = []
+
+        polls = self.module.watch(feed, delivered.append, min_interval=1, max_interval=3, max_polls=4, sleep=sleeps.append)
+
+        self.assertEqual(4, polls)
+        self.assertEqual([1, 2, 3], sleeps)
+        self.assertEqual({"task": 2, "epic": 1}, feed.cursor)
+        merged = self.module.coalesce(delivered[0])
+        task_event = next(event for event in merged if event["feed"] == "task")
+        self.assertEqual((100, ["ChangeTitle", "Close"], 2), (task_event["entityId"], task_event["commands"], task_event["id"]))
+
+    def test_repeated_entries_are_dropped(self):
+        feed = self.module.ChangeFeed(_FakeAPI(), feeds=("task",))
+        event = {"feed": "task", "id": 3}
+
+        self.assertEqual([event], feed._fresh("task", [event]))
+        self.assertEqual([], feed._fresh("task", [event]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import importlib.util
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_count_matrix.py"
+
+
+def load_tasktracker_count_matrix_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_count_matrix_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeAPI:
+    base_url = "https://erp.example/tasktracker"
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def call_by_python_method(self, python_method, odata_params=None, project_id=None):
+        with self._lock:
+            self.calls.append((python_method, (odata_params or {}).get("$filter"), project_id))
+        if project_id == 3:
+            raise RuntimeError("forbidden")
+        return str(project_id * 100 + len(self.calls))
+
+
+class CountMatrixTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_count_matrix_module()
+
+    def test_filter_specs(self):
+        self.assertEqual(("open", "epic", "State eq 10"), self.module.parse_filter_spec("epic:open=State eq 10"))
+        self.assertEqual(("all", "task", ""), self.module.parse_filter_spec("all="))
+        self.assertEqual(("a:b", "task", "x"), self.module.parse_filter_spec("a:b=x"))
+        with self.assertRaises(ValueError):
+            self.module.parse_filter_spec("State eq 10")
+
+    def test_equivalent_filters_share_one_request(self):
+        api = _FakeAPI()
+        filters = [("open", "task", "State eq 10"), ("open2", "task", "state  eq 10"), ("epics", "epic", "")]
+
+        rows, errors, stats = self.module.count_matrix(api, [1, 2], filters, max_workers=4)
+
+        self.assertEqual({"cells": 6, "queries": 4, "requests": 4}, stats)
+        self.assertEqual([], errors)
+        self.assertEqual(["projectId", "open", "open2", "epics"], list(rows[0]))
+        self.assertEqual(rows[0]["open"], rows[0]["open2"])
+        self.assertIn(("odata_task_count", "(State eq 10) and Hidden eq false", 1), api.calls)
+        self.assertIn(("odata_epic_count", "Hidden eq false", 2), api.calls)
+
+    def test_errors_leave_empty_cells_and_cache_skips_requests(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filters = [("all", "task", "")]
+            first = _FakeAPI()
+            rows, errors, _ = self.module.count_matrix(
+                first, [1, 3], filters, cache=self.module.ResultCache("count-matrix", first.base_url, directory=directory)
+            )
+            second = _FakeAPI()
+            _, _, stats = self.module.count_matrix(
+                second, [1], filters, cache=self.module.ResultCache("count-matrix", second.base_url, directory=directory)
+            )
+
+        self.assertIsNone(rows[1]["all"])
+        self.assertEqual("RuntimeError: forbidden", errors[0]["error"])
+        self.assertEqual(0, stats["requests"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import importlib.util
+import io
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_epic_metrics.py"
+
+
+def load_tasktracker_epic_metrics_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_epic_metrics_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeAPI:
+    base_url = "https://erp.example/tasktracker"
+
+    def __init__(self, epics):
+        self.epics = epics
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def call_by_python_method(self, python_method, *args, odata_params=None, fields=None, **kwargs):
+        with self._lock:
+            self.calls.append((python_method, args, odata_params, kwargs))
+        if python_method == "odata_epic":
+            rows = self.epics.get(kwargs["project_id"], [])
+            return {"value": rows[odata_params["$skip"]:odata_params["$skip"] + odata_params["$top"]]}
+        if args[0] == 13:
+            raise RuntimeError("forbidden")
+        return {"progress": args[0] * 10, "tasks": {"open": 1, "closed": 2}}
+
+
+EPICS = {
+    1: [{"ID": 11, "Title": "A"}, {"ID": 12, "Title": "B"}],
+    2: [{"ID": 13, "Title": "C"}],
+}
+
+
+class EpicMetricsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_epic_metrics_module()
+
+    def test_dashboard_rows_and_errors(self):
+        api = _FakeAPI(EPICS)
+
+        rows, errors = self.module.dashboard(api, [1, 2], max_workers=4)
+
+        self.assertEqual([11, 12], [row["epicId"] for row in rows])
+        self.assertEqual({"projectId": 1, "epicId": 11, "title": "A", "dueDate": None, "progress": 110, "tasks.open": 1, "tasks.closed": 2}, rows[0])
+        self.assertEqual([{"projectId": 2, "epicId": 13, "ok": False, "error": "RuntimeError: forbidden"}], errors)
+        listing = [call for call in api.calls if call[0] == "odata_epic"]
+        self.assertTrue(all("State eq 10" in call[2]["$filter"] for call in listing))
+
+    def test_cached_metrics_skip_requests(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = _FakeAPI(EPICS)
+            self.module.dashboard(first, [1], cache=self.module.ResultCache("epic-metrics", first.base_url, directory=directory))
+            second = _FakeAPI(EPICS)
+
+            rows, _ = self.module.dashboard(second, [1], cache=self.module.ResultCache("epic-metrics", second.base_url, directory=directory))
+
+        self.assertEqual(2, len(rows))
+        self.assertEqual(["odata_epic"], [call[0] for call in second.calls])
+
+    def test_csv_output_uses_union_of_columns(self):
+        stream = io.StringIO()
+
+        self.module.write_csv([{"a": 1}, {"a": 2, "b": [1, 2]}], stream)
+
+        self.assertEqual("a,b\n1,\n2,\"[1, 2]\"\n", stream.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import importlib.util
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_epic_tree.py"
+
+
+def load_tasktracker_epic_tree_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_epic_tree_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeAPI:
+    def __init__(self, epics, tasks):
+        self.epics = epics
+        self.tasks = tasks
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def call_by_python_method(self, python_method, *args, odata_params=None, fields=None, **kwargs):
+        with self._lock:
+            self.calls.append((python_method, odata_params, kwargs))
+        rows = self.epics if python_method == "odata_epic" else self.tasks.get(kwargs["epic_id"], [])
+        skip = odata_params["$skip"]
+        return {"value": rows[skip:skip + odata_params["$top"]]}
+
+
+EPICS = [
+    {"ID": 1, "Title": "Platform", "State": 10, "ParentId": None, "RoadmapOrder": 2},
+    {"ID": 2, "Title": "Auth", "State": 10, "ParentId": 1, "RoadmapOrder": 1},
+    {"ID": 3, "Title": "Billing", "State": 20, "ParentId": 1, "RoadmapOrder": 0},
+    {"ID": 4, "Title": "SSO", "State": 10, "ParentId": 2, "RoadmapOrder": 0},
+    {"ID": 5, "Title": "Mobile", "State": 10, "ParentId": 99, "RoadmapOrder": 1},
+]
+TASKS = {
+    1: [{"ID": 10, "State": 10, "Weight": 1}],
+    3: [{"ID": 30, "State": 20, "Weight": 5}],
+    4: [{"ID": 40, "State": 10, "Weight": 2}, {"ID": 41, "State": 20, "Weight": None}],
+}
+
+
+class EpicTreeTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_epic_tree_module()
+
+    def test_tree_rows_are_preordered_with_subtree_rollups(self):
+        api = _FakeAPI(EPICS, TASKS)
+        epics = self.module.load_epics(api, 12)
+        rollups, errors = self.module.load_rollups(api, [epic["ID"] for epic in epics], max_workers=4)
+
+        rows = self.module.materialize(epics, rollups)
+
+        self.assertEqual({}, errors)
+        self.assertEqual([5, 1, 3, 2, 4], [row["epicId"] for row in rows])
+        self.assertEqual([None, None, 1, 1, 2], [row["parentId"] for row in rows])
+        self.assertEqual([0, 0, 1, 1, 2], [row["depth"] for row in rows])
+        platform = rows[1]
+        self.assertEqual({"tasks": 4, "openTasks": 2, "closedTasks": 2, "weight": 8, "openWeight": 3}, platform["subtree"])
+        self.assertEqual(1, platform["own"]["tasks"])
+        self.assertEqual({"project_id": 12}, api.calls[0][2])
+        self.assertEqual("ID,Title,State,ParentId,RoadmapOrder,StartDate,DueDate", api.calls[0][1]["$select"])
+
+    def test_parent_cycles_are_broken(self):
+        epics = [{"ID": 1, "ParentId": 2}, {"ID": 2, "ParentId": 1}, {"ID": 3, "ParentId": None}]
+
+        roots, children = self.module.build_tree(epics)
+
+        self.assertEqual([3, 1], roots)
+        self.assertEqual([2], children[1])
+        self.assertEqual([], children[2])
+
+    def test_descendants_of_a_cycle_stay_under_it(self):
+        epics = [{"ID": 5, "ParentId": 6}, {"ID": 6, "ParentId": 5}, {"ID": 1, "ParentId": 5}]
+
+        roots, children = self.module.build_tree(epics)
+
+        self.assertEqual([5], roots)
+        self.assertEqual([1, 6], sorted(children[5]))
+        self.assertEqual([], children[6])
+
+    def test_nested_output(self):
+        rows = self.module.materialize(EPICS[:3], {})
+
+        tree = self.module.nest(rows)
+
+        self.assertEqual([1], [node["epicId"] for node in tree])
+        self.assertEqual([3, 2], [child["epicId"] for child in tree[0]["children"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
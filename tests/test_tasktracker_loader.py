@@ -0,0 +1,115 @@
+import importlib.util
+import re
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_loader.py"
+
+
+def load_tasktracker_loader_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_loader_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeAPI:
+    def __init__(self, missing=()):
+        self.calls = []
+        self.missing = set(missing)
+
+    def call_by_python_method(self, python_method, *args, odata_params=None, fields=None, **kwargs):
+        self.calls.append((python_method, dict(odata_params), fields, kwargs))
+        ids = [int(value) for value in re.search(r"ID in \(([^)]*)\)", odata_params["$filter"]).group(1).split(",")]
+        return {"value": [{"ID": task_id, "Title": f"Task {task_id}"} for task_id in ids if task_id not in self.missing]}
+
+
+class ChunkIdsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_loader_module()
+
+    def test_chunks_respect_encoded_filter_length_and_batch_size(self):
+        ids = list(range(1000, 1300))
+
+        chunks = self.module.chunk_ids(ids, max_filter_length=200, max_batch_size=50)
+
+        self.assertEqual(ids, [key for chunk in chunks for key in chunk])
+        for chunk in chunks:
+            encoded = self.module.quote_plus(f"ID in ({','.join(map(str, chunk))})")
+            self.assertLessEqual(len(encoded), 200)
+            self.assertLessEqual(len(chunk), 50)
+
+
+class ODataLoaderTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_loader_module()
+
+    def test_batch_deduplicates_and_hands_back_rows_per_requester(self):
+        api = _FakeAPI()
+        loader = self.module.ODataLoader(api, "odata_task", project_id=7, max_batch_size=2, max_workers=1)
+
+        with loader.batch():
+            first = loader.load(1)
+            second = loader.load_many([2, 1, 3])
+
+        self.assertEqual("Task 1", first.result()["Title"])
+        self.assertEqual([2, 1, 3], [future.result()["ID"] for future in second])
+        self.assertIs(first, second[1])
+        self.assertEqual(2, loader.round_trips)
+        self.assertEqual({"project_id": 7}, api.calls[0][3])
+        self.assertEqual("ID in (1,2)", api.calls[0][1]["$filter"])
+
+    def test_results_are_memoized_and_result_dispatches_pending_keys(self):
+        api = _FakeAPI()
+        loader = self.module.ODataLoader(api, "odata_epic", project_id=1)
+
+        self.assertEqual(5, loader.load(5).result()["ID"])
+        self.assertEqual(5, loader.load(5).result()["ID"])
+        self.assertEqual(1, len(api.calls))
+
+    def test_missing_ids_fail_only_their_own_futures(self):
+        loader = self.module.ODataLoader(_FakeAPI(missing={2}), "odata_task", project_id=1)
+
+        found, missing = loader.load_many([1, 2])
+
+        self.assertEqual(1, found.result()["ID"])
+        self.assertIsInstance(missing.exception(), LookupError)
+
+    def test_extra_filter_and_fields_are_sent_with_each_chunk(self):
+        api = _FakeAPI()
+        loader = self.module.ODataLoader(api, "odata_task", fields="Title", odata_filter="State eq 10", project_id=1)
+
+        loader.load(4).result()
+
+        _, odata_params, fields, _ = api.calls[0]
+        self.assertEqual("(State eq 10) and ID in (4)", odata_params["$filter"])
+        self.assertEqual(["ID", "Title"], fields)
+
+    def test_prime_during_an_in_flight_batch_keeps_the_primed_row(self):
+        api = _FakeAPI()
+        loader = self.module.ODataLoader(api, "odata_task", project_id=1)
+        primed = {"ID": 3, "Title": "primed"}
+        fetch = api.call_by_python_method
+
+        def prime_then_fetch(*args, **kwargs):
+            loader.prime(3, primed)
+            return fetch(*args, **kwargs)
+
+        api.call_by_python_method = prime_then_fetch
+        futures = loader.load_many([3, 4])
+
+        loader.dispatch()
+
+        self.assertEqual([primed, {"ID": 4, "Title": "Task 4"}], [future.result() for future in futures])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import importlib.util
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_metadata.py"
+
+CSDL = b"""<?xml version="1.0" encoding="utf-8"?>
+<edmx:Edmx Version="4.0" xmlns:edmx="http://docs.oasis-open.org/odata/ns/edmx">
+  <edmx:DataServices>
+    <Schema Namespace="Visary.TaskTracker" xmlns="http://docs.oasis-open.org/odata/ns/edm">
+      <EntityType Name="Entry" Abstract="true">
+        <Key><PropertyRef Name="ID" /></Key>
+        <Property Name="ID" Type="Edm.Int32" Nullable="false" />
+        <Property Name="Hidden" Type="Edm.Boolean" Nullable="false" />
+      </EntityType>
+      <EntityType Name="Task" BaseType="Visary.TaskTracker.Entry">
+        <Property Name="Title" Type="Edm.String" />
+        <Property Name="State" Type="Visary.TaskTracker.EntryState" Nullable="false" />
+        <NavigationProperty Name="Labels" Type="Collection(Visary.TaskTracker.Label)" />
+      </EntityType>
+      <EntityType Name="Label">
+        <Key><PropertyRef Name="ID" /></Key>
+        <Property Name="ID" Type="Edm.Int32" Nullable="false" />
+        <Property Name="Title" Type="Edm.String" />
+      </EntityType>
+      <EnumType Name="EntryState">
+        <Member Name="Open" Value="10" />
+        <Member Name="Closed" Value="20" />
+      </EnumType>
+      <EntityContainer Name="Container">
+        <EntitySet Name="Task" EntityType="Visary.TaskTracker.Task" />
+      </EntityContainer>
+    </Schema>
+  </edmx:DataServices>
+</edmx:Edmx>
+"""
+
+
+def load_tasktracker_metadata_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_metadata_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeAPI:
+    base_url = "https://erp.example/tasktracker"
+
+    def __init__(self, etag='W/"1"'):
+        self.etag = etag
+        self.requested_etags = []
+
+    def get_odata_metadata_document(self, *, etag=None):
+        self.requested_etags.append(etag)
+        if etag is not None and etag == self.etag:
+            return types.SimpleNamespace(status_code=304, headers={}, content=b"")
+        return types.SimpleNamespace(status_code=200, headers={"etag": self.etag}, content=CSDL)
+
+
+class ParseCsdlTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_metadata_module()
+
+    def test_schema_contains_sets_inherited_properties_and_enums(self):
+        schema = self.module.parse_csdl(CSDL)
+
+        self.assertEqual("Visary.TaskTracker.Task", schema["entitySets"]["Task"])
+        task = schema["entityTypes"]["Visary.TaskTracker.Task"]
+        self.assertEqual(["ID"], task["key"])
+        self.assertIn("Hidden", task["properties"])
+        self.assertEqual("Collection(Visary.TaskTracker.Label)", task["navigationProperties"]["Labels"])
+        self.assertEqual({"Open": 10, "Closed": 20}, self.module.enum_values(schema, "EntryState"))
+
+    def test_metadata_model_checks_lambda_fields_and_expand_targets(self):
+        schema = self.module.parse_csdl(CSDL)
+        model = self.module.model_for_method(schema, "odata_task")
+        odata = sys.modules["tasktracker_odata"]
+
+        normalized, _ = odata.normalize_odata_args(
+            "odata_task",
+            {"$filter": "labels/any(l:l/title eq 'x')", "$expand": "Labels"},
+            model=model,
+        )
+        self.assertEqual("Labels/any(l:l/Title eq 'x')", normalized["$filter"])
+        with self.assertRaises(odata.ODataFieldError):
+            odata.normalize_odata_args("odata_task", {"$expand": "Title"}, model=model)
+
+
+class LoadSchemaTests(unittest.TestCase):
+    def setUp(self):
+        self.module = load_tasktracker_metadata_module()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_schema_is_fetched_once_per_process_and_cached_on_disk(self):
+        api = _FakeAPI()
+        cache = self.module.MetadataCache(self.tmp.name)
+
+        first = self.module.load_schema(api, cache=cache)
+        second = self.module.load_schema(api, cache=cache)
+
+        self.assertIs(first, second)
+        self.assertEqual([None], api.requested_etags)
+        self.assertEqual('W/"1"', cache.read(api.base_url)["etag"])
+
+    def test_stale_cache_revalidates_with_etag(self):
+        api = _FakeAPI()
+        self.module.load_schema(api, cache=self.module.MetadataCache(self.tmp.name))
+
+        fresh_module = load_tasktracker_metadata_module()
+        schema = fresh_module.load_schema(api, cache=fresh_module.MetadataCache(self.tmp.name, ttl=0))
+
+        self.assertEqual([None, 'W/"1"'], api.requested_etags)
+        self.assertIn("Task", schema["entitySets"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import importlib.util
+import io
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_odata.py"
+
+
+def load_tasktracker_odata_module():
+    spec = importlib.util.spec_from_file_location("tasktracker_odata_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class ParseFilterTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_odata_module()
+
+    def test_round_trip_keeps_grouping_and_literals(self):
+        for text in (
+            "(State eq 10 or State eq 20) and Hidden eq false",
+            "Labels/any(l:l/Title eq 'It''s')",
+            "ID in (1,2,3) and not contains(Title,'bug')",
+            "UpdatedAt ge 2026-01-01T00:00:00Z",
+            "Labels/any()",
+        ):
+            self.assertEqual(text, self.module.to_odata(self.module.parse_filter(text)))
+
+    def test_operator_precedence_builds_nested_nodes(self):
+        expression = self.module.parse_filter("State eq 10 or State eq 20 and Hidden eq false")
+
+        self.assertEqual("or", expression.operator)
+        self.assertEqual("and", expression.right.operator)
+
+    def test_syntax_error_reports_position(self):
+        with self.assertRaises(self.module.ODataSyntaxError) as raised:
+            self.module.parse_filter("State eq 10 and")
+
+        self.assertEqual(15, raised.exception.position)
+
+    def test_parsed_expressions_are_cached(self):
+        self.assertIs(self.module.parse_filter("State eq 10"), self.module.parse_filter("State eq 10"))
+
+
+class InjectHiddenFilterTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_odata_module()
+
+    def test_existing_hidden_conjunct_is_kept_as_is(self):
+        self.assertEqual(
+            "State eq 10 and Hidden eq false",
+            self.module.inject_hidden_filter("State eq 10 and Hidden eq false"),
+        )
+
+    def test_hidden_inside_or_branch_still_gets_wrapped(self):
+        self.assertEqual(
+            "(State eq 10 or Hidden eq false) and Hidden eq false",
+            self.module.inject_hidden_filter("State eq 10 or Hidden eq false"),
+        )
+
+
+class NormalizeODataArgsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_odata_module()
+
+    def test_camelcase_fields_are_corrected_including_lambda_and_expand(self):
+        normalized, corrections = self.module.normalize_odata_args(
+            "odata_task",
+            {
+                "$filter": "labels/any(l:l/title eq 'x') and state eq 10",
+                "$orderby": "id desc",
+                "$select": "id,title",
+                "$expand": "labels($select=title)",
+                "$top": 5,
+            },
+        )
+
+        self.assertEqual("Labels/any(l:l/Title eq 'x') and State eq 10", normalized["$filter"])
+        self.assertEqual("ID desc", normalized["$orderby"])
+        self.assertEqual("ID,Title", normalized["$select"])
+        self.assertEqual("Labels($select=Title)", normalized["$expand"])
+        self.assertEqual(5, normalized["$top"])
+        self.assertIn(("state", "State"), corrections)
+
+    def test_correct_expression_text_is_left_untouched(self):
+        normalized, corrections = self.module.normalize_odata_args(
+            "odata_task",
+            {"$filter": "contains(Title, 'bug')"},
+        )
+
+        self.assertEqual("contains(Title, 'bug')", normalized["$filter"])
+        self.assertEqual([], corrections)
+
+    def test_unknown_field_raises_unless_validation_is_skipped(self):
+        with self.assertRaises(self.module.ODataFieldError):
+            self.module.normalize_odata_args("odata_task", {"$filter": "Statsu eq 10"})
+
+        normalized, _ = self.module.normalize_odata_args(
+            "odata_task",
+            {"$filter": "Statsu eq 10"},
+            validate_fields=False,
+        )
+        self.assertEqual("Statsu eq 10", normalized["$filter"])
+
+    def test_count_method_uses_collection_model(self):
+        model = self.module.model_for_method("odata_label_for_task_registry_count")
+
+        self.assertIn("Title", model.fields)
+
+
+class FieldsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_odata_module()
+
+    def test_fields_compile_to_select_and_nested_expand(self):
+        odata_args, corrections = self.module.compile_fields("odata_task", "id,Title,labels/title,Labels/ID")
+
+        self.assertEqual(
+            {"$select": "ID,Title,Labels", "$expand": "Labels($select=Title,ID)"},
+            odata_args,
+        )
+        self.assertIn(("labels", "Labels"), corrections)
+
+    def test_navigation_field_without_subfields_is_expanded_whole(self):
+        odata_args, _ = self.module.compile_fields("odata_task", ["ID", "Assignees"])
+
+        self.assertEqual({"$select": "ID,Assignees", "$expand": "Assignees"}, odata_args)
+
+    def test_unknown_field_is_rejected(self):
+        with self.assertRaises(self.module.ODataFieldError):
+            self.module.compile_fields("odata_task", "ID,Descripton")
+
+    def test_output_fields_report_corrections_and_reject_count_methods(self):
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            odata_args, fields = self.module.compile_output_fields("odata_task", "id,Title", {"$top": 5})
+
+        self.assertEqual(({"$top": 5, "$select": "ID,Title"}, None), (odata_args, fields))
+        self.assertIn("field id was sent as ID", stderr.getvalue())
+        self.assertEqual(({}, "id"), self.module.compile_output_fields("get_task_query_get_task_id", "id", {}))
+        with self.assertRaises(ValueError):
+            self.module.compile_output_fields("odata_task_count", "ID", {})
+        with self.assertRaises(ValueError):
+            self.module.compile_output_fields("odata_task", "ID", {"$select": "Title"})
+
+    def test_projection_keeps_requested_keys_case_insensitively(self):
+        payload = {
+            "@odata.context": "$metadata#Task",
+            "value": [{"ID": 1, "Title": "a", "Labels": [{"ID": 2, "Title": "b"}], "Weight": 3}],
+        }
+
+        self.assertEqual(
+            {"@odata.context": "$metadata#Task", "value": [{"ID": 1, "Labels": [{"Title": "b"}]}]},
+            self.module.project_fields(payload, "id,labels/title"),
+        )
+        self.assertEqual([{"id": 1, "title": "a"}], self.module.project_fields([{"id": 1, "title": "a", "x": 2}], "ID,Title"))
+
+
+if __name__ == "__main__":
+    unittest.main()
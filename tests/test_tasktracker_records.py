@@ -0,0 +1,94 @@
+import importlib.util
+import json
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_records.py"
+
+
+def load_tasktracker_records_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_records_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+LABEL = {"ID": 3, "Hidden": False, "Title": "bug", "BackgroundColor": "#ff0000", "TaskStatus": 10}
+PAGE = json.dumps(
+    {
+        "value": [
+            {
+                "ID": task_id,
+                "Hidden": False,
+                "Title": "Fix export",
+                "State": 10,
+                "AuthorId": 7,
+                "AuthorFullName": "Ivan Petrov",
+                "CreatedAt": "2026-10-01T09:00:00Z",
+                "SprintTitle": "Sprint 4",
+                "Assignees": [{"ID": 7, "FullName": "Ivan Petrov", "@odata.type": "User"}],
+                "Labels": [LABEL],
+            }
+            for task_id in (1, 2)
+        ]
+    }
+)
+
+
+class _FakeAPI:
+    def call_by_python_method(self, python_method, odata_params=None, **kwargs):
+        return {"value": json.loads(PAGE)["value"][odata_params["$skip"]:odata_params["$skip"] + odata_params["$top"]]}
+
+
+class RecordsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_records_module()
+
+    def test_task_rows_decode_into_slotted_records_with_shared_values(self):
+        decoder = self.module.RecordDecoder.for_method("odata_task")
+        first, second = decoder.decode_many(json.loads(PAGE)["value"])
+
+        self.assertEqual("TaskRecord", type(first).__name__)
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertEqual((1, "Fix export", 10, None), (first.ID, first["Title"], first.get("State"), first.Weight))
+        self.assertIsNone(first.get("Unknown"))
+        self.assertIs(first.Labels[0], second.Labels[0])
+        self.assertIs(first.Assignees[0], second.Assignees[0])
+        self.assertIs(first.AuthorFullName, second.AuthorFullName)
+        self.assertIs(first.AuthorFullName, first.Assignees[0].FullName)
+        self.assertIsNot(first.Title, second.Title)
+        self.assertEqual("LabelfortaskregistryRecord", type(first.Labels[0]).__name__)
+        self.assertEqual(LABEL, first.Labels[0].to_dict())
+        self.assertEqual([{"ID": 7, "FullName": "Ivan Petrov"}], first.to_dict()["Assignees"])
+
+    def test_rest_rows_use_camel_case_names(self):
+        record = self.module.RecordDecoder.for_method("odata_task").decode({"id": 5, "title": "REST", "labels": []})
+
+        self.assertEqual((5, "REST", ()), (record.ID, record.Title, record.Labels))
+
+    def test_iter_records_pages_through_the_api(self):
+        records = list(self.module.iter_records(_FakeAPI(), "odata_task", project_id=1))
+
+        self.assertEqual([1, 2], [record.ID for record in records])
+        with self.assertRaises(ValueError):
+            self.module.RecordDecoder.for_method("get_task")
+
+    def test_nested_keys_that_are_python_keywords(self):
+        decoder = self.module.RecordDecoder.for_method("odata_task")
+
+        record = decoder.decode({"ID": 1, "Assignees": [{"from": 3, "class": "lead", "None": None}]})
+
+        assignee = record.Assignees[0]
+        self.assertEqual((3, "lead", None), (assignee["from"], assignee["class"], assignee["None"]))
+        self.assertEqual([{"from": 3, "class": "lead", "None": None}], record.to_dict()["Assignees"])
+
+
+if __name__ == "__main__":
+    unittest.main()
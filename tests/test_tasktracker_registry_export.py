@@ -0,0 +1,193 @@
+import argparse
+import importlib.util
+import io
+import json
+import re
+import sys
+import threading
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_registry_export.py"
+TASK_METHOD = "odata_task_in_registry"
+
+
+def load_tasktracker_registry_export_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_registry_export_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def task(task_id, project_id, sprint_id=None, labels=()):
+    return {
+        "ID": task_id,
+        "Title": f"Task {task_id}",
+        "ProjectId": project_id,
+        "State": 10,
+        "SprintId": sprint_id,
+        "MilestoneId": None,
+        "EpicId": None,
+        "Weight": 3,
+        "Assignees": [{"ID": 7}],
+        "Labels": [{"ID": label} for label in labels],
+    }
+
+
+def make_rows():
+    return {
+        "odata_task_in_registry": [task(1, 1, sprint_id=4, labels=(3, 5)), task(2, 2), task(3, 1, labels=(9,)), task(4, 2)],
+        "odata_project_for_task_registry": [{"ID": 1, "Title": "ERP"}, {"ID": 2, "Title": "CRM"}],
+        "odata_milestone_for_task_registry": [],
+        "odata_sprint_for_task_registry": [{"ID": 4, "Title": "Sprint 4"}],
+        "odata_epic_for_task_registry": [],
+        "odata_label_for_task_registry": [
+            {"ID": 3, "Title": "bug", "BackgroundColor": "#f00"},
+            {"ID": 5, "Title": "ui", "BackgroundColor": "#0f0"},
+        ],
+    }
+
+
+class _FakeAPI:
+    def __init__(self, rows, on_page=None, on_lookup=None):
+        self.rows = rows
+        self.on_page = on_page
+        self.on_lookup = on_lookup
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def call_by_python_method(self, python_method, odata_params=None, fields=None, **kwargs):
+        with self._lock:
+            self.calls.append((python_method, dict(odata_params or {}), fields, kwargs))
+        odata_params = odata_params or {}
+        if python_method == "odata_task_in_registry_count":
+            return len(self.rows["odata_task_in_registry"])
+        rows = sorted(self.rows[python_method], key=lambda row: row.get("ID", 0))
+        if python_method != "odata_task_in_registry":
+            if self.on_lookup:
+                self.on_lookup()
+            return {"value": rows[odata_params["$skip"]:odata_params["$skip"] + odata_params["$top"]]}
+        filter_text = odata_params.get("$filter", "")
+        for operator, value in re.findall(r"ID (gt|le) (\d+)", filter_text):
+            rows = [row for row in rows if (row["ID"] > int(value) if operator == "gt" else row["ID"] <= int(value))]
+        if odata_params.get("$orderby") == "ID desc":
+            rows.reverse()
+        page = rows[:odata_params["$top"]]
+        if self.on_page and fields is not None:
+            self.on_page(filter_text)
+        return {"value": page}
+
+
+class _CappedAPI:
+    # Serves at most `cap` rows per page whatever $top asks for, with a nextLink while more rows match.
+    def __init__(self, count, cap):
+        self.rows = [{"ID": task_id} for task_id in range(1, count + 1)]
+        self.cap = cap
+
+    def call_by_python_method(self, python_method, odata_params=None, fields=None, **kwargs):
+        rows = self.rows
+        after = re.search(r"ID gt (\d+)", odata_params.get("$filter") or "")
+        if after:
+            rows = [row for row in rows if row["ID"] > int(after.group(1))]
+        rows = rows[odata_params.get("$skip", 0):]
+        page = {"value": rows[:min(odata_params["$top"], self.cap)]}
+        if len(rows) > len(page["value"]):
+            page["@odata.nextLink"] = "next"
+        return page
+
+
+class RegistryExportTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_registry_export_module()
+
+    def test_tasks_are_joined_with_lookup_titles(self):
+        api = _FakeAPI(make_rows())
+        stats = {}
+
+        rows = list(self.module.export_registry(api, stats=stats, kind="all"))
+
+        self.assertEqual([1, 2, 3, 4], [row["taskId"] for row in rows])
+        first = rows[0]
+        self.assertEqual(("ERP", "Sprint 4", None), (first["projectTitle"], first["sprintTitle"], first["milestoneTitle"]))
+        self.assertEqual(([3, 5], ["bug", "ui"], [7]), (first["labelIds"], first["labelTitles"], first["assigneeIds"]))
+        self.assertEqual(([9], [None]), (rows[2]["labelIds"], rows[2]["labelTitles"]))
+        self.assertEqual({"tasks": 4, "rows": 4, "projects": 2, "milestones": 0, "sprints": 1, "epics": 0, "labels": 2}, stats)
+        task_calls = [call for call in api.calls if call[0].startswith("odata_task_in_registry")]
+        self.assertTrue(all(call[3] == {"kind": "all"} for call in task_calls))
+        self.assertTrue(all("Hidden eq false" in call[1]["$filter"] for call in task_calls))
+        self.assertEqual({self.module.TASK_FIELDS, None}, {call[2] for call in task_calls if call[0] == "odata_task_in_registry"})
+        lookup_calls = [call for call in api.calls if not call[0].startswith("odata_task_in_registry")]
+        self.assertTrue(all("$filter" not in call[1] for call in lookup_calls))
+
+    def test_id_ranges_are_paged_by_key_while_tasks_change(self):
+        rows = make_rows()
+        tasks = rows["odata_task_in_registry"]
+        tasks.extend(task(task_id, 1) for task_id in range(5, 11))
+
+        def change_once(filter_text):
+            # Once the first range is read, a task in it disappears and a new one is created.
+            if any(row["ID"] == 2 for row in tasks) and "ID gt" in filter_text:
+                tasks[:] = [row for row in tasks if row["ID"] != 2] + [task(11, 2)]
+
+        api = _FakeAPI(rows, on_page=change_once)
+        with self.module.ThreadPoolExecutor(max_workers=1) as executor:
+            pages = [[row["ID"] for row in page] for page in self.module.task_pages(api, executor, page_size=4, max_workers=1)]
+
+        self.assertEqual([[1, 2, 3], [4, 5, 6], [7, 8, 9, 10, 11]], pages)
+        range_filters = [call[1]["$filter"] for call in api.calls if call[0] == "odata_task_in_registry" and "$select" not in call[1]]
+        self.assertIn("ID le 3", range_filters[0])
+        self.assertNotIn("ID le", range_filters[-1])
+        self.assertTrue(all(call[1]["$orderby"] == "ID" for call in api.calls if call[2] == self.module.TASK_FIELDS))
+
+    def test_task_ranges_load_while_lookups_are_pending(self):
+        range_started = threading.Event()
+        overlapped = []
+        api = _FakeAPI(make_rows(), on_page=lambda filter_text: range_started.set())
+        # Each lookup waits for a task range to be fetched; without overlap they would all time out.
+        api.on_lookup = lambda: overlapped.append(range_started.wait(2))
+
+        rows = list(self.module.export_registry(api, max_workers=2))
+
+        self.assertEqual(4, len(rows))
+        self.assertTrue(overlapped and all(overlapped))
+
+    def test_key_paging_follows_capped_pages(self):
+        api = _CappedAPI(1000, cap=100)
+
+        by_key = [row["ID"] for row in self.module.iter_odata_rows_by_key(api, TASK_METHOD, include_hidden=True)]
+
+        self.assertEqual(list(range(1, 1001)), by_key)
+        self.assertEqual(by_key, [row["ID"] for row in self.module.iter_odata_rows(api, TASK_METHOD, include_hidden=True)])
+
+    def test_registry_export_writes_exploded_label_rows(self):
+        parser = argparse.ArgumentParser()
+        self.module.configure_parser(parser)
+        args = parser.parse_args(["--filter", "State eq 10", "--explode-labels", "--include-hidden"])
+        args.workers = 3
+        api = _FakeAPI(make_rows())
+        output, summary = io.StringIO(), io.StringIO()
+
+        with redirect_stdout(output), redirect_stderr(summary):
+            self.assertEqual(0, self.module.run(api, args))
+
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(
+            [(1, 3, "bug", "#f00"), (1, 5, "ui", "#0f0"), (2, None, None, None), (3, 9, None, None), (4, None, None, None)],
+            [(row["taskId"], row["labelId"], row["labelTitle"], row["labelColor"]) for row in rows],
+        )
+        self.assertNotIn("labelIds", rows[0])
+        self.assertEqual({"tasks": 4, "rows": 5}, {key: json.loads(summary.getvalue())[key] for key in ("tasks", "rows")})
+        count_call = next(call for call in api.calls if call[0] == "odata_task_in_registry_count")
+        self.assertEqual({"$filter": "State eq 10"}, count_call[1])
+        self.assertTrue(all("State eq 10" in call[1]["$filter"] for call in api.calls if call[0] == "odata_task_in_registry"))
+
+
+if __name__ == "__main__":
+    unittest.main()
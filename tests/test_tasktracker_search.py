@@ -0,0 +1,166 @@
+import importlib.util
+import io
+import json
+import re
+import sys
+import tempfile
+import threading
+import types
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_search.py"
+OPS_PATH = MODULE_PATH.parent / "tasktracker_ops.py"
+
+
+def load_tasktracker_search_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_search_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_rows():
+    return {
+        "odata_task": [
+            {"ID": 1, "Hidden": False, "Title": "Ошибка сохранения карточки", "CreatedAt": "2026-10-01T09:00:00Z", "UpdatedAt": None},
+            {"ID": 2, "Hidden": False, "Title": "Экспорт отчёта в Excel", "CreatedAt": "2026-10-02T09:00:00Z", "UpdatedAt": "2026-10-03T09:00:00Z"},
+        ],
+        "odata_epic": [
+            {"ID": 1, "Hidden": False, "Title": "Отчёты", "Description": "Печать и выгрузка", "CreatedAt": "2026-10-01T09:00:00Z"},
+        ],
+        "odata_task_history": [
+            {"ID": 1, "TaskId": 1, "CommandName": "Create", "Data": json.dumps({"Description": "Форма падает с таймаутом"})},
+            {"ID": 2, "TaskId": 2, "CommandName": "Create", "Data": json.dumps({"description": "old"})},
+            {"ID": 3, "TaskId": 2, "CommandName": "ChangeDescription", "Data": json.dumps({"description": "Файл выгрузки пустой"})},
+            {"ID": 4, "TaskId": 2, "CommandName": "ChangeTitle", "Data": json.dumps({"description": "ignored"})},
+        ],
+        "odata_task_comment": [
+            {"ID": 7, "Hidden": False, "TaskId": 1, "Text": "Воспроизводится после таймаута сервера", "CreatedAt": "2026-10-04T09:00:00Z"},
+            {"ID": 8, "Hidden": False, "TaskId": 99, "Text": "Чужой проект, таймаут", "CreatedAt": "2026-10-04T09:00:00Z"},
+        ],
+        "odata_epic_comment": [
+            {"ID": 7, "Hidden": False, "EpicId": 1, "Text": "Нужна печать", "CreatedAt": "2026-10-04T10:00:00Z"},
+        ],
+    }
+
+
+class _FakeAPI:
+    base_url = "https://erp.example/tasktracker"
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def call_by_python_method(self, python_method, odata_params=None, **kwargs):
+        with self._lock:
+            self.calls.append((python_method, dict(odata_params or {}), kwargs))
+        rows = self.rows[python_method]
+        match = re.search(r"(\w+) in \(([\d,]+)\)", (odata_params or {}).get("$filter", ""))
+        if match:
+            keys = {int(key) for key in match.group(2).split(",")}
+            rows = [row for row in rows if row[match.group(1)] in keys]
+        return {"value": rows[odata_params["$skip"]:odata_params["$skip"] + odata_params["$top"]]}
+
+
+class SearchTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_search_module()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.index = self.module.SearchIndex(Path(self.directory.name) / "search.sqlite3")
+
+    def tearDown(self):
+        self.index.close()
+        self.directory.cleanup()
+
+    def test_sync_indexes_titles_descriptions_and_comments(self):
+        stats = self.module.sync_project(_FakeAPI(make_rows()), self.index, 5)
+
+        self.assertEqual({"projectId": 5, "indexed": 5, "removed": 0, "errors": []}, stats)
+        self.assertEqual([("task", 2)], [(row["kind"], row["id"]) for row in self.index.search("пустой файл")])
+        hits = self.index.search("таймаут")
+        self.assertEqual([("task", 1), ("task_comment", 7)], sorted((row["kind"], row["id"]) for row in hits))
+        comment = next(row for row in hits if row["kind"] == "task_comment")
+        self.assertEqual((1, "Ошибка сохранения карточки"), (comment["parentId"], comment["title"]))
+        self.assertIn("[таймаута]", comment["snippet"])
+        self.assertEqual([("epic", 1), ("epic_comment", 7)], sorted((row["kind"], row["id"]) for row in self.index.search("печать")))
+        self.assertEqual(
+            [{"taskId": 1, "projectId": 5, "title": "Ошибка сохранения карточки", "hits": 2}],
+            [{key: row[key] for key in ("taskId", "projectId", "title", "hits")} for row in self.index.search("таймаут", by_task=True)],
+        )
+        self.assertEqual([], self.index.search("таймаут", project_ids=[6]))
+
+    def test_incremental_sync_reads_changes_since_the_watermark(self):
+        rows = make_rows()
+        self.module.sync_project(_FakeAPI(rows), self.index, 5)
+        rows["odata_task"][0]["Hidden"] = True
+        rows["odata_task"][0]["UpdatedAt"] = "2026-10-05T09:00:00Z"
+        rows["odata_task"][1]["Title"] = "Экспорт отчёта в CSV"
+        rows["odata_epic_comment"][0]["Hidden"] = True
+        api = _FakeAPI(rows)
+
+        stats = self.module.sync_project(api, self.index, 5)
+
+        self.assertEqual([], self.index.search("таймаут"))
+        self.assertEqual([], self.index.search("печать", kinds=["epic_comment"]))
+        self.assertEqual("Экспорт отчёта в CSV", self.index.search("csv")[0]["title"])
+        self.assertEqual("Файл выгрузки пустой", self.index._db.execute("SELECT body FROM documents WHERE rowid = 8").fetchone()[0])
+        self.assertEqual(2, stats["removed"])
+        task_call = next(call for call in api.calls if call[0] == "odata_task")
+        self.assertIn("UpdatedAt ge 2026-10-03T09:00:00Z", task_call[1]["$filter"])
+        self.assertNotIn("Hidden", task_call[1]["$filter"])
+        comment_call = next(call for call in api.calls if call[0] == "odata_task_comment")
+        self.assertNotIn("TaskId in", comment_call[1]["$filter"])
+
+    def test_word_forms_and_common_words(self):
+        self.assertEqual('("ошибка" OR "ошиб"*) OR "42"', self.module.match_expression(["ошибка", "42"]))
+        for entity_id, text in enumerate(["ошибка в отчёте", "ошибка печати", "форма", "список", "ошибка, данных нет", "печать формы"], 1):
+            self.index.upsert("task", entity_id, title=text, project_id=1)
+
+        self.assertEqual({1, 2, 5}, {row["id"] for row in self.index.search("ошибка")})
+        with mock.patch.object(self.module, "COMMON_TERM_SHARE", 0.5):
+            self.assertEqual(["печати"], self.index.selective_terms(["ошибка", "печати"]))
+            self.assertEqual([2, 6], [row["id"] for row in self.index.search("ошибка печати")])
+        with mock.patch.object(self.module, "COMMON_TERM_SHARE", 0.1):
+            self.assertEqual([], self.index.selective_terms(["ошибка", "печати"]))
+            self.assertEqual([2], [row["id"] for row in self.index.search("ошибка печати")])
+
+    def test_default_index_path_does_not_authenticate(self):
+        spec = importlib.util.spec_from_file_location("tasktracker_ops_under_test", OPS_PATH)
+        ops = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(ops)
+
+        class _OfflineAPI:
+            _resolve_base_url = staticmethod(lambda: "https://erp.example/tasktracker")
+
+            def __init__(self):
+                raise AssertionError("a local search must not request a token")
+
+        args = types.SimpleNamespace(
+            query="печати", project_ids=None, sync=False, index=None, kinds=None, by_task=True, raw=False, limit=5, workers=1
+        )
+        output = io.StringIO()
+        with mock.patch.dict(sys.modules, {"tasktracker_api": types.SimpleNamespace(TaskTrackerAPI=_OfflineAPI)}), mock.patch.dict(
+            "os.environ", {"ERP_CACHE_DIR": self.directory.name}
+        ):
+            with self.module.SearchIndex(self.module.default_index_path("https://erp.example/tasktracker")) as index:
+                index.upsert("task", 1, title="ошибка печати", project_id=1)
+                index.commit()
+            with redirect_stdout(output), redirect_stderr(io.StringIO()):
+                self.assertEqual(0, self.module.run(ops.LazyAPI(), args))
+
+        self.assertEqual([1], [json.loads(line)["taskId"] for line in output.getvalue().splitlines()])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import importlib.util
+import re
+import sys
+import tarfile
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_snapshot.py"
+
+
+def load_tasktracker_snapshot_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_snapshot_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+ROWS = {
+    "odata_task": [{"ID": task_id, "Title": f"T{task_id}", "UpdatedAt": f"2026-10-{task_id:02d}T00:00:00Z"} for task_id in range(1, 8)],
+    "odata_epic": [{"ID": 1, "Title": "E1"}],
+    "odata_milestone": [],
+    "odata_sprint": [{"ID": 3, "Title": "S3"}],
+    "odata_label_for_project": [],
+    "odata_board": [{"ID": 5}, {"ID": 4}],
+    # Comment IDs run against task IDs, so chunks only come out sorted after the merge.
+    "odata_task_comment": [{"ID": 100 - task_id * 3 + offset, "TaskId": task_id} for task_id in range(1, 8) for offset in (0, 1)],
+    "odata_task_history": [{"ID": 1, "TaskId": 7}],
+    "odata_task_time": [],
+    "odata_epic_comment": [],
+    "odata_epic_history": [],
+}
+
+
+class _FakeAPI:
+    base_url = "https://erp.example/tasktracker"
+
+    def __init__(self, failing=(), rows=None, board_lists=None, cap=None):
+        self.failing = set(failing)
+        self.cap = cap
+        self.rows = rows or ROWS
+        self.board_lists = board_lists
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def call_by_python_method(self, python_method, *args, odata_params=None, fields=None, **kwargs):
+        with self._lock:
+            self.calls.append((python_method, args, odata_params, kwargs))
+        if python_method in self.failing:
+            raise RuntimeError("boom")
+        if python_method == "get_board_list_query_get_lists_board_id":
+            if self.board_lists is not None:
+                return self.board_lists[args[0]]
+            return [{"id": args[0] * 10, "title": "Todo"}]
+        rows = self.rows[python_method]
+        match = re.search(r"(\w+) in \(([\d,]+)\)", odata_params.get("$filter") or "")
+        if match:
+            keys = {int(key) for key in match.group(2).split(",")}
+            rows = [row for row in rows if row[match.group(1)] in keys]
+        after = re.search(r"ID gt (\d+)", odata_params.get("$filter") or "")
+        if after:
+            rows = [row for row in rows if row["ID"] is not None and row["ID"] > int(after.group(1))]
+        rows = sorted(rows, key=lambda row: row["ID"] or 0)
+        # A capped server returns fewer rows than $top asked for and links to the rest.
+        page = {"value": rows[:min(odata_params["$top"], self.cap or odata_params["$top"])]}
+        if self.cap and len(rows) > len(page["value"]):
+            page["@odata.nextLink"] = "next"
+        return page
+
+
+class SnapshotTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_snapshot_module()
+
+    def test_export_writes_sorted_members_and_manifest(self):
+        api = _FakeAPI()
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "project.tar"
+            with mock.patch.object(self.module, "chunk_ids", lambda ids, key_field: [chunk for chunk in (ids[:3], ids[3:]) if chunk]):
+                manifest = self.module.export_snapshot(api, 12, output, max_workers=4)
+            with tarfile.open(output) as archive:
+                members = archive.getnames()
+            with self.module.Snapshot(output) as snapshot:
+                comments = list(snapshot.rows("task_comments"))
+                board_lists = list(snapshot.rows("board_lists"))
+                entity_sets = snapshot.entity_sets()
+            leftovers = [path.name for path in Path(directory).iterdir()]
+
+        self.assertEqual(["project.tar"], leftovers)
+        self.assertEqual("manifest.json", members[0])
+        self.assertEqual({}, manifest["errors"])
+        self.assertEqual([self.module.member_name(name) for name in entity_sets], members[1:])
+        ids = [row["ID"] for row in comments]
+        self.assertEqual(14, len(ids))
+        self.assertEqual(sorted(ids), ids)
+        self.assertEqual({"count": 7, "maxId": 7, "watermark": "2026-10-07T00:00:00Z"}, {
+            key: manifest["entities"]["tasks"][key] for key in ("count", "maxId", "watermark")
+        })
+        self.assertEqual([(4, 40), (5, 50)], [(row["boardId"], row["id"]) for row in board_lists])
+        task_filters = [call[2].get("$filter") or "" for call in api.calls if call[0] == "odata_task"]
+        self.assertEqual([], [odata_filter for odata_filter in task_filters if "Hidden" in odata_filter])
+
+    def test_capped_pages_are_read_to_the_end(self):
+        api = _FakeAPI(cap=2)
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "project.tar"
+            manifest = self.module.export_snapshot(api, 12, output, entity_sets=["tasks", "task_comments"])
+            with self.module.Snapshot(output) as snapshot:
+                comments = list(snapshot.rows("task_comments"))
+
+        self.assertEqual({"count": 7, "maxId": 7, "watermark": "2026-10-07T00:00:00Z"}, {
+            key: manifest["entities"]["tasks"][key] for key in ("count", "maxId", "watermark")
+        })
+        self.assertEqual((14, 14), (manifest["entities"]["task_comments"]["count"], len(comments)))
+        self.assertEqual(4, len([call for call in api.calls if call[0] == "odata_task"]))
+
+    def test_repeated_and_keyless_rows_are_written_once_or_skipped(self):
+        rows = dict(ROWS, odata_task=[{"ID": 1}, {"ID": 2}, {"ID": 2, "Title": "again"}, {"ID": None}, {"ID": 3}])
+        board_lists = {4: [{"id": 2, "title": "Done"}, {"id": None}, {"id": 1}, {"id": 2, "title": "Closed"}], 5: []}
+        api = _FakeAPI(rows=rows, board_lists=board_lists)
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "project.tar"
+            manifest = self.module.export_snapshot(api, 12, output, entity_sets=["tasks", "boards", "board_lists"])
+            with self.module.Snapshot(output) as snapshot:
+                tasks = list(snapshot.rows("tasks"))
+                lists = list(snapshot.rows("board_lists"))
+
+        self.assertEqual([1, 2, 3], [row["ID"] for row in tasks])
+        self.assertEqual((3, 1), (manifest["entities"]["tasks"]["count"], manifest["entities"]["tasks"]["skipped"]))
+        self.assertEqual([(2, "Closed"), (1, None)], [(row["id"], row.get("title")) for row in lists if row["boardId"] == 4])
+        self.assertEqual(1, manifest["entities"]["board_lists"]["skipped"])
+        self.assertEqual([("ID", None)], [(call[2]["$orderby"], call[2].get("$skip")) for call in api.calls if call[0] == "odata_task"])
+
+    def test_merge_respects_fan_in(self):
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            paths = []
+            for index in range(5):
+                writer = self.module._MemberWriter(directory / f"part.{index}.ndjson.gz")
+                for row_id in range(index, 20, 5):
+                    writer.write({"ID": row_id})
+                writer.close()
+                paths.append(writer.path)
+            writer = self.module._MemberWriter(directory / "merged.ndjson.gz")
+            with mock.patch.object(self.module, "MERGE_FAN_IN", 2):
+                self.module._merge_files(paths, writer, directory)
+            summary = writer.close()
+            rows = list(self.module._read_member_file(writer.path))
+            remaining = sorted(path.name for path in directory.iterdir())
+
+        self.assertEqual(list(range(20)), [row["ID"] for row in rows])
+        self.assertEqual(19, summary["maxId"])
+        self.assertEqual(["merged.ndjson.gz"], [name for name in remaining if not name.startswith(".merge.")])
+
+    def test_failed_parent_skips_its_children_and_is_reported(self):
+        api = _FakeAPI(failing={"odata_epic"})
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = self.module.export_snapshot(
+                api, 12, Path(directory) / "project.tar", entity_sets=["epics", "epic_comments", "tasks"]
+            )
+
+        self.assertEqual(["epics", "epic_comments"], list(manifest["errors"]))
+        self.assertEqual(["tasks"], list(manifest["entities"]))
+        self.assertNotIn("odata_epic_comment", [call[0] for call in api.calls])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import gzip
+import importlib.util
+import io
+import json
+import sys
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_snapshot_diff.py"
+
+
+def load_tasktracker_snapshot_diff_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_snapshot_diff_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_archive(path, sets):
+    manifest = {"format": 1, "entities": {name: {"member": f"{name}.ndjson.gz"} for name in sets}, "errors": {}}
+    with tarfile.open(path, "w") as archive:
+        members = {"manifest.json": json.dumps(manifest).encode("utf-8")}
+        for name, rows in sets.items():
+            members[f"{name}.ndjson.gz"] = gzip.compress("".join(json.dumps(row) + "\n" for row in rows).encode("utf-8"))
+        for member, payload in members.items():
+            info = tarfile.TarInfo(member)
+            info.size = len(payload)
+            archive.addfile(info, io.BytesIO(payload))
+
+
+class SnapshotDiffTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_snapshot_diff_module()
+
+    def test_merge_join_reports_added_removed_and_changed_fields(self):
+        before = [{"ID": 1, "Title": "a"}, {"ID": 2, "Title": "b", "Weight": 1}, {"ID": 4, "Title": "d"}]
+        after = [{"ID": 2, "Title": "b", "Weight": 3, "SprintId": 7}, {"ID": 3, "Title": "c"}, {"ID": 4, "Title": "d"}]
+
+        events = list(self.module.diff_rows(iter(before), iter(after), "tasks"))
+
+        self.assertEqual([(1, "removed"), (2, "changed"), (3, "added")], [(event["id"], event["change"]) for event in events])
+        self.assertEqual(
+            {"SprintId": {"before": None, "after": 7}, "Weight": {"before": 1, "after": 3}},
+            events[1]["fields"],
+        )
+        ignored = list(self.module.diff_rows(iter(before[1:2]), iter(after[:1]), "tasks", ignore={"Weight", "SprintId"}))
+        self.assertEqual([], ignored)
+
+    def test_unsorted_input_is_rejected(self):
+        with self.assertRaises(ValueError):
+            list(self.module.diff_rows(iter([{"ID": 2}, {"ID": 1}]), iter([]), "tasks"))
+
+    def test_repeated_keys_merge_last_wins_and_missing_keys_sort_first(self):
+        before = [{"ID": 1, "Title": "a"}, {"ID": 2, "Title": "b"}, {"ID": 2, "Title": "b2"}]
+        after = [{"ID": 1, "Title": "a"}, {"ID": 2, "Title": "b2"}]
+
+        self.assertEqual([], list(self.module.diff_rows(iter(before), iter(after), "tasks")))
+        lists_before = [{"boardId": 1, "id": 20}, {"boardId": 1, "id": None, "title": "x"}]
+        lists_after = [{"boardId": 1, "id": 20}, {"boardId": 1, "id": 0}]
+        events = list(self.module.diff_rows(iter(lists_before), iter(lists_after), "board_lists"))
+        self.assertEqual([((1, None), "removed"), ((1, 0), "added")], [(event["id"], event["change"]) for event in events])
+        with self.assertRaisesRegex(ValueError, "mixes key types"):
+            list(self.module.diff_rows(iter([{"ID": 1}, {"ID": "2"}]), iter([]), "tasks"))
+
+    def test_archives_are_compared_set_by_set(self):
+        with tempfile.TemporaryDirectory() as directory:
+            before_path = Path(directory) / "before.tar"
+            after_path = Path(directory) / "after.tar"
+            write_archive(before_path, {
+                "tasks": [{"ID": 1, "State": 10}],
+                "board_lists": [{"boardId": 1, "id": 20, "title": "Done"}, {"boardId": 1, "id": 10, "title": "Todo"}],
+                "labels": [{"ID": 5}],
+            })
+            write_archive(after_path, {
+                "tasks": [{"ID": 1, "State": 20}],
+                "board_lists": [{"boardId": 1, "id": 10, "title": "Todo"}, {"boardId": 1, "id": 20, "title": "Closed"}],
+            })
+            with self.module.Snapshot(before_path) as before, self.module.Snapshot(after_path) as after:
+                events, summary = self.module.diff_snapshots(before, after)
+                events = list(events)
+
+        self.assertEqual([("tasks", 1), ("board_lists", (1, 20))], [(event["entitySet"], event["id"]) for event in events])
+        self.assertEqual({"before": "Done", "after": "Closed"}, events[1]["fields"]["title"])
+        self.assertEqual({"skipped": "missing in after"}, summary["labels"])
+        self.assertEqual({"added": 0, "removed": 0, "changed": 1}, summary["tasks"])
+
+
+if __name__ == "__main__":
+    unittest.main()
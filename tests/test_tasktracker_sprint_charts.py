@@ -0,0 +1,109 @@
+import importlib.util
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import date
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_sprint_charts.py"
+
+
+def load_tasktracker_sprint_charts_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_sprint_charts_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+SPRINTS = [
+    {"ID": 1, "Title": "S1", "StartDate": "2026-10-05", "DueDate": "2026-10-07", "State": 20},
+    {"ID": 2, "Title": "S2", "StartDate": "2026-10-08", "DueDate": "2026-10-20", "State": 10},
+]
+TASKS = [
+    {"ID": 10, "State": 20, "Weight": 3, "SprintId": 1, "CreatedAt": "2026-10-01T09:00:00Z"},
+    {"ID": 11, "State": 10, "Weight": 5, "SprintId": 2, "CreatedAt": "2026-10-01T09:00:00Z"},
+    {"ID": 12, "State": 20, "Weight": 2, "SprintId": 1, "CreatedAt": "2026-10-06T09:00:00Z"},
+]
+HISTORY = [
+    {"ID": 1, "TaskId": 10, "CommandName": "Create", "CreatedAt": "2026-10-01T09:00:00Z", "Data": json.dumps({"sprintId": 1, "weight": 1})},
+    {"ID": 2, "TaskId": 10, "CommandName": "ChangeWeight", "CreatedAt": "2026-10-05T12:00:00Z", "Data": json.dumps({"Weight": 3})},
+    {"ID": 3, "TaskId": 10, "CommandName": "Close", "CreatedAt": "2026-10-06T15:00:00Z", "Data": None},
+    {"ID": 4, "TaskId": 11, "CommandName": "ChangeSprint", "CreatedAt": "2026-10-07T08:00:00Z", "Data": json.dumps({"sprintId": 2})},
+    {"ID": 5, "TaskId": 11, "CommandName": "Create", "CreatedAt": "2026-10-01T09:00:00Z", "Data": json.dumps({"sprintId": 1})},
+    {"ID": 6, "TaskId": 12, "CommandName": "CloseCommand", "CreatedAt": "2026-10-07T10:00:00Z", "Data": "not json"},
+]
+
+
+class _FakeAPI:
+    base_url = "https://erp.example/tasktracker"
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def call_by_python_method(self, python_method, odata_params=None, fields=None, **kwargs):
+        with self._lock:
+            self.calls.append((python_method, odata_params, kwargs))
+        rows = {"odata_sprint": SPRINTS, "odata_task": TASKS, "odata_task_history": HISTORY}[python_method]
+        return {"value": rows[odata_params["$skip"]:odata_params["$skip"] + odata_params["$top"]]}
+
+
+class SprintChartsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_sprint_charts_module()
+
+    def test_history_commands(self):
+        self.assertEqual((False, {"state": 20}), self.module.history_changes({"CommandName": "Close"}))
+        self.assertEqual((False, {"state": 10}), self.module.history_changes({"CommandName": "Reopen"}))
+        self.assertEqual(
+            (False, {"weight": 4, "sprintId": 9}),
+            self.module.history_changes({"CommandName": "BulkEdit", "Data": '{"Weight": 4, "SprintId": 9}'}),
+        )
+        self.assertEqual((False, {}), self.module.history_changes({"CommandName": "ChangeTitle", "Data": '{"weight": 1}'}))
+
+    def test_replay_builds_series_for_every_sprint(self):
+        events = self.module.build_events(TASKS, HISTORY)
+
+        series = self.module.replay(SPRINTS, events, today=date(2026, 10, 9))
+
+        self.assertEqual(
+            [
+                ("2026-10-05", 2, 0, 8, 0),
+                ("2026-10-06", 3, 1, 10, 3),
+                ("2026-10-07", 2, 2, 5, 5),
+            ],
+            [(point["date"], point["scopeTasks"], point["doneTasks"], point["scopeWeight"], point["doneWeight"]) for point in series[1]],
+        )
+        self.assertEqual(["2026-10-08", "2026-10-09"], [point["date"] for point in series[2]])
+        self.assertEqual(5, series[2][0]["remainingWeight"])
+
+    def test_closed_sprints_come_from_the_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = _FakeAPI()
+            charts, computed = self.module.sprint_charts(
+                first, 7, cache=self.module.ResultCache("sprint-charts", first.base_url, directory=directory), today=date(2026, 10, 9)
+            )
+            second = _FakeAPI()
+            cached, recomputed = self.module.sprint_charts(
+                second, 7, sprint_ids=[1], cache=self.module.ResultCache("sprint-charts", second.base_url, directory=directory)
+            )
+
+        self.assertEqual(2, computed)
+        self.assertEqual({"tasks": 2, "weight": 5}, charts[0]["velocity"])
+        self.assertEqual(0, recomputed)
+        self.assertEqual(charts[0], cached[0])
+        self.assertEqual(["odata_sprint"], [call[0] for call in second.calls])
+        history_call = next(call for call in first.calls if call[0] == "odata_task_history")
+        self.assertIn("TaskId in (10,11,12)", history_call[1]["$filter"])
+
+
+if __name__ == "__main__":
+    unittest.main()
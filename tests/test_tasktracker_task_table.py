@@ -0,0 +1,128 @@
+import argparse
+import importlib.util
+import io
+import json
+import sys
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_task_table.py"
+
+
+def load_tasktracker_task_table_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_task_table_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def task(task_id, state, weight, sprint, labels=(), assignees=()):
+    return {
+        "ID": task_id,
+        "State": state,
+        "Weight": weight,
+        "SprintId": sprint,
+        "MilestoneId": None,
+        "EpicId": None,
+        "CurrentAssigneeId": assignees[0] if assignees else None,
+        "AuthorId": 7,
+        "Labels": [{"ID": label} for label in labels],
+        "Assignees": [{"ID": user} for user in assignees],
+    }
+
+
+ROWS = [
+    task(1, 10, 3, 1, labels=(3,), assignees=(7,)),
+    task(2, 20, 5, 1, labels=(3, 4)),
+    task(3, 10, None, 2, labels=(4,), assignees=(7, 8)),
+    task(4, 10, 8, None, assignees=(8,)),
+]
+
+
+class _FakeAPI:
+    def __init__(self, projects):
+        self.projects = projects
+        self.calls = []
+
+    def call_by_python_method(self, python_method, odata_params=None, fields=None, **kwargs):
+        self.calls.append((python_method, fields, kwargs))
+        rows = self.projects[kwargs["project_id"]]
+        return {"value": rows[odata_params["$skip"]:odata_params["$skip"] + odata_params["$top"]]}
+
+
+class TaskTableTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_task_table_module()
+
+    def test_masks_combine_column_and_bitmap_predicates(self):
+        table = self.module.TaskTable.from_rows(ROWS, project_id=5)
+
+        self.assertEqual(4, len(table))
+        self.assertEqual("q", table.column("weight").typecode)
+        self.assertEqual([3, 5, 0, 8], list(table.column("Weight")))
+        self.assertEqual([1, 3], table.ids(table.eq("State", 10) & table.isin("label", [3, 4])))
+        self.assertEqual([2], table.ids(table.has_all("label", [3, 4])))
+        self.assertEqual([2, 4], table.ids(~table.isin("label", [3]) - table.eq("assignee", 7) | table.eq("ID", 2)))
+        self.assertEqual([2, 4], table.ids(table.where("Weight", lambda weight: weight >= 5)))
+        self.assertEqual(0, len(table.eq("sprint", 99)))
+        self.assertEqual(16, table.sum("Weight"))
+        self.assertEqual(11, table.sum("Weight", table.eq("State", 10)))
+
+    def test_group_by_counts_and_sums_weight_per_combination(self):
+        table = self.module.TaskTable.from_rows(ROWS)
+
+        rows = table.group_by(["sprint", "state"], table.all() - table.eq("ID", 4))
+        self.assertEqual(
+            [
+                {"SprintId": 1, "State": 10, "count": 1, "weight": 3},
+                {"SprintId": 1, "State": 20, "count": 1, "weight": 5},
+                {"SprintId": 2, "State": 10, "count": 1, "weight": 0},
+            ],
+            sorted(rows, key=lambda row: (row["SprintId"], row["State"])),
+        )
+        self.assertEqual(
+            {3: (2, 8), 4: (2, 5)},
+            {row["Labels"]: (row["count"], row["weight"]) for row in table.group_by("label")},
+        )
+        self.assertEqual([{"count": 4}], table.group_by([], weight=False))
+
+    def test_task_stats_loads_every_project_and_filters(self):
+        api = _FakeAPI({1: ROWS[:2], 2: ROWS[2:]})
+        parser = argparse.ArgumentParser()
+        self.module.configure_parser(parser)
+        args = parser.parse_args(["--project", "1", "--project", "2", "--group-by", "project", "--where", "state=10"])
+        args.workers = 2
+        output, summary = io.StringIO(), io.StringIO()
+
+        with redirect_stdout(output), redirect_stderr(summary):
+            self.assertEqual(0, self.module.run(api, args))
+
+        self.assertEqual(
+            [{"ProjectId": 1, "count": 1, "weight": 3}, {"ProjectId": 2, "count": 2, "weight": 8}],
+            [json.loads(line) for line in output.getvalue().splitlines()],
+        )
+        self.assertEqual({"tasks": 4, "selected": 3, "groups": 2}, json.loads(summary.getvalue()))
+        self.assertEqual({self.module.LOAD_FIELDS}, {call[1] for call in api.calls})
+        with self.assertRaises(ValueError):
+            self.module.parse_condition("title=x")
+        with self.assertRaises(ValueError):
+            self.module.parse_condition("ID=5")
+
+    def test_id_predicates_scan_instead_of_indexing(self):
+        table = self.module.TaskTable.from_rows(ROWS)
+
+        self.assertEqual([2], table.ids(table.eq("ID", 2)))
+        self.assertEqual([1, 4], table.ids(table.isin("ID", [4, 1, 9])))
+        self.assertEqual([3, 4], table.ids(table.where("ID", lambda task_id: task_id > 2)))
+        self.assertNotIn("ID", table._index)
+
+
+if __name__ == "__main__":
+    unittest.main()
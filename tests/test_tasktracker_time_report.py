@@ -0,0 +1,160 @@
+import argparse
+import importlib.util
+import io
+import re
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import date
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_time_report.py"
+
+
+def load_tasktracker_time_report_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_time_report_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeAPI:
+    def __init__(self, time_rows, projects=None):
+        self.time_rows = time_rows
+        self.projects = projects or {}
+        self.calls = []
+
+    def call_by_python_method(self, python_method, odata_params=None, fields=None, **kwargs):
+        self.calls.append((python_method, dict(odata_params or {})))
+        if python_method == "odata_task_time":
+            skip = odata_params["$skip"]
+            return {"value": self.time_rows[skip:skip + odata_params["$top"]]}
+        ids = [int(value) for value in re.search(r"ID in \(([^)]*)\)", odata_params["$filter"]).group(1).split(",")]
+        return {"value": [{"ID": task_id, "ProjectId": self.projects[task_id]} for task_id in ids if task_id in self.projects]}
+
+
+def time_row(entry_id, task_id, user_id, work_date, minutes, created="2026-10-01T08:00:00Z", **extra):
+    return {
+        "ID": entry_id,
+        "TaskId": task_id,
+        "UserId": user_id,
+        "WorkDate": work_date,
+        "DurationMinutes": minutes,
+        "CreatedAt": created,
+        **extra,
+    }
+
+
+class AccumulatorTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_time_report_module()
+
+    def test_aggregate_and_regroup_by_project_and_week(self):
+        rows = [
+            (1, 7, date(2026, 10, 5), 60),
+            (2, 7, date(2026, 10, 6), 30),
+            (3, 7, date(2026, 10, 12), 15),
+            (3, 8, date(2026, 10, 12), 45),
+        ]
+        base = self.module.aggregate(rows, "week")
+
+        grouped = self.module.regroup(base, ("user", "project"), {1: 100, 2: 100, 3: 200})
+
+        self.assertEqual(
+            [
+                {"userId": 7, "projectId": 100, "week": "2026-W41", "minutes": 90, "hours": 1.5, "entries": 2},
+                {"userId": 7, "projectId": 200, "week": "2026-W42", "minutes": 15, "hours": 0.25, "entries": 1},
+                {"userId": 8, "projectId": 200, "week": "2026-W42", "minutes": 45, "hours": 0.75, "entries": 1},
+            ],
+            list(self.module.report_rows(grouped, ("user", "project"), "week")),
+        )
+
+    def test_removing_entries_keeps_columns_dense(self):
+        entries = self.module.TimeEntries()
+        for entry_id in (1, 2, 3):
+            entries.upsert(entry_id, 10 + entry_id, 7, date(2026, 10, entry_id), entry_id * 10)
+
+        entries.remove(1)
+        entries.upsert(3, 13, 7, date(2026, 10, 3), 99)
+        restored = self.module.TimeEntries.from_json(entries.to_json())
+
+        self.assertEqual(2, len(restored))
+        self.assertEqual(
+            [(13, 7, date(2026, 10, 3), 99), (12, 7, date(2026, 10, 2), 20)],
+            list(restored.rows()),
+        )
+
+
+class SyncTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_time_report_module()
+
+    def test_incremental_sync_applies_updates_and_deletions(self):
+        api = _FakeAPI([time_row(1, 1, 7, "2026-10-05", 60), time_row(2, 2, 7, "2026-10-06", 30)])
+        entries = self.module.TimeEntries()
+        self.module.sync_entries(api, entries)
+        self.assertEqual("2026-10-01T08:00:00+00:00", entries.watermark)
+        self.assertIn("Hidden eq false", api.calls[0][1]["$filter"])
+
+        api.time_rows = [
+            time_row(1, 1, 7, "2026-10-05", 90, UpdatedAt="2026-10-03T10:00:00Z"),
+            time_row(2, 2, 7, "2026-10-06", 30, DeletedAt="2026-10-04T09:30:00+03:00", Hidden=True),
+            time_row(3, 2, 8, "2026-10-07", 15, created="2026-10-02T12:00:00Z"),
+        ]
+        changed = self.module.sync_entries(api, entries)
+
+        self.assertEqual(3, changed)
+        self.assertEqual("2026-10-04T06:30:00+00:00", entries.watermark)
+        incremental_filter = api.calls[-1][1]["$filter"]
+        self.assertIn("UpdatedAt ge 2026-10-01T08:00:00Z", incremental_filter)
+        self.assertNotIn("Hidden eq false", incremental_filter)
+        self.assertEqual({(1, 7, date(2026, 10, 5), 90), (2, 8, date(2026, 10, 7), 15)}, set(entries.rows()))
+
+    def test_state_round_trip_and_cached_projects(self):
+        api = _FakeAPI([], projects={1: 100, 2: 200})
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "time.json"
+            entries = self.module.load_state(path)
+            entries.upsert(5, 1, 7, date(2026, 10, 5), 60)
+            entries.projects = self.module.resolve_projects(api, {1, 2, 3})
+            self.module.save_state(path, entries)
+
+            restored = self.module.load_state(path)
+
+        self.assertEqual({1: 100, 2: 200, 3: None}, restored.projects)
+        self.assertEqual([(1, 7, date(2026, 10, 5), 60)], list(restored.rows()))
+        self.assertEqual(restored.projects, self.module.resolve_projects(api, {1, 2}, restored.projects))
+        self.assertEqual(1, len(api.calls))
+
+    def test_stateless_and_state_reports_skip_the_same_deleted_entries(self):
+        rows = [
+            time_row(1, 1, 7, "2026-10-05", 60),
+            time_row(2, 1, 7, "2026-10-06", 30, DeletedAt="2026-10-07T09:00:00Z"),
+            time_row(3, 1, 7, "2026-10-06", 15, DeletedAt="2026-10-07T09:00:00Z", RestoredAt="2026-10-08T09:00:00Z"),
+        ]
+        parser = argparse.ArgumentParser()
+        self.module.configure_parser(parser)
+        reports = []
+        with tempfile.TemporaryDirectory() as directory:
+            for extra in ([], ["--state", str(Path(directory) / "time.json")]):
+                args = parser.parse_args(["--group-by", "user", "--bucket", "all", *extra])
+                args.workers = 1
+                output = io.StringIO()
+                with redirect_stdout(output), redirect_stderr(io.StringIO()):
+                    self.module.run(_FakeAPI(rows), args)
+                reports.append(output.getvalue())
+
+        self.assertEqual(reports[0], reports[1])
+        self.assertIn('"minutes":75', reports[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
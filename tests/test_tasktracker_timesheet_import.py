@@ -0,0 +1,141 @@
+import importlib.util
+import sys
+import threading
+import unittest
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "skills" / "tasktracker-api" / "scripts" / "tasktracker_timesheet_import.py"
+
+
+def load_tasktracker_timesheet_import_module():
+    if str(MODULE_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(MODULE_PATH.parent))
+    spec = importlib.util.spec_from_file_location("tasktracker_timesheet_import_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = SimpleNamespace(status_code=status_code)
+
+
+class _FakeAPI:
+    def __init__(self, range_error=None):
+        self.range_error = range_error
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def call_by_python_method(self, python_method, body=None):
+        with self._lock:
+            self.calls.append((python_method, body))
+        if self.range_error is not None and python_method.endswith("_range"):
+            raise self.range_error
+        return None
+
+
+def entries(days, task_id=1, user_id=7, minutes=480):
+    return [{"taskId": task_id, "userId": user_id, "workDate": f"2026-10-{day:02d}", "durationMinutes": minutes} for day in days]
+
+
+class PlanImportTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_timesheet_import_module()
+
+    def summarize(self, operations):
+        return [
+            (operation["kind"], str(operation.get("startDate", operation.get("workDate"))), str(operation.get("endDate", "")))
+            for operation in operations
+        ]
+
+    def test_working_days_merge_across_weekends(self):
+        # 2026-10-05 is a Monday; the 10th and 11th are a weekend.
+        operations = self.module.plan_import(self.module.collect_entries(entries([5, 6, 7, 8, 9, 12, 13, 15])))
+
+        self.assertEqual([("range", "2026-10-05", "2026-10-13"), ("date", "2026-10-15", "")], self.summarize(operations))
+        self.assertEqual(7, operations[0]["days"])
+
+    def test_calendar_mode_weekends_and_repeats(self):
+        records = entries([9, 10, 11, 12]) + entries([12]) + entries([13], minutes=60) + [
+            {"taskId": 1, "userId": 7, "date": "2026-10-14", "hours": 8}
+        ]
+
+        workday_plan = self.summarize(self.module.plan_import(self.module.collect_entries(records)))
+        calendar_plan = self.summarize(self.module.plan_import(self.module.collect_entries(records), workdays_only=False))
+
+        self.assertEqual(
+            [
+                ("date", "2026-10-10", ""),
+                ("date", "2026-10-11", ""),
+                ("date", "2026-10-12", ""),
+                ("range", "2026-10-09", "2026-10-12"),
+                ("date", "2026-10-14", ""),
+                ("date", "2026-10-13", ""),
+            ],
+            workday_plan,
+        )
+        self.assertEqual(
+            [("date", "2026-10-12", ""), ("range", "2026-10-09", "2026-10-12"), ("date", "2026-10-14", ""), ("date", "2026-10-13", "")],
+            calendar_plan,
+        )
+
+
+class ExecuteImportTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_tasktracker_timesheet_import_module()
+
+    def test_range_bodies(self):
+        api = _FakeAPI()
+        operations = self.module.plan_import(self.module.collect_entries(entries([5, 6, 7])))
+
+        results, stats = self.module.execute_import(api, operations)
+
+        self.assertEqual({"rangeCalls": 1, "dateCalls": 0, "rangeFallbacks": 0, "rangeUnknown": 0}, stats)
+        self.assertEqual(
+            [
+                (
+                    "post_task_time_command_create_for_date_range",
+                    {"taskId": 1, "durationMinutes": 480, "userId": 7, "startDate": "2026-10-05", "endDate": "2026-10-07"},
+                )
+            ],
+            api.calls,
+        )
+        self.assertTrue(results[0]["ok"])
+
+    def test_rejected_range_falls_back_to_working_days(self):
+        api = _FakeAPI(range_error=_HTTPError(400))
+        operations = self.module.plan_import(self.module.collect_entries(entries([9, 12])))
+
+        results, stats = self.module.execute_import(api, operations, max_workers=4)
+
+        self.assertEqual({"rangeCalls": 1, "dateCalls": 2, "rangeFallbacks": 1, "rangeUnknown": 0}, stats)
+        self.assertEqual(
+            ["2026-10-09", "2026-10-12"],
+            sorted(body["workDate"] for method, body in api.calls if method == "post_task_time_command_create_for_date"),
+        )
+        self.assertEqual([False, True, True], [result["ok"] for result in results])
+        self.assertEqual(date(2026, 10, 9), results[1]["workDate"])
+
+    def test_ambiguous_range_failures_are_not_retried(self):
+        for error in (_HTTPError(503), RuntimeError("Request failed: read timed out")):
+            api = _FakeAPI(range_error=error)
+            operations = self.module.plan_import(self.module.collect_entries(entries([5, 6, 7])))
+
+            results, stats = self.module.execute_import(api, operations)
+
+            self.assertEqual({"rangeCalls": 1, "dateCalls": 0, "rangeFallbacks": 0, "rangeUnknown": 1}, stats)
+            self.assertEqual(["post_task_time_command_create_for_date_range"], [method for method, _ in api.calls])
+            self.assertEqual([(False, True)], [(result["ok"], result["outcomeUnknown"]) for result in results])
+
+
+if __name__ == "__main__":
+    unittest.main()